@@ -1,13 +1,21 @@
 """Query API endpoints."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
+from ..services.cache_service import cache_write_pipeline
 from ..services.query_service import get_query_service
 from ..services.context_retriever import get_context_retriever
 
-router = APIRouter(prefix="/query", tags=["query"])
+
+async def _pipeline_cache_writes() -> AsyncIterator[None]:
+    """Send the cache writes made while handling a request in one round trip."""
+    async with cache_write_pipeline():
+        yield
+
+
+router = APIRouter(prefix="/query", tags=["query"], dependencies=[Depends(_pipeline_cache_writes)])
 
 
 class FindCallersRequest(BaseModel):
@@ -45,7 +53,7 @@ async def find_callers(request: FindCallersRequest):
     query_service = get_query_service()
     
     try:
-        result = query_service.find_callers(
+        result = await query_service.find_callers(
             function_id=request.function_id,
             project_id=request.project_id
         )
@@ -60,7 +68,7 @@ async def find_dependencies(request: FindDependenciesRequest):
     query_service = get_query_service()
     
     try:
-        result = query_service.find_dependencies(
+        result = await query_service.find_dependencies(
             function_id=request.function_id,
             project_id=request.project_id
         )
@@ -75,7 +83,7 @@ async def impact_analysis(request: ImpactAnalysisRequest):
     query_service = get_query_service()
     
     try:
-        result = query_service.impact_analysis(
+        result = await query_service.impact_analysis(
             function_id=request.function_id,
             project_id=request.project_id,
             max_depth=request.max_depth
@@ -91,7 +99,7 @@ async def semantic_search(request: SemanticSearchRequest):
     query_service = get_query_service()
     
     try:
-        results = query_service.semantic_search(
+        results = await query_service.semantic_search(
             query=request.query,
             project_ids=request.project_ids,
             top_k=request.top_k
@@ -65,9 +65,7 @@ async def get_graph_visualization(request: GraphVisualizationRequest):
             filters=filters
         )
         
-        # Convert dataclass to dict for JSON serialization
-        from dataclasses import asdict
-        return asdict(viz_data)
+        return viz_data
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
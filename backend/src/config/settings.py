@@ -34,11 +34,16 @@ class Settings(BaseSettings):
     neo4j_database: str = "neo4j"
     neo4j_max_connection_pool_size: int = 50
     neo4j_connection_timeout: int = 30
+    neo4j_warm_pool_size: int = 5
     
     # Chroma settings
     chroma_host: str = "localhost"
     chroma_port: int = 8001
     chroma_persist_directory: str = "./chroma_data"
+    # Projects up to this many embeddings are searched in-process (0 disables)
+    chroma_in_process_max_rows: int = 2000
+    # Memory budget for the in-process search matrices (least recently used evicted)
+    chroma_in_process_cache_mb: int = 64
     
     # Redis settings
     redis_host: str = "localhost"
@@ -46,6 +51,7 @@ class Settings(BaseSettings):
     redis_db: int = 0
     redis_password: Optional[str] = None
     redis_cache_ttl: int = 300  # 5 minutes
+    upload_session_ttl: int = 604800  # 7 days
     
     # RabbitMQ settings
     rabbitmq_host: str = "localhost"
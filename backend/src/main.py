@@ -2,7 +2,7 @@
 
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from contextlib import asynccontextmanager
 import uuid
 from datetime import datetime
@@ -36,6 +36,8 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    # Encode response bodies with orjson rather than the stdlib json module
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
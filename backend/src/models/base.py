@@ -162,3 +162,4 @@ class GraphFilters(BaseModel):
     languages: Optional[List[Language]] = None
     file_pattern: Optional[str] = None
     max_nodes: int = 500
+    max_edges: int = 10000
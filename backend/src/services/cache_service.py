@@ -5,15 +5,145 @@ by storing frequently accessed results in Redis.
 """
 
 import logging
-import json
+import time
+import weakref
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 import redis
-from typing import Optional, Any, Dict
+import redis.asyncio as aioredis
+import numpy as np
+import orjson
+from typing import Optional, Any, AsyncIterator, Dict, List, Sequence, Tuple
+from dataclasses import is_dataclass
 from datetime import timedelta
 
+from pydantic import BaseModel
+
 from ..config.settings import settings
 
+
+def _json_default(value: Any) -> Any:
+    """Convert values the JSON encoder doesn't handle natively.
+    
+    Pydantic models are dumped to plain JSON data and dataclasses to their
+    field dict (the encoder recurses into it); anything else is stringified.
+    """
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if is_dataclass(value) and not isinstance(value, type):
+        return value.__dict__
+    return str(value)
+
+
+def _json_dumps(value: Any) -> bytes:
+    """Serialize a value to JSON bytes; dataclasses are encoded natively in C."""
+    return orjson.dumps(value, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+
+
 logger = logging.getLogger(__name__)
 
+# Objects holding in-process caches derived from project data; each has an
+# on_project_invalidated(project_id) method called when a project is invalidated
+_invalidation_listeners: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+def add_invalidation_listener(listener: Any) -> None:
+    """Register an object to be told when a project's cache is invalidated.
+    
+    Listeners are held weakly, so registering doesn't keep them alive.
+    
+    Args:
+        listener: Object with an ``on_project_invalidated(project_id)`` method
+    """
+    _invalidation_listeners.add(listener)
+
+
+# Entries kept per (project set, top_k) by the semantic cache
+_SEMANTIC_CACHE_SIZE = 256
+
+# Cache writes buffered by cache_write_pipeline(), per cache service, as
+# (key, ttl, serialized value); None when writes go straight to Redis
+_pending_writes: ContextVar[Optional[Dict["CacheService", List[Tuple[str, int, Any]]]]] = ContextVar(
+    "pending_cache_writes", default=None
+)
+
+
+@asynccontextmanager
+async def cache_write_pipeline() -> AsyncIterator[None]:
+    """Buffer cache writes made in this context and flush them on exit.
+    
+    Writes are sent in one Redis pipeline per cache service, so a request
+    that caches several results pays a single round trip. Nested uses join
+    the outermost buffer.
+    """
+    if _pending_writes.get() is not None:
+        yield
+        return
+    
+    pending: Dict[CacheService, List[Tuple[str, int, Any]]] = {}
+    token = _pending_writes.set(pending)
+    try:
+        yield
+    finally:
+        _pending_writes.reset(token)
+        for service, writes in pending.items():
+            await service._flush_writes(writes)
+
+
+def _normalize(vector: Sequence[float]) -> Optional[np.ndarray]:
+    """Scale a vector to unit length, so a dot product is cosine similarity.
+    
+    Returns:
+        The normalized vector, or None for a zero vector
+    """
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    if not norm:
+        return None
+    return array / norm
+
+
+class _SemanticEntries:
+    """Ring buffer of recent searches for one (project set, top_k).
+    
+    Normalized query embeddings are rows of one matrix, so a lookup scores
+    every entry with a single matrix-vector product. All entries were cached
+    at the same graph versions of the projects.
+    """
+    
+    __slots__ = ("versions", "matrix", "expires_at", "values", "next_row")
+    
+    def __init__(self, versions: Tuple[int, ...], dimensions: int):
+        self.versions = versions
+        self.matrix = np.zeros((_SEMANTIC_CACHE_SIZE, dimensions), dtype=np.float32)
+        # Unused rows never match because they are already expired
+        self.expires_at = np.zeros(_SEMANTIC_CACHE_SIZE)
+        self.values: List[Any] = [None] * _SEMANTIC_CACHE_SIZE
+        self.next_row = 0
+    
+    def add(self, vector: np.ndarray, expires_at: float, value: Any) -> None:
+        row = self.next_row
+        self.matrix[row] = vector
+        self.expires_at[row] = expires_at
+        self.values[row] = value
+        self.next_row = (row + 1) % _SEMANTIC_CACHE_SIZE
+    
+    def best_match(self, vector: np.ndarray, now: float) -> Tuple[float, Any]:
+        scores = self.matrix @ vector
+        scores[self.expires_at < now] = -np.inf
+        row = int(np.argmax(scores))
+        return float(scores[row]), self.values[row]
+
+
+def _semantic_key(
+    project_ids: Sequence[str],
+    top_k: int,
+    versions: Sequence[int]
+) -> Tuple[Tuple[Tuple[str, ...], int], Tuple[int, ...]]:
+    """Order-independent semantic cache key, and the versions in key order."""
+    pairs = sorted(zip(project_ids, versions))
+    return (tuple(pid for pid, _ in pairs), top_k), tuple(version for _, version in pairs)
+
 
 class RedisConnectionManager:
     """Manager for Redis connections with health checks."""
@@ -21,6 +151,8 @@ class RedisConnectionManager:
     def __init__(self):
         """Initialize Redis connection manager."""
         self.client: Optional[redis.Redis] = None
+        # Non-blocking client for use from the event loop, backed by its own pool
+        self.async_client: Optional[aioredis.Redis] = None
         self._connect()
     
     def _connect(self):
@@ -38,6 +170,20 @@ class RedisConnectionManager:
                 health_check_interval=30
             )
             
+            # Connections are opened lazily, so creating the pool needs no event loop
+            self.async_client = aioredis.Redis.from_pool(
+                aioredis.ConnectionPool(
+                    host=settings.redis_host,
+                    port=settings.redis_port,
+                    db=settings.redis_db,
+                    password=settings.redis_password,
+                    socket_connect_timeout=5,
+                    socket_timeout=5,
+                    retry_on_timeout=True,
+                    health_check_interval=30
+                )
+            )
+            
             # Test connection
             self.client.ping()
             logger.info(f"Connected to Redis at {settings.redis_host}:{settings.redis_port}")
@@ -45,6 +191,7 @@ class RedisConnectionManager:
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {e}")
             self.client = None
+            self.async_client = None
             raise
     
     def health_check(self) -> bool:
@@ -81,6 +228,15 @@ class RedisConnectionManager:
                 logger.info("Redis connection closed")
             except Exception as e:
                 logger.error(f"Error closing Redis connection: {e}")
+    
+    async def aclose(self):
+        """Close the async Redis client and its connection pool."""
+        if self.async_client:
+            try:
+                await self.async_client.aclose()
+                logger.info("Async Redis connection closed")
+            except Exception as e:
+                logger.error(f"Error closing async Redis connection: {e}")
 
 
 class CacheService:
@@ -93,7 +249,19 @@ class CacheService:
             connection_manager: Optional Redis connection manager
         """
         self.connection_manager = connection_manager or RedisConnectionManager()
-        self.default_ttl = 300  # 5 minutes in seconds
+        self.default_ttl = settings.redis_cache_ttl  # seconds
+        # Past searches by (sorted project_ids, top_k); see semantic_get
+        self._semantic_entries: Dict[Tuple[Tuple[str, ...], int], _SemanticEntries] = {}
+        add_invalidation_listener(self)
+    
+    def on_project_invalidated(self, project_id: str) -> None:
+        """Drop semantic cache entries of a project whose data changed.
+        
+        Args:
+            project_id: Project identifier
+        """
+        for key in [key for key in self._semantic_entries if project_id in key[0]]:
+            del self._semantic_entries[key]
     
     @property
     def client(self) -> redis.Redis:
@@ -106,9 +274,25 @@ class CacheService:
             self.connection_manager.reconnect()
         return self.connection_manager.client
     
-    def get(self, key: str) -> Optional[Any]:
+    @property
+    def async_client(self) -> aioredis.Redis:
+        """Get async Redis client.
+        
+        Returns:
+            Async Redis client instance
+        """
+        if not self.connection_manager.async_client:
+            self.connection_manager.reconnect()
+        async_client = self.connection_manager.async_client
+        if async_client is None:
+            raise ConnectionError("Async Redis client is not connected")
+        return async_client
+    
+    async def get(self, key: str) -> Optional[Any]:
         """Get value from cache.
         
+        Uses the async client, so a lookup never blocks the event loop.
+        
         Args:
             key: Cache key
             
@@ -116,11 +300,11 @@ class CacheService:
             Cached value if found, None otherwise
         """
         try:
-            value = self.client.get(key)
+            value = await self.async_client.get(key)
             if value:
                 logger.debug(f"Cache hit for key: {key}")
                 # Deserialize JSON
-                return json.loads(value)
+                return orjson.loads(value)
             else:
                 logger.debug(f"Cache miss for key: {key}")
                 return None
@@ -128,7 +312,71 @@ class CacheService:
             logger.error(f"Failed to get from cache: {e}")
             return None
     
-    def set(
+    async def get_raw(self, key: str) -> Optional[bytes]:
+        """Get the serialized JSON of a cached value.
+        
+        Lets callers validate straight from JSON (e.g. with Pydantic's
+        model_validate_json) without building an intermediate dict.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Cached JSON bytes if found, None otherwise
+        """
+        try:
+            value = await self.async_client.get(key)
+            logger.debug(f"Cache {'hit' if value else 'miss'} for key: {key}")
+            return value or None
+        except Exception as e:
+            logger.error(f"Failed to get from cache: {e}")
+            return None
+    
+    async def mget(self, keys: List[str], decode: bool = True) -> Dict[str, Any]:
+        """Get several values from cache in one round trip.
+        
+        Args:
+            keys: Cache keys
+            decode: Deserialize the values; when False the raw JSON bytes
+                are returned, as from get_raw
+            
+        Returns:
+            Cached values by key; keys that miss are left out
+        """
+        if not keys:
+            return {}
+        
+        try:
+            values = await self.async_client.mget(keys)
+            hits = {
+                key: orjson.loads(value) if decode else value
+                for key, value in zip(keys, values)
+                if value
+            }
+            logger.debug(f"Cache mget: {len(hits)}/{len(keys)} hits")
+            return hits
+        except Exception as e:
+            logger.error(f"Failed to mget from cache: {e}")
+            return {}
+    
+    async def warm_function_keys(self, function_id: str, project_id: str) -> Dict[str, Any]:
+        """Prefetch the cached caller, dependency and impact results of a function.
+        
+        Args:
+            function_id: Function identifier
+            project_id: Project identifier
+            
+        Returns:
+            Cached JSON by key, to pass as ``prefetched`` to the QueryService
+            find_callers, find_dependencies and impact_analysis methods
+        """
+        return await self.mget([
+            self.build_callers_key(function_id, project_id),
+            self.build_dependencies_key(function_id, project_id),
+            self.build_impact_key(function_id, project_id),
+        ], decode=False)
+    
+    async def set(
         self,
         key: str,
         value: Any,
@@ -136,10 +384,13 @@ class CacheService:
     ) -> bool:
         """Set value in cache with TTL.
         
+        Uses the async client, so a write never blocks the event loop.
+        
         Args:
             key: Cache key
-            value: Value to cache (will be JSON serialized)
-            ttl: Time to live in seconds (default: 5 minutes)
+            value: Value to cache (will be JSON serialized); Pydantic models
+                and dataclasses are serialized directly
+            ttl: Time to live in seconds (default: settings.redis_cache_ttl)
             
         Returns:
             True if successful, False otherwise
@@ -147,11 +398,20 @@ class CacheService:
         try:
             ttl = ttl or self.default_ttl
             
-            # Serialize to JSON
-            serialized_value = json.dumps(value, default=str)
+            # Serialize to JSON; Pydantic models encode themselves in one step
+            if isinstance(value, BaseModel):
+                serialized_value = value.model_dump_json()
+            else:
+                serialized_value = _json_dumps(value)
+            
+            pending = _pending_writes.get()
+            if pending is not None:
+                # Flushed together when the cache_write_pipeline() exits
+                pending.setdefault(self, []).append((key, ttl, serialized_value))
+                return True
             
             # Set with expiration
-            self.client.setex(
+            await self.async_client.setex(
                 name=key,
                 time=timedelta(seconds=ttl),
                 value=serialized_value
@@ -164,6 +424,21 @@ class CacheService:
             logger.error(f"Failed to set cache: {e}")
             return False
     
+    async def _flush_writes(self, writes: List[Tuple[str, int, Any]]) -> None:
+        """Send buffered cache writes in one pipeline.
+        
+        Args:
+            writes: Buffered (key, ttl, serialized value) writes
+        """
+        try:
+            pipe = self.async_client.pipeline(transaction=False)
+            for key, ttl, serialized_value in writes:
+                pipe.setex(name=key, time=timedelta(seconds=ttl), value=serialized_value)
+            await pipe.execute()
+            logger.debug(f"Flushed {len(writes)} buffered cache writes")
+        except Exception as e:
+            logger.error(f"Failed to flush cache writes: {e}")
+    
     def delete(self, key: str) -> bool:
         """Delete value from cache.
         
@@ -184,12 +459,20 @@ class CacheService:
     def invalidate_project(self, project_id: str) -> int:
         """Invalidate all cache entries for a project.
         
+        In-process caches registered with add_invalidation_listener are
+        invalidated as well.
+        
         Args:
             project_id: Project identifier
             
         Returns:
             Number of keys deleted
         """
+        for listener in list(_invalidation_listeners):
+            listener.on_project_invalidated(project_id)
+        # Values computed concurrently from the old graph are cached under the old version
+        self.bump_graph_version(project_id)
+        
         try:
             # Find all keys for this project
             pattern = f"*:project:{project_id}:*"
@@ -247,6 +530,82 @@ class CacheService:
             logger.error(f"Failed to clear cache: {e}")
             return False
     
+    def semantic_get(
+        self,
+        query_embedding: Sequence[float],
+        project_ids: List[str],
+        top_k: int,
+        versions: Sequence[int],
+        threshold: float = 0.95
+    ) -> Optional[Any]:
+        """Get the cached result of a search with a near-identical query.
+        
+        Paraphrased queries hash to different exact keys but embed to nearly
+        the same vector, so entries are matched by cosine similarity. The
+        cache is in-process and bounded per project set. Entries cached at
+        other graph versions, e.g. before another process re-ingested one of
+        the projects, are dropped.
+        
+        Args:
+            query_embedding: Query vector embedding
+            project_ids: List of project identifiers searched
+            top_k: Maximum number of results requested
+            versions: Current graph versions, in the order of project_ids
+            threshold: Minimum cosine similarity for a hit (default: 0.95)
+            
+        Returns:
+            Value cached for the most similar past query, or None
+        """
+        key, versions = _semantic_key(project_ids, top_k, versions)
+        entries = self._semantic_entries.get(key)
+        if entries is not None and entries.versions != versions:
+            del self._semantic_entries[key]
+            return None
+        query_vector = _normalize(query_embedding)
+        if entries is None or query_vector is None or query_vector.shape[0] != entries.matrix.shape[1]:
+            return None
+        
+        score, value = entries.best_match(query_vector, time.monotonic())
+        if score < threshold:
+            return None
+        
+        logger.debug(f"Semantic cache hit with similarity {score:.3f}")
+        return value
+    
+    def semantic_put(
+        self,
+        query_embedding: Sequence[float],
+        project_ids: List[str],
+        top_k: int,
+        versions: Sequence[int],
+        value: Any,
+        ttl: Optional[int] = None
+    ) -> None:
+        """Cache a search result for lookup by semantic_get.
+        
+        Args:
+            query_embedding: Query vector embedding
+            project_ids: List of project identifiers searched
+            top_k: Maximum number of results requested
+            versions: Graph versions read before the search, in the order
+                of project_ids
+            value: Result to cache
+            ttl: Time to live in seconds (default: settings.redis_cache_ttl)
+        """
+        vector = _normalize(query_embedding)
+        if vector is None:
+            return
+        
+        key, versions = _semantic_key(project_ids, top_k, versions)
+        entries = self._semantic_entries.get(key)
+        if (
+            entries is None
+            or entries.versions != versions
+            or entries.matrix.shape[1] != vector.shape[0]
+        ):
+            entries = self._semantic_entries[key] = _SemanticEntries(versions, vector.shape[0])
+        entries.add(vector, time.monotonic() + (ttl or self.default_ttl), value)
+    
     # Cache key builders for different query types
     
     def build_callers_key(self, function_id: str, project_id: str) -> str:
@@ -317,6 +676,138 @@ class CacheService:
         """
         return f"query:graph:project:{project_id}:filters:{filters_hash}"
     
+    def build_coverage_key(self, project_id: str, include_external: bool) -> str:
+        """Build cache key for a project's graph coverage counts.
+        
+        Args:
+            project_id: Project identifier
+            include_external: Whether external module edges are counted
+            
+        Returns:
+            Cache key string
+        """
+        return f"query:coverage:project:{project_id}:external:{int(include_external)}"
+    
+    def build_graph_version_key(self, project_id: str) -> str:
+        """Build key of a project's graph version counter.
+        
+        Args:
+            project_id: Project identifier
+            
+        Returns:
+            Cache key string
+        """
+        return f"graph:version:project:{project_id}"
+    
+    # Generation-aware caching for values derived from a project's graph
+    
+    def bump_graph_version(self, project_id: str) -> int:
+        """Mark a project's graph as changed.
+        
+        Values cached with set_with_generation under the previous version
+        are no longer returned by get_with_generation.
+        
+        Args:
+            project_id: Project identifier
+            
+        Returns:
+            New graph version, or 0 if it couldn't be updated
+        """
+        try:
+            return int(self.client.incr(self.build_graph_version_key(project_id)))
+        except Exception as e:
+            logger.error(f"Failed to bump graph version: {e}")
+            return 0
+    
+    def get_graph_version(self, project_id: str) -> Optional[int]:
+        """Get a project's current graph version.
+        
+        Args:
+            project_id: Project identifier
+            
+        Returns:
+            Graph version, or None if it couldn't be read
+        """
+        try:
+            return int(self.client.get(self.build_graph_version_key(project_id)) or 0)
+        except Exception as e:
+            logger.error(f"Failed to get graph version: {e}")
+            return None
+    
+    async def get_with_generation(
+        self,
+        key: str,
+        generation_key: str
+    ) -> Tuple[int, Optional[Any]]:
+        """Get a value cached for the current generation.
+        
+        The value and the generation counter are read in one round trip.
+        
+        Args:
+            key: Cache key
+            generation_key: Key of the generation counter, e.g. from
+                build_graph_version_key
+            
+        Returns:
+            Tuple of (current generation, cached value or None if it is
+            missing or was cached for another generation)
+        """
+        try:
+            generation, value = await self.async_client.mget([generation_key, key])
+        except Exception as e:
+            logger.error(f"Failed to get from cache: {e}")
+            return 0, None
+        
+        generation = int(generation or 0)
+        if not value:
+            return generation, None
+        
+        entry = orjson.loads(value)
+        if entry.get("generation") != generation:
+            logger.debug(f"Stale cache entry for key: {key}")
+            return generation, None
+        return generation, entry.get("value")
+    
+    async def get_graph_versions(self, project_ids: Sequence[str]) -> Optional[Tuple[int, ...]]:
+        """Get the current graph versions of several projects in one round trip.
+        
+        Args:
+            project_ids: Project identifiers
+            
+        Returns:
+            Graph versions in the order of project_ids, or None if they
+            couldn't be read
+        """
+        try:
+            versions = await self.async_client.mget(
+                [self.build_graph_version_key(project_id) for project_id in project_ids]
+            )
+        except Exception as e:
+            logger.error(f"Failed to get graph versions: {e}")
+            return None
+        return tuple(int(version or 0) for version in versions)
+    
+    async def set_with_generation(
+        self,
+        key: str,
+        generation: int,
+        value: Any,
+        ttl: Optional[int] = None
+    ) -> bool:
+        """Cache a value computed at a given generation.
+        
+        Args:
+            key: Cache key
+            generation: Generation returned by get_with_generation before
+                the value was computed
+            value: Value to cache (will be JSON serialized)
+            ttl: Time to live in seconds (default: settings.redis_cache_ttl)
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        return await self.set(key, {"generation": generation, "value": value}, ttl)
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics.
         
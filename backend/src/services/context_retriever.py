@@ -10,7 +10,7 @@ from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
 from ..models.base import CodeEntity
-from .vector_service import VectorService
+from .vector_service import VectorService, get_vector_service
 from .graph_service import GraphService
 
 logger = logging.getLogger(__name__)
@@ -51,7 +51,7 @@ class ContextRetriever:
             vector_service: Vector service for semantic search
             graph_service: Graph service for structural queries
         """
-        self.vector_service = vector_service or VectorService()
+        self.vector_service = vector_service or get_vector_service()
         self.graph_service = graph_service or GraphService()
     
     def hybrid_search(
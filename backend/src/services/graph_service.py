@@ -11,10 +11,15 @@ in Neo4j graph database. It implements:
 Validates: Requirements 4.1, 4.2, 4.3, 4.4, 5.1, 5.5
 """
 
+import asyncio
+import json
 import logging
+from functools import lru_cache
 from typing import List, Optional, Dict, Any, Set, Tuple
 from datetime import datetime
 
+import orjson
+
 from ..models import (
     Project,
     CodeEntity,
@@ -34,6 +39,78 @@ from ..utils.errors import DatabaseQueryError
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of per-file Neo4j operations in flight during incremental updates
+_UPDATE_CONCURRENCY = 16
+
+# Map entity type to Neo4j label
+_ENTITY_TYPE_TO_LABEL: Dict[EntityType, str] = {
+    EntityType.FILE: "File",
+    EntityType.FUNCTION: "Function",
+    EntityType.CLASS: "Class",
+    EntityType.VARIABLE: "Variable",
+    EntityType.IMPORT: "Import",
+}
+
+
+# Labels that identify an entity type, in resolution priority order
+_LABEL_PRIORITY: Tuple[str, ...] = ("File", "Function", "Class", "Variable", "Import")
+_LABEL_SET = frozenset(_LABEL_PRIORITY)
+_LABEL_TO_ENTITY_TYPE: Dict[str, EntityType] = {
+    label: entity_type for entity_type, label in _ENTITY_TYPE_TO_LABEL.items()
+}
+
+
+def _labels_to_entity_type(labels) -> EntityType:
+    """Resolve a node's labels to an EntityType (defaults to FUNCTION).
+    
+    Args:
+        labels: Neo4j labels of the node
+        
+    Returns:
+        EntityType of the highest-priority known label
+    """
+    known = _LABEL_SET.intersection(labels)
+    if not known:
+        return EntityType.FUNCTION
+    if len(known) == 1:
+        return _LABEL_TO_ENTITY_TYPE[next(iter(known))]
+    return _LABEL_TO_ENTITY_TYPE[next(lbl for lbl in _LABEL_PRIORITY if lbl in known)]
+
+
+@lru_cache(maxsize=64)
+def _build_where(
+    has_entity_types: bool,
+    has_languages: bool,
+    has_pattern: bool
+) -> str:
+    """Build the WHERE clause for a graph filter signature.
+    
+    Only the shape of the filters affects the clause text; the filter values
+    themselves are passed as query parameters, so every combination of values
+    shares one query string (and one Neo4j query plan).
+    
+    Args:
+        has_entity_types: Whether an $entity_labels parameter is supplied
+        has_languages: Whether a $languages parameter is supplied
+        has_pattern: Whether a $file_pattern parameter is supplied
+        
+    Returns:
+        Cypher WHERE clause (without the WHERE keyword)
+    """
+    conditions = ["n.project_id = $project_id"]
+    
+    if has_entity_types:
+        # Filter by entity type (node labels)
+        conditions.append("ANY(lbl IN labels(n) WHERE lbl IN $entity_labels)")
+    
+    if has_languages:
+        conditions.append("n.language IN $languages")
+    
+    if has_pattern:
+        conditions.append("n.file_path =~ $file_pattern")
+    
+    return " AND ".join(conditions)
+
 
 class ClassHierarchy:
     """Represents a class inheritance hierarchy."""
@@ -66,13 +143,17 @@ class GraphService:
         callers = await service.find_callers(function_id)
     """
     
-    def __init__(self, neo4j_manager: Neo4jConnectionManager):
+    def __init__(self, neo4j_manager: Neo4jConnectionManager, batch_updates: bool = True):
         """Initialize Graph Service.
         
         Args:
             neo4j_manager: Neo4j connection manager instance
+            batch_updates: Apply incremental project updates as UNWIND batches in a
+                single transaction (default: True). When False, per-file operations
+                run concurrently in separate transactions.
         """
         self.neo4j = neo4j_manager
+        self.batch_updates = batch_updates
         logger.info("Graph Service initialized")
     
     async def initialize_indexes(self) -> None:
@@ -235,43 +316,10 @@ class GraphService:
         Returns:
             List of created node IDs
         """
-        # Map entity type to Neo4j label
-        label_map = {
-            EntityType.FILE: "File",
-            EntityType.FUNCTION: "Function",
-            EntityType.CLASS: "Class",
-            EntityType.VARIABLE: "Variable",
-            EntityType.IMPORT: "Import",
-        }
-        
-        label = label_map[entity_type]
+        label = _ENTITY_TYPE_TO_LABEL[entity_type]
         
         # Build entity data for batch creation
-        entity_data = []
-        for entity in entities:
-            data = {
-                "id": entity.id or f"{project_id}_{entity.entity_type.value}_{entity.name}_{entity.start_line}",
-                "project_id": project_id,
-                "name": entity.name,
-                "file_path": entity.file_path,
-                "start_line": entity.start_line,
-                "end_line": entity.end_line,
-                "language": entity.language.value,
-            }
-            
-            # Add optional fields
-            if entity.signature:
-                data["signature"] = entity.signature
-            if entity.docstring:
-                data["docstring"] = entity.docstring
-            if entity.body:
-                data["body"] = entity.body
-            if entity.metadata:
-                # Store metadata as JSON string
-                import json
-                data["metadata"] = json.dumps(entity.metadata)
-            
-            entity_data.append(data)
+        entity_data = [self._entity_to_properties(project_id, entity) for entity in entities]
         
         # Create entities in batch using UNWIND
         query = f"""
@@ -295,6 +343,153 @@ class GraphService:
             logger.error(f"Failed to create {label} entities: {str(e)}")
             raise DatabaseQueryError(f"Failed to create entities: {str(e)}") from e
     
+    def _entity_to_properties(self, project_id: str, entity: CodeEntity) -> Dict[str, Any]:
+        """Convert a CodeEntity to the property map stored on its Neo4j node.
+        
+        Args:
+            project_id: Project ID
+            entity: Entity to convert
+            
+        Returns:
+            Node properties
+        """
+        data = {
+            "id": entity.id or f"{project_id}_{entity.entity_type.value}_{entity.name}_{entity.start_line}",
+            "project_id": project_id,
+            "name": entity.name,
+            "file_path": entity.file_path,
+            "start_line": entity.start_line,
+            "end_line": entity.end_line,
+            "language": entity.language.value,
+        }
+        
+        # Add optional fields
+        if entity.signature:
+            data["signature"] = entity.signature
+        if entity.docstring:
+            data["docstring"] = entity.docstring
+        if entity.body:
+            data["body"] = entity.body
+        if entity.metadata:
+            # Store metadata as JSON string
+            data["metadata"] = json.dumps(entity.metadata)
+        
+        return data
+    
+    def _relationship_operations(
+        self,
+        relationship_type: RelationshipType,
+        relationships: List[CodeRelationship]
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Build UNWIND write operations for relationships of one type.
+        
+        IMPORTS relationships whose target is an ``external:`` module are
+        written with a separate query that merges an ExternalModule node.
+        
+        Args:
+            relationship_type: Type of relationships to create
+            relationships: List of relationships
+            
+        Returns:
+            List of (query, parameters) tuples; empty groups are omitted
+        """
+        if relationship_type == RelationshipType.IMPORTS:
+            external_rels = [rel for rel in relationships if rel.target_id.startswith("external:")]
+            internal_rels = [rel for rel in relationships if not rel.target_id.startswith("external:")]
+        else:
+            external_rels = []
+            internal_rels = relationships
+        
+        operations = []
+        
+        if external_rels:
+            external_query = f"""
+            UNWIND $relationships AS rel
+            MATCH (source {{id: rel.source_id}})
+            MERGE (target:ExternalModule {{id: rel.target_id}})
+            ON CREATE SET target.name = substring(rel.target_id, 9)
+            CREATE (source)-[r:{relationship_type.value}]->(target)
+            SET r.metadata = COALESCE(rel.metadata, '{{}}')
+            RETURN count(r) AS count
+            """
+            operations.append((external_query, {"relationships": self._relationships_to_properties(external_rels)}))
+        
+        if internal_rels:
+            internal_query = f"""
+            UNWIND $relationships AS rel
+            MATCH (source {{id: rel.source_id}})
+            MATCH (target {{id: rel.target_id}})
+            CREATE (source)-[r:{relationship_type.value}]->(target)
+            SET r.metadata = COALESCE(rel.metadata, '{{}}')
+            RETURN count(r) AS count
+            """
+            operations.append((internal_query, {"relationships": self._relationships_to_properties(internal_rels)}))
+        
+        return operations
+    
+    def _relationships_to_properties(self, relationships: List[CodeRelationship]) -> List[Dict[str, Any]]:
+        """Convert relationships to UNWIND parameter rows.
+        
+        Args:
+            relationships: List of relationships
+            
+        Returns:
+            List of relationship rows
+        """
+        rel_data: List[Dict[str, Any]] = []
+        for rel in relationships:
+            data = {"source_id": rel.source_id, "target_id": rel.target_id}
+            if rel.metadata:
+                data["metadata"] = json.dumps(rel.metadata)
+            rel_data.append(data)
+        return rel_data
+    
+    def _build_write_operations(
+        self,
+        project_id: str,
+        entities: List[CodeEntity],
+        relationships: List[CodeRelationship]
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Build batched UNWIND operations creating entities then relationships.
+        
+        Args:
+            project_id: Project ID the entities belong to
+            entities: Entities to create
+            relationships: Relationships to create
+            
+        Returns:
+            List of (query, parameters) tuples for atomic execution
+        """
+        operations: List[Tuple[str, Dict[str, Any]]] = []
+        
+        entities_by_type: Dict[EntityType, List[CodeEntity]] = {}
+        for entity in entities:
+            if entity.entity_type not in entities_by_type:
+                entities_by_type[entity.entity_type] = []
+            entities_by_type[entity.entity_type].append(entity)
+        
+        for entity_type, type_entities in entities_by_type.items():
+            label = _ENTITY_TYPE_TO_LABEL[entity_type]
+            entity_query = f"""
+            UNWIND $entities AS entity
+            CREATE (n:{label})
+            SET n = entity
+            RETURN id(n) AS node_id
+            """
+            entity_data = [self._entity_to_properties(project_id, entity) for entity in type_entities]
+            operations.append((entity_query, {"entities": entity_data}))
+        
+        relationships_by_type: Dict[RelationshipType, List[CodeRelationship]] = {}
+        for rel in relationships:
+            if rel.relationship_type not in relationships_by_type:
+                relationships_by_type[rel.relationship_type] = []
+            relationships_by_type[rel.relationship_type].append(rel)
+        
+        for rel_type, type_rels in relationships_by_type.items():
+            operations.extend(self._relationship_operations(rel_type, type_rels))
+        
+        return operations
+    
     async def create_relationships(
         self,
         relationships: List[CodeRelationship]
@@ -392,84 +587,10 @@ class GraphService:
                 "created_at": created_at.isoformat(),
             }))
             
-            # 2. Create entities (grouped by type)
-            entities_by_type: Dict[EntityType, List[CodeEntity]] = {}
-            for entity in entities:
-                if entity.entity_type not in entities_by_type:
-                    entities_by_type[entity.entity_type] = []
-                entities_by_type[entity.entity_type].append(entity)
-            
-            label_map = {
-                EntityType.FILE: "File",
-                EntityType.FUNCTION: "Function",
-                EntityType.CLASS: "Class",
-                EntityType.VARIABLE: "Variable",
-                EntityType.IMPORT: "Import",
-            }
-            
-            for entity_type, type_entities in entities_by_type.items():
-                label = label_map[entity_type]
-                entity_data = []
-                
-                for entity in type_entities:
-                    data = {
-                        "id": entity.id or f"{project_id}_{entity.entity_type.value}_{entity.name}_{entity.start_line}",
-                        "project_id": project_id,
-                        "name": entity.name,
-                        "file_path": entity.file_path,
-                        "start_line": entity.start_line,
-                        "end_line": entity.end_line,
-                        "language": entity.language.value,
-                    }
-                    
-                    if entity.signature:
-                        data["signature"] = entity.signature
-                    if entity.docstring:
-                        data["docstring"] = entity.docstring
-                    if entity.body:
-                        data["body"] = entity.body
-                    if entity.metadata:
-                        import json
-                        data["metadata"] = json.dumps(entity.metadata)
-                    
-                    entity_data.append(data)
-                
-                entity_query = f"""
-                UNWIND $entities AS entity
-                CREATE (n:{label})
-                SET n = entity
-                RETURN id(n) AS node_id
-                """
-                operations.append((entity_query, {"entities": entity_data}))
-            
-            # 3. Create relationships (grouped by type)
-            relationships_by_type: Dict[RelationshipType, List[CodeRelationship]] = {}
-            for rel in relationships:
-                if rel.relationship_type not in relationships_by_type:
-                    relationships_by_type[rel.relationship_type] = []
-                relationships_by_type[rel.relationship_type].append(rel)
-            
-            for rel_type, type_rels in relationships_by_type.items():
-                rel_data = []
-                for rel in type_rels:
-                    data = {
-                        "source_id": rel.source_id,
-                        "target_id": rel.target_id,
-                    }
-                    if rel.metadata:
-                        import json
-                        data["metadata"] = json.dumps(rel.metadata)
-                    rel_data.append(data)
-                
-                rel_query = f"""
-                UNWIND $relationships AS rel
-                MATCH (source {{id: rel.source_id}})
-                MATCH (target {{id: rel.target_id}})
-                CREATE (source)-[r:{rel_type.value}]->(target)
-                SET r.metadata = COALESCE(rel.metadata, '{{}}')
-                RETURN count(r) AS count
-                """
-                operations.append((rel_query, {"relationships": rel_data}))
+            # 2. Create entities and relationships (grouped by type)
+            operations.extend(
+                self._build_write_operations(project_id, entities, relationships)
+            )
             
             # Execute all operations atomically
             await self.neo4j.execute_atomic_write(operations)
@@ -515,61 +636,12 @@ class GraphService:
         Returns:
             Count of created relationships
         """
-        def _serialize(rel_group: List[CodeRelationship]) -> List[Dict[str, Any]]:
-            rel_data: List[Dict[str, Any]] = []
-            for rel in rel_group:
-                data = {"source_id": rel.source_id, "target_id": rel.target_id}
-                if rel.metadata:
-                    import json
-                    data["metadata"] = json.dumps(rel.metadata)
-                rel_data.append(data)
-            return rel_data
-
-        async def _run_query(rel_data: List[Dict[str, Any]], query: str) -> int:
-            if not rel_data:
-                return 0
-            result = await self.neo4j.execute_write_with_retry(query, {"relationships": rel_data})
-            return int(result[0]["count"]) if result else 0
-
         try:
-            if relationship_type == RelationshipType.IMPORTS:
-                external_rels = [rel for rel in relationships if rel.target_id.startswith("external:")]
-                internal_rels = [rel for rel in relationships if not rel.target_id.startswith("external:")]
-
-                external_query = f"""
-                UNWIND $relationships AS rel
-                MATCH (source {{id: rel.source_id}})
-                MERGE (target:ExternalModule {{id: rel.target_id}})
-                ON CREATE SET target.name = substring(rel.target_id, 9)
-                CREATE (source)-[r:{relationship_type.value}]->(target)
-                SET r.metadata = COALESCE(rel.metadata, '{{}}')
-                RETURN count(r) AS count
-                """
-                internal_query = f"""
-                UNWIND $relationships AS rel
-                MATCH (source {{id: rel.source_id}})
-                MATCH (target {{id: rel.target_id}})
-                CREATE (source)-[r:{relationship_type.value}]->(target)
-                SET r.metadata = COALESCE(rel.metadata, '{{}}')
-                RETURN count(r) AS count
-                """
-
-                external_count = await _run_query(_serialize(external_rels), external_query)
-                internal_count = await _run_query(_serialize(internal_rels), internal_query)
-                count = external_count + internal_count
-                attempted = len(relationships)
-            else:
-                rel_data = _serialize(relationships)
-                query = f"""
-                UNWIND $relationships AS rel
-                MATCH (source {{id: rel.source_id}})
-                MATCH (target {{id: rel.target_id}})
-                CREATE (source)-[r:{relationship_type.value}]->(target)
-                SET r.metadata = COALESCE(rel.metadata, '{{}}')
-                RETURN count(r) AS count
-                """
-                count = await _run_query(rel_data, query)
-                attempted = len(rel_data)
+            count = 0
+            for query, parameters in self._relationship_operations(relationship_type, relationships):
+                result = await self.neo4j.execute_write_with_retry(query, parameters)
+                count += int(result[0]["count"]) if result else 0
+            attempted = len(relationships)
 
             logger.info(
                 f"Successfully created {count} {relationship_type.value} relationships "
@@ -851,53 +923,80 @@ class GraphService:
         if filters is None:
             filters = GraphFilters()
         
-        # Build filter conditions
-        conditions = ["n.project_id = $project_id"]
         parameters: Dict[str, Any] = {"project_id": project_id}
         
         if filters.entity_types:
-            # Filter by entity type (node labels)
-            labels = [self._entity_type_to_label(et) for et in filters.entity_types]
-            label_filter = " OR ".join([f"n:{label}" for label in labels])
-            conditions.append(f"({label_filter})")
+            parameters["entity_labels"] = [
+                _ENTITY_TYPE_TO_LABEL[et] for et in filters.entity_types
+            ]
         
         if filters.languages:
-            conditions.append("n.language IN $languages")
             parameters["languages"] = [lang.value for lang in filters.languages]
         
         if filters.file_pattern:
-            conditions.append("n.file_path =~ $file_pattern")
             parameters["file_pattern"] = filters.file_pattern
         
-        where_clause = " AND ".join(conditions)
+        where_clause = _build_where(
+            bool(filters.entity_types),
+            bool(filters.languages),
+            bool(filters.file_pattern)
+        )
         
         # Query for nodes
+        # Only the properties needed for visualization are returned, so large
+        # fields such as body, docstring and signature never cross the wire
         nodes_query = f"""
         MATCH (n)
         WHERE {where_clause}
-        RETURN n
+        RETURN n.id AS id,
+               n.name AS name,
+               labels(n) AS labels,
+               n.file_path AS file_path,
+               n.metadata AS metadata
         LIMIT $max_nodes
         """
         parameters["max_nodes"] = filters.max_nodes
         
-        # Query for edges between filtered nodes
-        edges_query = f"""
-        MATCH (source)-[r]->(target)
-        WHERE source.project_id = $project_id 
-          AND target.project_id = $project_id
-        RETURN source.id AS source_id, 
-               target.id AS target_id, 
+        # Query for edges between the selected nodes only, so the edge scan
+        # is bounded by the node set rather than the whole project
+        edges_query = """
+        UNWIND $node_ids AS source_id
+        MATCH (source {id: source_id, project_id: $project_id})-[r]->(target)
+        WHERE target.id IN $node_ids
+        RETURN source.id AS source_id,
+               target.id AS target_id,
                type(r) AS rel_type
-        LIMIT $max_nodes
+        LIMIT $max_edges
         """
         
         try:
-            # Get nodes
+            # Get nodes; the raw records are released before edges are fetched
+            # so both result sets are never held at once
+            build_node = self._build_graph_node
             nodes_result = await self.neo4j.execute_with_retry(nodes_query, parameters)
-            nodes = [self._node_to_graph_node(record["n"]) for record in nodes_result]
+            nodes = [
+                build_node(
+                    record["id"] or "",
+                    record["name"] or "",
+                    record["labels"] or (),
+                    record["file_path"] or "",
+                    record["metadata"],
+                )
+                for record in nodes_result
+            ]
+            del nodes_result
             
             # Get edges
-            edges_result = await self.neo4j.execute_with_retry(edges_query, parameters)
+            edges_result = []
+            if nodes:
+                edges_result = await self.neo4j.execute_with_retry(
+                    edges_query,
+                    {
+                        "project_id": project_id,
+                        "node_ids": [node.id for node in nodes],
+                        "max_edges": filters.max_edges,
+                    }
+                )
             edges = [
                 GraphEdge(
                     source=record["source_id"],
@@ -956,28 +1055,14 @@ class GraphService:
         Returns:
             CodeEntity object
         """
-        import json
-        
         # Determine entity type from node labels
-        labels = node.get("labels", [])
-        entity_type = EntityType.FUNCTION  # default
-        
-        if "File" in labels:
-            entity_type = EntityType.FILE
-        elif "Function" in labels:
-            entity_type = EntityType.FUNCTION
-        elif "Class" in labels:
-            entity_type = EntityType.CLASS
-        elif "Variable" in labels:
-            entity_type = EntityType.VARIABLE
-        elif "Import" in labels:
-            entity_type = EntityType.IMPORT
+        entity_type = _labels_to_entity_type(node.get("labels", ()))
         
         # Parse metadata if present
         metadata = {}
         if "metadata" in node and node["metadata"]:
             try:
-                metadata = json.loads(node["metadata"])
+                metadata = orjson.loads(node["metadata"])
             except json.JSONDecodeError:
                 pass
         
@@ -1005,38 +1090,53 @@ class GraphService:
         Returns:
             GraphNode object
         """
-        import json
-        
-        labels = node.get("labels", [])
-        entity_type = EntityType.FUNCTION
-        
-        if "File" in labels:
-            entity_type = EntityType.FILE
-        elif "Function" in labels:
-            entity_type = EntityType.FUNCTION
-        elif "Class" in labels:
-            entity_type = EntityType.CLASS
-        elif "Variable" in labels:
-            entity_type = EntityType.VARIABLE
-        elif "Import" in labels:
-            entity_type = EntityType.IMPORT
+        return self._build_graph_node(
+            node.get("id", ""),
+            node.get("name", ""),
+            node.get("labels", []),
+            node.get("file_path", ""),
+            node.get("metadata"),
+        )
+    
+    def _build_graph_node(
+        self,
+        node_id: str,
+        name: str,
+        labels: List[str],
+        file_path: str,
+        metadata_json: Optional[str]
+    ) -> GraphNode:
+        """Build a GraphNode from already-extracted node fields.
+        
+        Args:
+            node_id: Entity ID
+            name: Entity name, used as the display label
+            labels: Neo4j labels of the node
+            file_path: Source file path
+            metadata_json: Metadata as stored on the node (JSON string)
+            
+        Returns:
+            GraphNode object
+        """
+        entity_type = _labels_to_entity_type(labels)
         
         metadata = {}
-        if "metadata" in node and node["metadata"]:
+        if metadata_json:
             try:
-                metadata = json.loads(node["metadata"])
+                metadata = orjson.loads(metadata_json)
             except json.JSONDecodeError:
                 pass
         
         return GraphNode(
-            id=node.get("id", ""),
-            label=node.get("name", ""),
+            id=node_id,
+            label=name,
             type=entity_type,
-            file_path=node.get("file_path", ""),
+            file_path=file_path,
             metadata=metadata
         )
     
-    def _entity_type_to_label(self, entity_type: EntityType) -> str:
+    @staticmethod
+    def _entity_type_to_label(entity_type: EntityType) -> str:
         """Convert EntityType to Neo4j label.
         
         Args:
@@ -1045,14 +1145,7 @@ class GraphService:
         Returns:
             Neo4j label string
         """
-        label_map = {
-            EntityType.FILE: "File",
-            EntityType.FUNCTION: "Function",
-            EntityType.CLASS: "Class",
-            EntityType.VARIABLE: "Variable",
-            EntityType.IMPORT: "Import",
-        }
-        return label_map[entity_type]
+        return _ENTITY_TYPE_TO_LABEL[entity_type]
 
     async def update_project(
         self,
@@ -1093,29 +1186,20 @@ class GraphService:
         }
         
         try:
-            # Delete entities from deleted files
-            for file_path in deleted_files:
-                removed = await self._delete_file_entities(project_id, file_path)
-                stats['files_deleted'] += 1
-                stats['entities_removed'] += removed
-            
-            # Update changed files
-            for file_path, entities, relationships in changed_files:
-                # Remove old entities from this file
-                removed = await self._delete_file_entities(project_id, file_path)
-                stats['entities_removed'] += removed
-                
-                # Add new entities
-                if entities:
-                    await self.create_entities(entities)
-                    stats['entities_added'] += len(entities)
-                
-                # Add new relationships
-                if relationships:
-                    await self.create_relationships(relationships)
-                    stats['relationships_added'] += len(relationships)
-                
-                stats['files_updated'] += 1
+            if self.batch_updates:
+                stats['entities_removed'] = await self._update_project_in_transaction(
+                    project_id, changed_files, deleted_files
+                )
+            else:
+                stats['entities_removed'] = await self._update_project_concurrently(
+                    project_id, changed_files, deleted_files
+                )
+            
+            for _, entities, relationships in changed_files:
+                stats['entities_added'] += len(entities)
+                stats['relationships_added'] += len(relationships)
+            stats['files_updated'] = len(changed_files)
+            stats['files_deleted'] = len(deleted_files)
             
             logger.info(f"Project update complete: {stats}")
             return stats
@@ -1124,6 +1208,103 @@ class GraphService:
             logger.error(f"Failed to update project {project_id}: {e}")
             raise
     
+    async def _update_project_in_transaction(
+        self,
+        project_id: str,
+        changed_files: List[Tuple[str, List[CodeEntity], List[CodeRelationship]]],
+        deleted_files: List[str]
+    ) -> int:
+        """Apply an incremental update as UNWIND batches in one write transaction.
+        
+        All file deletions, entity creations and relationship creations share a
+        single session and commit, so the update is applied atomically.
+        
+        Args:
+            project_id: Project identifier
+            changed_files: List of (file_path, entities, relationships) for changed files
+            deleted_files: List of file paths that were deleted
+            
+        Returns:
+            Number of entities removed
+        """
+        file_paths = list(deleted_files) + [file_path for file_path, _, _ in changed_files]
+        entities = [entity for _, file_entities, _ in changed_files for entity in file_entities]
+        relationships = [rel for _, _, file_rels in changed_files for rel in file_rels]
+        
+        delete_query = """
+        UNWIND $file_paths AS file_path
+        MATCH (e {project_id: $project_id, file_path: file_path})
+        DETACH DELETE e
+        RETURN count(e) AS deleted_count
+        """
+        
+        async with self.neo4j.transaction() as tx:
+            removed = 0
+            if file_paths:
+                result = await tx.run(
+                    delete_query,
+                    {"project_id": project_id, "file_paths": file_paths}
+                )
+                record = await result.single()
+                removed = record["deleted_count"] if record else 0
+            
+            for query, parameters in self._build_write_operations(project_id, entities, relationships):
+                result = await tx.run(query, parameters)
+                await result.consume()
+        
+        await self._update_project_counts(project_id)
+        
+        return removed
+    
+    async def _update_project_concurrently(
+        self,
+        project_id: str,
+        changed_files: List[Tuple[str, List[CodeEntity], List[CodeRelationship]]],
+        deleted_files: List[str]
+    ) -> int:
+        """Apply an incremental update as concurrent per-file operations.
+        
+        Used when batched updates are disabled. Each operation runs in its own
+        transaction, with at most _UPDATE_CONCURRENCY in flight at once.
+        
+        Args:
+            project_id: Project identifier
+            changed_files: List of (file_path, entities, relationships) for changed files
+            deleted_files: List of file paths that were deleted
+            
+        Returns:
+            Number of entities removed
+        """
+        semaphore = asyncio.Semaphore(_UPDATE_CONCURRENCY)
+        
+        async def _bounded(coro):
+            async with semaphore:
+                return await coro
+        
+        # Delete entities from deleted and changed files concurrently; every
+        # delete must finish before new entities for a changed file are added
+        paths_to_clear = list(deleted_files) + [file_path for file_path, _, _ in changed_files]
+        removed_counts = await asyncio.gather(*[
+            _bounded(self._delete_file_entities(project_id, file_path))
+            for file_path in paths_to_clear
+        ])
+        
+        # Add new entities from changed files
+        await asyncio.gather(*[
+            _bounded(self.create_entities(project_id, entities))
+            for _, entities, _ in changed_files
+            if entities
+        ])
+        
+        # Relationships may span files, so they are created once all entities exist
+        await asyncio.gather(*[
+            _bounded(self.create_relationships(relationships))
+            for _, _, relationships in changed_files
+            if relationships
+        ])
+        
+        return sum(removed_counts)
+    
     async def _delete_file_entities(
         self,
         project_id: str,
@@ -1179,40 +1360,28 @@ class GraphService:
         logger.info(f"Deleting project {project_id}")
         
         try:
-            # Count entities before deletion
-            count_query = """
-            MATCH (e {project_id: $project_id})
-            RETURN count(e) AS entity_count
-            """
-            
-            count_result = await self.neo4j.execute_with_retry(
-                count_query,
-                {"project_id": project_id}
-            )
-            
-            entity_count = count_result[0]["entity_count"] if count_result else 0
-            
-            # Delete all entities and relationships for this project
+            # Count and delete entities, their relationships, and the project
+            # node in one statement so the count matches what was removed
             delete_query = """
-            MATCH (e {project_id: $project_id})
-            DETACH DELETE e
+            OPTIONAL MATCH (e {project_id: $project_id})
+            WITH collect(e) AS entities
+            CALL {
+                WITH entities
+                UNWIND entities AS e
+                DETACH DELETE e
+            }
+            WITH size(entities) AS entity_count
+            OPTIONAL MATCH (p:Project {id: $project_id})
+            DELETE p
+            RETURN entity_count
             """
             
-            await self.neo4j.execute_with_retry(
+            result = await self.neo4j.execute_with_retry(
                 delete_query,
                 {"project_id": project_id}
             )
             
-            # Delete project node
-            delete_project_query = """
-            MATCH (p:Project {id: $project_id})
-            DELETE p
-            """
-            
-            await self.neo4j.execute_with_retry(
-                delete_project_query,
-                {"project_id": project_id}
-            )
+            entity_count = result[0]["entity_count"] if result else 0
             
             stats = {
                 'entities_deleted': entity_count,
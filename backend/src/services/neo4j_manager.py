@@ -3,7 +3,7 @@
 This module provides a connection manager for Neo4j database with:
 - Connection pooling
 - Health checks
-- Exponential backoff retry logic (3 retries)
+- Exponential backoff retry logic with jitter (3 retries)
 - Automatic reconnection on failures
 
 Validates: Requirements 10.2
@@ -11,11 +11,14 @@ Validates: Requirements 10.2
 
 import asyncio
 import logging
+import random
+import re
 import time
-from contextlib import asynccontextmanager
-from typing import Any, Dict, List, Optional
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-from neo4j import AsyncGraphDatabase, AsyncDriver, AsyncSession
+from neo4j import AsyncGraphDatabase, AsyncDriver, AsyncSession, READ_ACCESS
 from neo4j.exceptions import (
     ServiceUnavailable,
     SessionExpired,
@@ -29,6 +32,191 @@ from ..utils.errors import DatabaseConnectionError, DatabaseQueryError
 
 logger = logging.getLogger(__name__)
 
+# Errors worth retrying: the database or connection is temporarily unavailable
+_RETRYABLE_ERRORS = (ServiceUnavailable, SessionExpired, TransientError)
+# Errors that mean the connection was lost and the driver should reconnect
+_CONNECTION_LOST_ERRORS = (ServiceUnavailable, SessionExpired)
+
+# Seconds for which a passed health check is reused instead of re-probing
+_HEALTH_CHECK_TTL = 5.0
+
+# Shared stand-in for omitted query parameters; never mutated
+_EMPTY_PARAMS: Dict[str, Any] = {}
+
+# Update counters reported for each statement when results aren't collected
+_SUMMARY_COUNTERS = (
+    "nodes_created",
+    "nodes_deleted",
+    "relationships_created",
+    "relationships_deleted",
+    "properties_set",
+)
+
+# Matches Cypher parameter references such as $project_id
+_PARAMETER_PATTERN = re.compile(r"\$(\w+)")
+
+
+# Quoted literals (group 1), which are kept verbatim, or a run of whitespace
+# and // or /* */ comments
+_QUERY_WHITESPACE_PATTERN = re.compile(
+    r"('(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`)"
+    r"|(?:\s+|//[^\n]*|/\*.*?\*/)+",
+    re.DOTALL
+)
+
+
+@lru_cache(maxsize=1024)
+def _normalize_query(query: str) -> str:
+    """Collapse whitespace in a query so equivalent queries share a plan.
+    
+    The server's plan cache is keyed on the exact query text, so the same
+    query formatted differently (indentation, line breaks, comments) would be
+    planned separately. Comments are dropped, since a ``//`` comment would
+    otherwise swallow the rest of the joined line. Whitespace inside string
+    literals and escaped names is kept.
+    
+    Args:
+        query: Cypher query string
+        
+    Returns:
+        Query with each run of whitespace and comments outside literals
+        replaced by one space
+    """
+    return _QUERY_WHITESPACE_PATTERN.sub(
+        lambda match: match.group(1) or " ", query
+    ).strip()
+
+
+@lru_cache(maxsize=128)
+def _to_batched_query(query: str) -> str:
+    """Rewrite a parameterized query to run once per row of $_batch_rows.
+    
+    Each ``$name`` reference becomes ``_batch_row.name`` and the query runs in
+    a CALL subquery per row, tagging its records with the row index so the
+    results can be split back into one list per original operation.
+    
+    Args:
+        query: Cypher query whose parameters are referenced as ``$name``
+        
+    Returns:
+        Batched Cypher query taking a single $_batch_rows list parameter
+    """
+    body = _PARAMETER_PATTERN.sub(r"_batch_row.\1", query)
+    return (
+        "UNWIND range(0, size($_batch_rows) - 1) AS _batch_index\n"
+        "WITH _batch_index, $_batch_rows[_batch_index] AS _batch_row\n"
+        f"CALL {{\nWITH _batch_row\n{body}\n}}\n"
+        "RETURN *"
+    )
+
+
+def _group_operations(
+    operations: List[Tuple[str, Dict[str, Any]]],
+    sequential: bool,
+) -> List[Tuple[str, List[int]]]:
+    """Group write operations that can be sent as one batched statement.
+    
+    Operations group together when they share the query string and parameter
+    names. In sequential mode only consecutive operations are grouped, so
+    statements run in the original order; otherwise every matching operation
+    joins the group of its first occurrence.
+    
+    Args:
+        operations: List of (query, parameters) tuples
+        sequential: Only group consecutive operations
+        
+    Returns:
+        List of (query, operation indices) in execution order
+    """
+    groups: List[Tuple[Tuple[str, frozenset], List[int]]] = []
+    open_groups: Dict[Tuple[str, frozenset], List[int]] = {}
+    for index, (query, parameters) in enumerate(operations):
+        key = (query, frozenset(parameters))
+        if sequential:
+            if groups and groups[-1][0] == key:
+                groups[-1][1].append(index)
+            else:
+                groups.append((key, [index]))
+            continue
+        
+        indices = open_groups.get(key)
+        if indices is None:
+            indices = open_groups[key] = []
+            groups.append((key, indices))
+        indices.append(index)
+    
+    return [(key[0], indices) for key, indices in groups]
+
+
+class _SessionContext:
+    """Async context manager returned by Neo4jConnectionManager.session().
+    
+    Written as a plain class rather than with @asynccontextmanager because it
+    wraps every query; it skips the generator machinery on enter and exit.
+    """
+    
+    __slots__ = ("_manager", "_kwargs", "session")
+    
+    def __init__(self, manager: "Neo4jConnectionManager", kwargs: Dict[str, Any]):
+        self._manager = manager
+        self._kwargs = kwargs
+        self.session: Optional[AsyncSession] = None
+    
+    async def __aenter__(self) -> AsyncSession:
+        self.session = await self._manager._open_session(self._kwargs)
+        return self.session
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.session.close()
+
+
+class _TransactionContext:
+    """Async context manager returned by Neo4jConnectionManager.transaction().
+    
+    Commits on a clean exit and rolls back on any exception, re-raising it as
+    DatabaseQueryError.
+    """
+    
+    __slots__ = ("_manager", "_kwargs", "_session", "_tx")
+    
+    def __init__(self, manager: "Neo4jConnectionManager", kwargs: Dict[str, Any]):
+        self._manager = manager
+        self._kwargs = kwargs
+        self._session = None
+        self._tx = None
+    
+    async def __aenter__(self):
+        session = await self._manager._open_session(self._kwargs)
+        try:
+            self._tx = await session.begin_transaction()
+        except BaseException:
+            await session.close()
+            raise
+        self._session = session
+        return self._tx
+    
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        try:
+            if exc_type is None:
+                try:
+                    await self._tx.commit()
+                except Exception as e:
+                    await self._rollback(e)
+                else:
+                    logger.debug("Transaction committed successfully")
+            elif issubclass(exc_type, Exception):
+                await self._rollback(exc)
+        finally:
+            await self._session.close()
+        return False
+    
+    async def _rollback(self, error: BaseException) -> None:
+        await self._tx.rollback()
+        logger.warning(f"Transaction rolled back due to error: {str(error)}")
+        raise DatabaseQueryError(
+            f"Transaction failed and was rolled back: {str(error)}"
+        ) from error
+
 
 class Neo4jConnectionManager:
     """Manages Neo4j database connections with retry logic and health checks.
@@ -78,6 +266,8 @@ class Neo4jConnectionManager:
         self.user = user or settings.neo4j_user
         self.password = password or settings.neo4j_password
         self.database = database or settings.neo4j_database
+        # Merged under per-call session kwargs, which take precedence
+        self._default_session_kwargs = {"database": self.database}
         self.max_connection_pool_size = (
             max_connection_pool_size or settings.neo4j_max_connection_pool_size
         )
@@ -86,37 +276,85 @@ class Neo4jConnectionManager:
         )
         self.max_retries = max_retries
         self.initial_retry_delay = initial_retry_delay
+        # Base backoff delay per attempt; jitter is applied when sleeping
+        self._retry_delays = tuple(
+            initial_retry_delay * (2.0 ** i) for i in range(max_retries)
+        )
         
         self._driver: Optional[AsyncDriver] = None
-        self._is_connected = False
+        # Created lazily because no event loop may be running yet; set while connected
+        self._connected_event: Optional[asyncio.Event] = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+        # Long-lived read session for execute_with_retry(..., reuse=True)
+        self._shared_read_session: Optional[AsyncSession] = None
+        self._shared_lock: Optional[asyncio.Lock] = None
+        # Monotonic time of the last passed health check
+        self._last_health_check_ts = 0.0
         
         logger.info(
-            f"Initialized Neo4j connection manager: uri={self.uri}, "
-            f"database={self.database}, max_pool_size={self.max_connection_pool_size}"
+            "Initialized Neo4j connection manager: uri=%s, database=%s, max_pool_size=%s",
+            self.uri,
+            self.database,
+            self.max_connection_pool_size,
         )
     
-    async def connect(self) -> None:
+    async def connect(self, warm_pool: bool = False) -> None:
         """Establish connection to Neo4j database with retry logic.
         
         Attempts to connect to Neo4j with exponential backoff retry logic.
-        Retries up to max_retries times with exponentially increasing delays.
+        Retries up to max_retries times with jittered, exponentially increasing delays.
+        
+        Concurrent callers share a single connection attempt: only one coroutine
+        creates the driver, and the others return once it is connected.
+        
+        Args:
+            warm_pool: Open settings.neo4j_warm_pool_size pooled connections up
+                front after connecting, so early queries skip the Bolt handshake
+                (default: False)
         
         Raises:
             DatabaseConnectionError: If connection fails after all retries
         """
-        if self._is_connected and self._driver:
+        if self.is_connected and self._driver:
             logger.debug("Already connected to Neo4j")
             return
         
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        
+        async with self._connect_lock:
+            # Another coroutine may have connected while we waited for the lock
+            if self.is_connected and self._driver:
+                logger.debug("Already connected to Neo4j")
+                return
+            
+            await self._connect()
+            
+            if warm_pool:
+                await self._warm_pool(
+                    min(self.max_connection_pool_size, settings.neo4j_warm_pool_size)
+                )
+    
+    async def _connect(self) -> None:
+        """Create the driver and verify connectivity, retrying transient errors.
+        
+        Must be called with the connect lock held.
+        
+        Raises:
+            DatabaseConnectionError: If connection fails after all retries
+        """
         last_error = None
-        retry_delay = self.initial_retry_delay
+        max_retries = self.max_retries
         
-        for attempt in range(1, self.max_retries + 1):
+        for attempt in range(1, max_retries + 1):
             try:
                 logger.info(
-                    f"Attempting to connect to Neo4j (attempt {attempt}/{self.max_retries})"
+                    f"Attempting to connect to Neo4j (attempt {attempt}/{max_retries})"
                 )
                 
+                # Close the driver of a lost connection or failed attempt so
+                # its pool's sockets aren't leaked
+                await self._close_stale_driver()
                 self._driver = AsyncGraphDatabase.driver(
                     self.uri,
                     auth=(self.user, self.password),
@@ -124,23 +362,23 @@ class Neo4jConnectionManager:
                     connection_timeout=self.connection_timeout,
                 )
                 
-                # Verify connection with a simple query
-                await self.health_check()
+                # Verify connection without running a user query
+                await self._driver.verify_connectivity()
                 
-                self._is_connected = True
+                self._mark_connected()
                 logger.info(f"Successfully connected to Neo4j at {self.uri}")
                 return
                 
-            except (ServiceUnavailable, SessionExpired, TransientError) as e:
+            except _RETRYABLE_ERRORS as e:
                 last_error = e
+                retry_delay = self._retry_delay(attempt)
                 logger.warning(
                     f"Connection attempt {attempt} failed: {str(e)}. "
                     f"Retrying in {retry_delay:.1f}s..."
                 )
                 
-                if attempt < self.max_retries:
+                if attempt < max_retries:
                     await asyncio.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
                     
             except Exception as e:
                 # Non-retryable error
@@ -157,44 +395,121 @@ class Neo4jConnectionManager:
         logger.error(error_msg)
         raise DatabaseConnectionError(error_msg) from last_error
     
+    async def _close_stale_driver(self) -> None:
+        """Close and forget the current driver, ignoring errors from a dead pool."""
+        driver = self._driver
+        self._driver = None
+        if driver is None:
+            return
+        await self._discard_shared_session()
+        try:
+            await driver.close()
+        except Exception as e:
+            logger.debug(f"Error closing stale Neo4j driver: {str(e)}")
+    
+    async def _warm_pool(self, n: int) -> None:
+        """Populate the connection pool by running n concurrent probe queries.
+        
+        Each probe runs in its own session so it checks out a separate pooled
+        connection and completes a full Bolt exchange. Failures are logged and
+        ignored; connections are then opened lazily as usual.
+        
+        Args:
+            n: Number of connections to open
+        """
+        if n <= 0 or not self._driver:
+            return
+        
+        driver = self._driver
+        database = self.database
+        
+        async def _probe() -> None:
+            async with driver.session(database=database) as session:
+                result = await session.run("RETURN 1")
+                await result.consume()
+        
+        outcomes = await asyncio.gather(*[_probe() for _ in range(n)], return_exceptions=True)
+        failures = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+        if failures:
+            logger.warning(
+                f"Neo4j pool warm-up opened {n - len(failures)}/{n} connections: {str(failures[0])}"
+            )
+        else:
+            logger.debug(f"Warmed Neo4j connection pool with {n} connections")
+    
+    def _mark_connected(self) -> None:
+        """Record that the driver is connected, waking anyone checking the event."""
+        if self._connected_event is None:
+            self._connected_event = asyncio.Event()
+        self._connected_event.set()
+    
+    def _mark_disconnected(self) -> None:
+        """Record that the connection was lost or closed."""
+        if self._connected_event is not None:
+            self._connected_event.clear()
+    
+    def _retry_delay(self, attempt: int) -> float:
+        """Get the jittered backoff delay before retrying after an attempt.
+        
+        The base delay doubles per attempt and is scaled by a random factor in
+        [0.5, 1.5) so concurrent callers don't retry in lockstep.
+        
+        Args:
+            attempt: 1-based number of the attempt that just failed
+            
+        Returns:
+            Delay in seconds
+        """
+        return self._retry_delays[attempt - 1] * random.uniform(0.5, 1.5)
+    
     async def close(self) -> None:
         """Close the Neo4j driver and all connections."""
+        await self._discard_shared_session()
         if self._driver:
             logger.info("Closing Neo4j connection")
             await self._driver.close()
             self._driver = None
-            self._is_connected = False
+            self._mark_disconnected()
+            self._last_health_check_ts = 0.0
             logger.info("Neo4j connection closed")
     
     async def health_check(self) -> bool:
         """Perform health check to verify database connectivity.
         
+        This is a fuller probe than the connectivity check done by connect():
+        it runs a query end to end against the configured database. A passed
+        check is reused for _HEALTH_CHECK_TTL seconds, so frequent callers
+        don't each cost a round trip.
+        
         Returns:
             True if database is healthy and responsive
             
         Raises:
             DatabaseConnectionError: If health check fails
         """
-        if not self._driver:
+        driver = self._driver
+        if not driver:
             raise DatabaseConnectionError("Driver not initialized")
         
+        now = time.monotonic()
+        if now - self._last_health_check_ts < _HEALTH_CHECK_TTL:
+            return True
+        
         try:
-            async with self._driver.session(database=self.database) as session:
-                result = await session.run("RETURN 1 AS health")
-                record = await result.single()
-                
-                if record and record["health"] == 1:
-                    logger.debug("Neo4j health check passed")
-                    return True
-                else:
-                    raise DatabaseConnectionError("Health check returned unexpected result")
-                    
+            async with driver.session(database=self.database) as session:
+                # Only the summary is needed: if the query ran, the database is responsive
+                result = await session.run("RETURN 1")
+                await result.consume()
+            
+            logger.debug("Neo4j health check passed")
+            self._last_health_check_ts = now
+            return True
+            
         except (Neo4jError, DriverError) as e:
             logger.error(f"Neo4j health check failed: {str(e)}")
             raise DatabaseConnectionError(f"Health check failed: {str(e)}") from e
     
-    @asynccontextmanager
-    async def session(self, **kwargs) -> AsyncSession:
+    def session(self, **kwargs) -> _SessionContext:
         """Create a Neo4j session with automatic connection management.
         
         This is a context manager that ensures the session is properly closed
@@ -215,24 +530,32 @@ class Neo4jConnectionManager:
                 result = await session.run("MATCH (n) RETURN n LIMIT 10")
                 records = await result.data()
         """
-        if not self._is_connected:
+        return _SessionContext(self, kwargs)
+    
+    async def _open_session(self, kwargs: Dict[str, Any]) -> AsyncSession:
+        """Open a driver session, connecting first if needed.
+        
+        Args:
+            kwargs: Arguments for driver.session(), merged over the defaults
+            
+        Returns:
+            AsyncSession: New Neo4j async session; the caller must close it
+            
+        Raises:
+            DatabaseConnectionError: If connection cannot be established
+        """
+        event = self._connected_event
+        if event is None or not event.is_set():
             await self.connect()
         
-        if not self._driver:
+        driver = self._driver
+        if not driver:
             raise DatabaseConnectionError("Driver not initialized")
         
-        # Set default database if not specified
-        if "database" not in kwargs:
-            kwargs["database"] = self.database
-        
-        session = self._driver.session(**kwargs)
-        try:
-            yield session
-        finally:
-            await session.close()
+        # Default database unless the caller specified one; the caller's dict is left untouched
+        return driver.session(**{**self._default_session_kwargs, **kwargs})
     
-    @asynccontextmanager
-    async def transaction(self, **session_kwargs):
+    def transaction(self, **session_kwargs) -> _TransactionContext:
         """Create a Neo4j transaction with automatic rollback on failure.
         
         This context manager provides atomic transaction support. If any
@@ -257,28 +580,7 @@ class Neo4jConnectionManager:
                 
         Validates: Requirements 12.5
         """
-        if not self._is_connected:
-            await self.connect()
-        
-        if not self._driver:
-            raise DatabaseConnectionError("Driver not initialized")
-        
-        # Set default database if not specified
-        if "database" not in session_kwargs:
-            session_kwargs["database"] = self.database
-        
-        async with self._driver.session(**session_kwargs) as session:
-            tx = await session.begin_transaction()
-            try:
-                yield tx
-                await tx.commit()
-                logger.debug("Transaction committed successfully")
-            except Exception as e:
-                await tx.rollback()
-                logger.warning(f"Transaction rolled back due to error: {str(e)}")
-                raise DatabaseQueryError(
-                    f"Transaction failed and was rolled back: {str(e)}"
-                ) from e
+        return _TransactionContext(self, session_kwargs)
     
     async def execute_with_retry(
         self,
@@ -292,10 +594,15 @@ class Neo4jConnectionManager:
         This is useful for queries that may fail due to temporary network issues
         or database load.
         
+        Pass ``reuse=True`` for read-only queries that don't need their own
+        session: they run on one long-lived read session shared by all such
+        callers (one query at a time), which avoids per-call session setup.
+        
         Args:
             query: Cypher query string
             parameters: Query parameters (default: None)
-            **session_kwargs: Additional arguments for session creation
+            **session_kwargs: Additional arguments for session creation, plus
+                the optional ``reuse`` flag
             
         Returns:
             List of result records as dictionaries
@@ -304,36 +611,42 @@ class Neo4jConnectionManager:
             DatabaseQueryError: If query fails after all retries
         """
         if parameters is None:
-            parameters = {}
+            parameters = _EMPTY_PARAMS
         
+        reuse = session_kwargs.pop("reuse", False)
+        normalized = _normalize_query(query)
         last_error = None
-        retry_delay = self.initial_retry_delay
+        max_retries = self.max_retries
         
-        for attempt in range(1, self.max_retries + 1):
+        for attempt in range(1, max_retries + 1):
             try:
-                async with self.session(**session_kwargs) as session:
-                    result = await session.run(query, parameters)
-                    records = await result.data()
+                if reuse:
+                    records = await self._run_on_shared_session(normalized, parameters)
+                else:
+                    async with self.session(**session_kwargs) as session:
+                        result = await session.run(normalized, parameters)
+                        records = await result.data()
+                if logger.isEnabledFor(logging.DEBUG):
                     logger.debug(
                         f"Query executed successfully: {query[:100]}... "
                         f"(returned {len(records)} records)"
                     )
-                    return records
+                return records
                     
-            except (ServiceUnavailable, SessionExpired, TransientError) as e:
+            except _RETRYABLE_ERRORS as e:
                 last_error = e
+                retry_delay = self._retry_delay(attempt)
                 logger.warning(
                     f"Query attempt {attempt} failed: {str(e)}. "
                     f"Retrying in {retry_delay:.1f}s..."
                 )
                 
-                if attempt < self.max_retries:
+                if attempt < max_retries:
                     await asyncio.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
                     
                     # Try to reconnect if connection was lost
-                    if isinstance(e, (ServiceUnavailable, SessionExpired)):
-                        self._is_connected = False
+                    if isinstance(e, _CONNECTION_LOST_ERRORS):
+                        self._mark_disconnected()
                         try:
                             await self.connect()
                         except DatabaseConnectionError:
@@ -366,6 +679,108 @@ class Neo4jConnectionManager:
             details={"query": query, "parameters": parameters}
         ) from last_error
     
+    async def _run_on_shared_session(
+        self,
+        query: str,
+        parameters: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        """Run a read query on the shared read session.
+        
+        A session carries one result stream at a time, so queries on the shared
+        session are serialized. The session is discarded on any error so the
+        next call starts from a fresh one.
+        
+        Args:
+            query: Cypher query string
+            parameters: Query parameters
+            
+        Returns:
+            List of result records as dictionaries
+        """
+        if self._shared_lock is None:
+            self._shared_lock = asyncio.Lock()
+        
+        async with self._shared_lock:
+            session = self._shared_read_session
+            if session is None:
+                if not self.is_connected:
+                    await self.connect()
+                driver = self._driver
+                if not driver:
+                    raise DatabaseConnectionError("Driver not initialized")
+                session = self._shared_read_session = driver.session(
+                    database=self.database,
+                    default_access_mode=READ_ACCESS,
+                )
+            
+            try:
+                result = await session.run(query, parameters)
+                return await result.data()
+            except BaseException:
+                await self._discard_shared_session()
+                raise
+    
+    async def _discard_shared_session(self) -> None:
+        """Close and forget the shared read session, if one is open."""
+        session = self._shared_read_session
+        self._shared_read_session = None
+        if session is not None:
+            try:
+                await session.close()
+            except Exception as e:
+                logger.debug(f"Error closing shared Neo4j session: {str(e)}")
+    
+    async def stream_query(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        **session_kwargs,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Execute a read query and yield records one at a time.
+        
+        Unlike execute_with_retry, the result set is never materialized as a
+        whole: records are pulled from the server in fetch-size batches as the
+        caller consumes them. Because records may already have been handed to
+        the caller, failures are not retried.
+        
+        Args:
+            query: Cypher query string
+            parameters: Query parameters (default: None)
+            **session_kwargs: Additional arguments for session creation
+            
+        Yields:
+            Each result record as a dictionary
+            
+        Raises:
+            DatabaseQueryError: If the query fails
+            
+        Example:
+            async for record in manager.stream_query("MATCH (n) RETURN n.id AS id"):
+                process(record["id"])
+        """
+        if parameters is None:
+            parameters = _EMPTY_PARAMS
+        
+        try:
+            async with self.session(**session_kwargs) as session:
+                result = await session.run(query, parameters)
+                async for record in result:
+                    yield record.data()
+                    
+        except Neo4jError as e:
+            logger.error(f"Streaming query error: {str(e)}")
+            raise DatabaseQueryError(
+                f"Query failed: {str(e)}",
+                details={"query": query, "parameters": parameters}
+            ) from e
+            
+        except DriverError as e:
+            logger.error(f"Driver error while streaming query: {str(e)}")
+            raise DatabaseQueryError(
+                f"Query failed: {str(e)}",
+                details={"query": query, "parameters": parameters}
+            ) from e
+    
     async def execute_write_with_retry(
         self,
         query: str,
@@ -374,8 +789,8 @@ class Neo4jConnectionManager:
     ) -> List[Dict[str, Any]]:
         """Execute a write query with retry logic in a write transaction.
         
-        Similar to execute_with_retry but uses a write transaction for
-        better consistency guarantees.
+        Similar to execute_with_retry but uses a driver-managed write
+        transaction, which retries transient errors itself.
         
         Args:
             query: Cypher query string
@@ -389,86 +804,108 @@ class Neo4jConnectionManager:
             DatabaseQueryError: If query fails after all retries
         """
         if parameters is None:
-            parameters = {}
+            parameters = _EMPTY_PARAMS
+        
+        normalized = _normalize_query(query)
         
         async def _execute_write(tx):
-            result = await tx.run(query, parameters)
+            result = await tx.run(normalized, parameters)
             return await result.data()
         
-        last_error = None
-        retry_delay = self.initial_retry_delay
-        
-        for attempt in range(1, self.max_retries + 1):
-            try:
-                async with self.session(**session_kwargs) as session:
-                    records = await session.execute_write(_execute_write)
-                    logger.debug(
-                        f"Write query executed successfully: {query[:100]}... "
-                        f"(returned {len(records)} records)"
-                    )
-                    return records
-                    
-            except (ServiceUnavailable, SessionExpired, TransientError) as e:
-                last_error = e
-                logger.warning(
-                    f"Write query attempt {attempt} failed: {str(e)}. "
-                    f"Retrying in {retry_delay:.1f}s..."
+        try:
+            records = await self._managed_write(_execute_write, **session_kwargs)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Write query executed successfully: {query[:100]}... "
+                    f"(returned {len(records)} records)"
                 )
-                
-                if attempt < self.max_retries:
-                    await asyncio.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
-                    
-                    # Try to reconnect if connection was lost
-                    if isinstance(e, (ServiceUnavailable, SessionExpired)):
-                        self._is_connected = False
-                        try:
-                            await self.connect()
-                        except DatabaseConnectionError:
-                            logger.warning("Reconnection failed, will retry query")
-                            
-            except Neo4jError as e:
-                logger.error(f"Non-retryable write query error: {str(e)}")
-                raise DatabaseQueryError(
-                    f"Write query failed: {str(e)}",
-                    details={"query": query, "parameters": parameters}
-                ) from e
-                
-            except Exception as e:
-                logger.error(f"Unexpected error executing write query: {str(e)}")
-                raise DatabaseQueryError(
-                    f"Unexpected write query error: {str(e)}",
-                    details={"query": query, "parameters": parameters}
-                ) from e
+            return records
+            
+        except _RETRYABLE_ERRORS as e:
+            error_msg = f"Write query failed after retries. Last error: {str(e)}"
+            logger.error(error_msg)
+            raise DatabaseQueryError(
+                error_msg,
+                details={"query": query, "parameters": parameters}
+            ) from e
+            
+        except Neo4jError as e:
+            logger.error(f"Non-retryable write query error: {str(e)}")
+            raise DatabaseQueryError(
+                f"Write query failed: {str(e)}",
+                details={"query": query, "parameters": parameters}
+            ) from e
+            
+        except Exception as e:
+            logger.error(f"Unexpected error executing write query: {str(e)}")
+            raise DatabaseQueryError(
+                f"Unexpected write query error: {str(e)}",
+                details={"query": query, "parameters": parameters}
+            ) from e
+    
+    async def _managed_write(self, work, **session_kwargs):
+        """Run a unit of work in a driver-managed write transaction.
         
-        # All retries exhausted
-        error_msg = (
-            f"Write query failed after {self.max_retries} attempts. "
-            f"Last error: {str(last_error)}"
-        )
-        logger.error(error_msg)
-        raise DatabaseQueryError(
-            error_msg,
-            details={"query": query, "parameters": parameters}
-        ) from last_error
+        session.execute_write already retries transient failures with backoff
+        and re-runs ``work`` from scratch, so no retry loop is layered on top.
+        If the connection itself is lost, the manager reconnects and the work
+        is attempted once more.
+        
+        Args:
+            work: Async callable taking the transaction and returning its result
+            **session_kwargs: Additional arguments for session creation
+            
+        Returns:
+            Whatever ``work`` returns
+        """
+        try:
+            async with self.session(**session_kwargs) as session:
+                return await session.execute_write(work)
+        except _CONNECTION_LOST_ERRORS as e:
+            logger.warning(f"Connection lost during write: {str(e)}. Reconnecting and retrying once...")
+            self._mark_disconnected()
+            async with self.session(**session_kwargs) as session:
+                return await session.execute_write(work)
     
     async def execute_atomic_write(
         self,
         operations: List[tuple[str, Dict[str, Any]]],
+        collect_results: bool = False,
+        sequential: bool = True,
         **session_kwargs,
-    ) -> List[List[Dict[str, Any]]]:
+    ) -> List[Any]:
         """Execute multiple write operations atomically with automatic rollback.
         
-        All operations are executed within a single transaction. If any operation
-        fails, all changes are rolled back automatically. This ensures atomicity
-        across multiple Neo4j operations.
+        All operations are executed within a single driver-managed transaction.
+        If any operation fails, all changes are rolled back automatically; on
+        transient errors the driver retries the whole operation list. This
+        ensures atomicity across multiple Neo4j operations.
+        
+        Consecutive operations with the same query string and the same
+        parameter names are sent as a single UNWIND batch. For this, parameters
+        must be plain maps whose values are referenced only as ``$name``.
+        Passing ``sequential=False`` declares the operations independent of
+        each other, so all operations sharing a query are batched together
+        wherever they appear, and each distinct query costs one round trip.
+        
+        By default result rows are not fetched: each statement's result is
+        consumed for its summary only. Writes without a RETURN clause let the
+        server skip sending record data entirely.
         
         Args:
             operations: List of (query, parameters) tuples to execute
+            collect_results: Fetch and return the records of every operation
+                (default: False)
+            sequential: Run statements in the original operation order; pass
+                False only if no operation depends on another's writes
+                (default: True)
             **session_kwargs: Additional arguments for session creation
             
         Returns:
-            List of result lists, one for each operation
+            With collect_results, a list of result lists, one for each
+            operation. Otherwise a list of update counter dicts (nodes_created,
+            relationships_created, ...), one for each statement sent; a batch
+            of identical queries is a single statement.
             
         Raises:
             DatabaseQueryError: If any operation fails (all changes rolled back)
@@ -479,25 +916,59 @@ class Neo4jConnectionManager:
                 ("CREATE (m:Node {id: $id})", {"id": "456"}),
                 ("CREATE (n)-[:RELATES]->(m)", {}),
             ]
-            results = await manager.execute_atomic_write(operations)
+            counters = await manager.execute_atomic_write(operations)
             
         Validates: Requirements 12.5
         """
         if not operations:
             return []
         
-        try:
-            results = []
-            async with self.transaction(**session_kwargs) as tx:
-                for query, parameters in operations:
-                    result = await tx.run(query, parameters)
-                    records = await result.data()
-                    results.append(records)
-                    logger.debug(
-                        f"Atomic operation executed: {query[:100]}... "
-                        f"(returned {len(records)} records)"
+        async def _summarize(result) -> Dict[str, int]:
+            counters = (await result.consume()).counters
+            return {name: getattr(counters, name) for name in _SUMMARY_COUNTERS}
+        
+        statements = _group_operations(operations, sequential)
+        
+        async def _execute_all(tx):
+            # Rebuilt from scratch on each attempt, as the driver may retry
+            debug = logger.isEnabledFor(logging.DEBUG)
+            results: List[Any] = [None] * len(operations) if collect_results else []
+            for query, indices in statements:
+                if len(indices) > 1:
+                    # Operations sharing a query share one round trip
+                    result = await tx.run(
+                        _to_batched_query(query),
+                        {"_batch_rows": [operations[index][1] for index in indices]},
                     )
-            
+                    if collect_results:
+                        batched = [[] for _ in indices]
+                        for record in await result.data():
+                            position = record.pop("_batch_index")
+                            record.pop("_batch_row", None)
+                            if record:
+                                batched[position].append(record)
+                        for index, records in zip(indices, batched):
+                            results[index] = records
+                    else:
+                        results.append(await _summarize(result))
+                    if debug:
+                        logger.debug(
+                            f"Atomic operation batched x{len(indices)}: {query[:100]}..."
+                        )
+                    continue
+                
+                index = indices[0]
+                result = await tx.run(query, operations[index][1])
+                if collect_results:
+                    results[index] = await result.data()
+                else:
+                    results.append(await _summarize(result))
+                if debug:
+                    logger.debug(f"Atomic operation executed: {query[:100]}...")
+            return results
+        
+        try:
+            results = await self._managed_write(_execute_all, **session_kwargs)
             logger.info(f"Successfully executed {len(operations)} operations atomically")
             return results
             
@@ -513,7 +984,8 @@ class Neo4jConnectionManager:
     @property
     def is_connected(self) -> bool:
         """Check if the manager is currently connected to Neo4j."""
-        return self._is_connected
+        event = self._connected_event
+        return event is not None and event.is_set()
     
     @property
     def driver(self) -> Optional[AsyncDriver]:
@@ -521,28 +993,87 @@ class Neo4jConnectionManager:
         return self._driver
 
 
-# Global connection manager instance
+# Global connection manager instance, shared by all requests by default
 _connection_manager: Optional[Neo4jConnectionManager] = None
 
+# Per-tenant managers, kept for the life of the process so their pools stay warm
+_tenant_managers: Dict[Tuple[str, str, str, Optional[str]], Neo4jConnectionManager] = {}
+
+# Manager bound to the current async context by set_neo4j_manager_for_tenant()
+_current_manager: ContextVar[Optional[Neo4jConnectionManager]] = ContextVar(
+    "neo4j_manager", default=None
+)
+
 
 def get_neo4j_manager() -> Neo4jConnectionManager:
-    """Get or create the global Neo4j connection manager instance.
+    """Get the Neo4j connection manager for the current context.
+    
+    Returns the tenant manager bound to the current async context, if any,
+    and otherwise the global connection manager (created on first use).
     
     Returns:
-        Neo4jConnectionManager: Global connection manager instance
+        Neo4jConnectionManager: Connection manager for the current context
     """
     global _connection_manager
     
+    manager = _current_manager.get()
+    if manager is not None:
+        return manager
+    
     if _connection_manager is None:
         _connection_manager = Neo4jConnectionManager()
     
     return _connection_manager
 
 
+async def set_neo4j_manager_for_tenant(
+    uri: str,
+    user: str,
+    password: str,
+    database: Optional[str] = None,
+) -> Neo4jConnectionManager:
+    """Bind a tenant's connection manager to the current async context.
+    
+    Managers are reused per (uri, user, password, database), so switching
+    between tenants never closes a pool or repeats the connection handshake.
+    The binding only affects the current context (e.g. one request) and the
+    tasks it spawns; other contexts keep using the global manager.
+    
+    Args:
+        uri: Tenant's Neo4j connection URI
+        user: Tenant's Neo4j username
+        password: Tenant's Neo4j password
+        database: Tenant's Neo4j database (defaults to settings.neo4j_database)
+        
+    Returns:
+        Neo4jConnectionManager: Connected manager now bound to this context
+        
+    Raises:
+        DatabaseConnectionError: If the tenant's database cannot be reached
+    """
+    key = (uri, user, password, database)
+    manager = _tenant_managers.get(key)
+    if manager is None:
+        manager = Neo4jConnectionManager(
+            uri=uri, user=user, password=password, database=database
+        )
+        _tenant_managers[key] = manager
+    
+    await manager.connect()
+    _current_manager.set(manager)
+    return manager
+
+
 async def close_neo4j_manager() -> None:
-    """Close the global Neo4j connection manager."""
+    """Close the global and all tenant Neo4j connection managers."""
     global _connection_manager
     
     if _connection_manager is not None:
         await _connection_manager.close()
         _connection_manager = None
+    
+    tenant_managers = list(_tenant_managers.values())
+    _tenant_managers.clear()
+    _current_manager.set(None)
+    for manager in tenant_managers:
+        await manager.close()
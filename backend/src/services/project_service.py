@@ -9,7 +9,7 @@ from typing import Dict, List, Tuple, Optional
 
 from ..models.base import CodeEntity, CodeRelationship
 from .graph_service import GraphService
-from .vector_service import VectorService
+from .vector_service import VectorService, get_vector_service
 from .cache_service import CacheService
 
 logger = logging.getLogger(__name__)
@@ -32,7 +32,7 @@ class ProjectService:
             cache_service: Cache service for query results
         """
         self.graph_service = graph_service or GraphService()
-        self.vector_service = vector_service or VectorService()
+        self.vector_service = vector_service or get_vector_service()
         self.cache_service = cache_service or CacheService()
     
     async def delete_project(
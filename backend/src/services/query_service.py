@@ -4,21 +4,51 @@ This module provides a unified interface for querying the GraphRAG system,
 coordinating operations across Graph Service and Vector Service.
 """
 
+import asyncio
+import heapq
 import logging
-from typing import List, Dict, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+import time
+from collections import Counter, defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+from dataclasses import dataclass
+from functools import lru_cache
 
-from ..models.base import CodeEntity, EntityType, RelationshipType
+from cachetools import TTLCache
+from pydantic import BaseModel, TypeAdapter
+
+from ..models.base import CodeEntity, DependencyNode, EntityType, RelationshipType
 from ..config import settings
 from .graph_service import GraphService
-from .vector_service import VectorService
-from .cache_service import CacheService
+from .vector_service import VectorService, get_vector_service
+from .cache_service import CacheService, add_invalidation_listener
+from .gemini_client import GeminiClient, get_gemini_client
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
 
-@dataclass
-class QueryResult:
+
+# Node labels for the entity types that can be used as visualization filters
+_VIZ_ENTITY_LABELS = {
+    EntityType.FILE: "File",
+    EntityType.FUNCTION: "Function",
+    EntityType.CLASS: "Class",
+    EntityType.VARIABLE: "Variable",
+    EntityType.IMPORT: "Import",
+}
+
+# Visualization node type for each node label
+_LABEL_TO_VIZ_TYPE = {
+    "File": "FILE",
+    "Function": "FUNCTION",
+    "Class": "CLASS",
+    "Variable": "VARIABLE",
+    "Import": "IMPORT",
+    "ExternalModule": "EXTERNAL_MODULE",
+}
+
+
+class QueryResult(BaseModel):
     """Result of a query operation."""
     entities: List[CodeEntity]
     count: int
@@ -26,8 +56,7 @@ class QueryResult:
     metadata: Dict[str, Any]
 
 
-@dataclass
-class ImpactResult:
+class ImpactResult(BaseModel):
     """Result of impact analysis."""
     target_entity: CodeEntity
     affected_entities: List[CodeEntity]
@@ -38,8 +67,7 @@ class ImpactResult:
     cycle_paths: List[List[str]]
 
 
-@dataclass
-class SearchResult:
+class SearchResult(BaseModel):
     """Result of semantic search."""
     entity: CodeEntity
     similarity: float
@@ -47,8 +75,11 @@ class SearchResult:
     snippet: str
 
 
-@dataclass
-class GraphVisualizationData:
+# Validates cached search results straight from their JSON
+_SEARCH_RESULTS = TypeAdapter(List[SearchResult])
+
+
+class GraphVisualizationData(BaseModel):
     """Data for graph visualization."""
     nodes: List[Dict[str, Any]]
     edges: List[Dict[str, Any]]
@@ -56,6 +87,123 @@ class GraphVisualizationData:
     coverage: Dict[str, int]
 
 
+# Graph queries return one row holding both the node and the edge lists, so
+# a visualization costs a single round trip. Nodes are limited in Neo4j to
+# $node_limit, in _apply_limits order, and edges are only fetched between
+# kept nodes (plus external modules), up to $edge_limit, so transfer and
+# memory scale with max_nodes and max_edges.
+
+# File graph: files and the imports between them
+_FILE_GRAPH_QUERY = """
+CALL {
+  MATCH (n:File)
+  WHERE n.project_id = $project_id
+    AND ($include_isolated OR EXISTS {
+      MATCH (n)-[:IMPORTS]-(m)
+      WHERE (m:File AND m.project_id = $project_id) OR ($include_external AND m:ExternalModule)
+    })
+  WITH n ORDER BY coalesce(n.name, n.id), n.id
+  LIMIT $node_limit
+  RETURN collect(n) AS kept, collect({node: properties(n), labels: labels(n)}) AS nodes
+}
+CALL {
+  WITH kept
+  UNWIND kept AS s
+  MATCH (s)-[r:IMPORTS]->(t)
+  WHERE t IN kept OR ($include_external AND t:ExternalModule)
+  WITH s, r, t ORDER BY s.id, t.id
+  LIMIT $edge_limit
+  RETURN collect({
+    source: properties(s),
+    source_labels: labels(s),
+    rel_type: type(r),
+    target: properties(t),
+    target_labels: labels(t)
+  }) AS edges
+}
+RETURN nodes, edges
+"""
+
+# Symbol graph; node filters that are not set are passed as null. The CASE
+# mirrors _LABEL_TO_VIZ_TYPE so nodes are ordered by visualization type.
+_SYMBOL_GRAPH_QUERY = """
+CALL {
+  MATCH (n)
+  WHERE n.project_id = $project_id
+    AND ($entity_labels IS NULL OR ANY(label IN labels(n) WHERE label IN $entity_labels))
+    AND ($languages IS NULL OR n.language IN $languages)
+    AND ($file_patterns IS NULL OR ANY(pattern IN $file_patterns WHERE n.file_path CONTAINS pattern))
+    AND ($include_isolated OR EXISTS {
+      MATCH (n)-[]-(m)
+      WHERE m.project_id = $project_id OR ($include_external AND m:ExternalModule)
+    })
+  WITH n, CASE
+      WHEN n:File THEN 'FILE'
+      WHEN n:Function THEN 'FUNCTION'
+      WHEN n:Class THEN 'CLASS'
+      WHEN n:Variable THEN 'VARIABLE'
+      WHEN n:Import THEN 'IMPORT'
+      WHEN n:ExternalModule THEN 'EXTERNAL_MODULE'
+      ELSE 'FUNCTION'
+    END AS viz_type
+  ORDER BY viz_type, coalesce(n.name, n.id), n.id
+  LIMIT $node_limit
+  RETURN collect(n) AS kept, collect({node: properties(n), labels: labels(n)}) AS nodes
+}
+CALL {
+  WITH kept
+  UNWIND kept AS s
+  MATCH (s)-[r]->(t)
+  WHERE t IN kept OR ($include_external AND t:ExternalModule)
+  WITH s, r, t ORDER BY s.id, t.id, type(r)
+  LIMIT $edge_limit
+  RETURN collect({
+    source: properties(s),
+    source_labels: labels(s),
+    rel_type: type(r),
+    target: properties(t),
+    target_labels: labels(t)
+  }) AS edges
+}
+RETURN nodes, edges
+"""
+
+
+@lru_cache(maxsize=64)
+def _entity_labels(entity_types: Tuple[EntityType, ...]) -> Tuple[str, ...]:
+    """Map a visualization entity-type filter to node labels.
+    
+    Args:
+        entity_types: Entity types selected in the filter
+        
+    Returns:
+        Labels of the types that have one, in filter order
+    """
+    return tuple(
+        _VIZ_ENTITY_LABELS[entity_type]
+        for entity_type in entity_types
+        if entity_type in _VIZ_ENTITY_LABELS
+    )
+
+
+@lru_cache(maxsize=256)
+def _viz_node_type(labels: Tuple[str, ...]) -> str:
+    """Get the visualization type of a node from its labels.
+    
+    Nodes share a handful of label sets, so the lookup is memoized.
+    
+    Args:
+        labels: Node labels
+        
+    Returns:
+        Type of the first recognized label, or FUNCTION if there is none
+    """
+    return next(
+        (_LABEL_TO_VIZ_TYPE[label] for label in labels if label in _LABEL_TO_VIZ_TYPE),
+        "FUNCTION"
+    )
+
+
 @dataclass
 class GraphFilters:
     """Filters for graph visualization."""
@@ -76,7 +224,8 @@ class QueryService:
         self,
         graph_service: Optional[GraphService] = None,
         vector_service: Optional[VectorService] = None,
-        cache_service: Optional[CacheService] = None
+        cache_service: Optional[CacheService] = None,
+        gemini_client: Optional[GeminiClient] = None
     ):
         """Initialize the query service.
         
@@ -84,6 +233,8 @@ class QueryService:
             graph_service: Graph service for structural queries
             vector_service: Vector service for semantic search
             cache_service: Cache service for result caching
+            gemini_client: Client for query embeddings (default: the shared
+                client, created on first search)
         """
         if graph_service is None:
             from .neo4j_manager import get_neo4j_manager
@@ -91,14 +242,132 @@ class QueryService:
             graph_service = GraphService(neo4j_manager)
         
         self.graph_service = graph_service
-        self.vector_service = vector_service or VectorService()
+        self.vector_service = vector_service or get_vector_service()
         self.cache_service = cache_service or CacheService()
+        self._gemini_client = gemini_client
+        # Loads in progress, keyed by cache key, shared by concurrent callers
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Recent query results as (project_ids, graph versions, result), keyed
+        # by cache key; a hit at the projects' current graph versions skips
+        # the Redis GET and rebuilding the result from JSON
+        self._result_cache: TTLCache = TTLCache(maxsize=1024, ttl=300)
+        add_invalidation_listener(self)
+    
+    def on_project_invalidated(self, project_id: str) -> None:
+        """Drop cached results of a project whose data changed.
+        
+        Changes made by other processes are caught by the graph version
+        check in _cached instead.
+        
+        Args:
+            project_id: Project identifier
+        """
+        stale_results = [
+            key for key, (project_ids, _, _) in self._result_cache.items()
+            if project_id in project_ids
+        ]
+        for key in stale_results:
+            self._result_cache.pop(key, None)
+    
+    def _remember_result(
+        self,
+        cache_key: str,
+        project_ids: Tuple[str, ...],
+        versions: Optional[Tuple[int, ...]],
+        result: Any
+    ) -> None:
+        """Keep a result in-process, unless its graph versions are unknown."""
+        if versions is not None:
+            self._result_cache[cache_key] = (project_ids, versions, result)
+    
+    async def _cached(
+        self,
+        cache_key: Optional[str],
+        loader: Callable[[], Awaitable[T]],
+        from_cache: Callable[[Any], T],
+        query_type: str,
+        project_ids: Tuple[str, ...],
+        prefetched: Optional[Dict[str, Any]] = None,
+        cache_result: Optional[Callable[[], bool]] = None
+    ) -> T:
+        """Return a cached result, or load it with only one loader per key in flight.
+        
+        Concurrent callers that miss the cache for the same key wait on the
+        first caller's load instead of each querying the databases. Results
+        kept in-process are only reused while the graph versions of their
+        projects in Redis are unchanged, so updates made by the Celery worker
+        or other API workers are seen.
+        
+        Args:
+            cache_key: Cache key, or None to bypass the cache
+            loader: Coroutine function that computes the result
+            from_cache: Builds the result from its cached JSON bytes
+            query_type: Query name used in log messages
+            project_ids: Projects the result depends on, for invalidation
+            prefetched: Cache values already fetched by the caller; when given,
+                a key missing from it is treated as a cache miss
+            cache_result: Called after loading; a loaded result is only
+                cached if it returns True (default: always cached)
+            
+        Returns:
+            The cached or freshly loaded result
+        """
+        if cache_key is None:
+            return await loader()
+        
+        versions = await self.cache_service.get_graph_versions(project_ids)
+        hot = self._result_cache.get(cache_key)
+        if hot is not None and versions is not None and hot[1] == versions:
+            logger.info(f"Returning in-process cached result for {query_type}")
+            return hot[2]
+        
+        if prefetched is not None:
+            cached_result = prefetched.get(cache_key)
+        else:
+            cached_result = await self.cache_service.get_raw(cache_key)
+        if cached_result:
+            logger.info(f"Returning cached result for {query_type}")
+            result = from_cache(cached_result)
+            self._remember_result(cache_key, project_ids, versions, result)
+            return result
+        
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            logger.debug(f"Waiting for in-flight {query_type} load: {cache_key}")
+            # Shielded so one waiter being cancelled doesn't cancel the shared load
+            return await asyncio.shield(inflight)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            result = await loader()
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception retrieved in case no one else was waiting
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            self._inflight.pop(cache_key, None)
+        
+        future.set_result(result)
+        if cache_result is not None and not cache_result():
+            return result
+        # Tagged with the versions read before loading, so a concurrent graph
+        # change makes this entry stale rather than hiding the change
+        self._remember_result(cache_key, project_ids, versions, result)
+        # The cache serializes result models directly
+        await self.cache_service.set(cache_key, result)
+        return result
     
     async def find_callers(
         self,
         function_id: str,
         project_id: str,
-        use_cache: bool = True
+        use_cache: bool = True,
+        prefetched: Optional[Dict[str, Any]] = None
     ) -> QueryResult:
         """Find all functions that call the specified function.
         
@@ -106,57 +375,59 @@ class QueryService:
             function_id: Function identifier (file_path:function_name)
             project_id: Project identifier
             use_cache: Whether to use cache (default: True)
+            prefetched: Cached values from CacheService.warm_function_keys
             
         Returns:
             QueryResult with calling functions
         """
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         logger.info(f"Finding callers for function: {function_id} in project: {project_id}")
         
-        # Check cache first
-        if use_cache:
-            cache_key = self.cache_service.build_callers_key(function_id, project_id)
-            cached_result = self.cache_service.get(cache_key)
-            if cached_result:
-                logger.info(f"Returning cached result for find_callers")
-                return QueryResult(**cached_result)
+        async def _load() -> QueryResult:
+            try:
+                # Use graph service to find callers
+                callers = await self.graph_service.find_callers(function_id, project_id)
+                
+                query_time_ms = (time.perf_counter_ns() - start_time) / 1_000_000
+                
+                result = QueryResult(
+                    entities=callers,
+                    count=len(callers),
+                    query_time_ms=query_time_ms,
+                    metadata={
+                        'function_id': function_id,
+                        'project_id': project_id,
+                        'query_type': 'find_callers'
+                    }
+                )
+                
+                logger.info(f"Found {len(callers)} callers in {query_time_ms:.2f}ms")
+                return result
+                
+            except Exception as e:
+                logger.error(f"Failed to find callers: {e}")
+                raise
         
-        try:
-            # Use graph service to find callers
-            callers = await self.graph_service.find_callers(function_id, project_id)
-            
-            query_time_ms = (time.time() - start_time) * 1000
-            
-            result = QueryResult(
-                entities=callers,
-                count=len(callers),
-                query_time_ms=query_time_ms,
-                metadata={
-                    'function_id': function_id,
-                    'project_id': project_id,
-                    'query_type': 'find_callers'
-                }
-            )
-            
-            # Cache the result
-            if use_cache:
-                cache_key = self.cache_service.build_callers_key(function_id, project_id)
-                self.cache_service.set(cache_key, asdict(result))
-            
-            logger.info(f"Found {len(callers)} callers in {query_time_ms:.2f}ms")
-            return result
-            
-        except Exception as e:
-            logger.error(f"Failed to find callers: {e}")
-            raise
+        cache_key = (
+            self.cache_service.build_callers_key(function_id, project_id)
+            if use_cache else None
+        )
+        return await self._cached(
+            cache_key,
+            _load,
+            QueryResult.model_validate_json,
+            'find_callers',
+            (project_id,),
+            prefetched
+        )
     
     async def find_dependencies(
         self,
         function_id: str,
         project_id: str,
-        use_cache: bool = True
+        use_cache: bool = True,
+        prefetched: Optional[Dict[str, Any]] = None
     ) -> QueryResult:
         """Find all dependencies of the specified function.
         
@@ -164,58 +435,60 @@ class QueryService:
             function_id: Function identifier (file_path:function_name)
             project_id: Project identifier
             use_cache: Whether to use cache (default: True)
+            prefetched: Cached values from CacheService.warm_function_keys
             
         Returns:
             QueryResult with dependencies
         """
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         logger.info(f"Finding dependencies for function: {function_id} in project: {project_id}")
         
-        # Check cache first
-        if use_cache:
-            cache_key = self.cache_service.build_dependencies_key(function_id, project_id)
-            cached_result = self.cache_service.get(cache_key)
-            if cached_result:
-                logger.info(f"Returning cached result for find_dependencies")
-                return QueryResult(**cached_result)
+        async def _load() -> QueryResult:
+            try:
+                # Use graph service to find dependencies
+                dependencies = await self.graph_service.find_dependencies(function_id, project_id)
+                
+                query_time_ms = (time.perf_counter_ns() - start_time) / 1_000_000
+                
+                result = QueryResult(
+                    entities=dependencies,
+                    count=len(dependencies),
+                    query_time_ms=query_time_ms,
+                    metadata={
+                        'function_id': function_id,
+                        'project_id': project_id,
+                        'query_type': 'find_dependencies'
+                    }
+                )
+                
+                logger.info(f"Found {len(dependencies)} dependencies in {query_time_ms:.2f}ms")
+                return result
+                
+            except Exception as e:
+                logger.error(f"Failed to find dependencies: {e}")
+                raise
         
-        try:
-            # Use graph service to find dependencies
-            dependencies = await self.graph_service.find_dependencies(function_id, project_id)
-            
-            query_time_ms = (time.time() - start_time) * 1000
-            
-            result = QueryResult(
-                entities=dependencies,
-                count=len(dependencies),
-                query_time_ms=query_time_ms,
-                metadata={
-                    'function_id': function_id,
-                    'project_id': project_id,
-                    'query_type': 'find_dependencies'
-                }
-            )
-            
-            # Cache the result
-            if use_cache:
-                cache_key = self.cache_service.build_dependencies_key(function_id, project_id)
-                self.cache_service.set(cache_key, asdict(result))
-            
-            logger.info(f"Found {len(dependencies)} dependencies in {query_time_ms:.2f}ms")
-            return result
-            
-        except Exception as e:
-            logger.error(f"Failed to find dependencies: {e}")
-            raise
+        cache_key = (
+            self.cache_service.build_dependencies_key(function_id, project_id)
+            if use_cache else None
+        )
+        return await self._cached(
+            cache_key,
+            _load,
+            QueryResult.model_validate_json,
+            'find_dependencies',
+            (project_id,),
+            prefetched
+        )
     
     async def impact_analysis(
         self,
         function_id: str,
         project_id: str,
         max_depth: int = 5,
-        use_cache: bool = True
+        use_cache: bool = True,
+        prefetched: Optional[Dict[str, Any]] = None
     ) -> ImpactResult:
         """Perform impact analysis to find all affected entities.
         
@@ -224,55 +497,57 @@ class QueryService:
             project_id: Project identifier
             max_depth: Maximum traversal depth (default: 5)
             use_cache: Whether to use cache (default: True)
+            prefetched: Cached values from CacheService.warm_function_keys
             
         Returns:
             ImpactResult with affected entities and dependency tree
         """
         logger.info(f"Performing impact analysis for function: {function_id} in project: {project_id}")
         
-        # Check cache first
-        if use_cache:
-            cache_key = self.cache_service.build_impact_key(function_id, project_id)
-            cached_result = self.cache_service.get(cache_key)
-            if cached_result:
-                logger.info(f"Returning cached result for impact_analysis")
-                return ImpactResult(**cached_result)
+        async def _load() -> ImpactResult:
+            try:
+                # Use graph service for impact analysis
+                impact_tree = await self.graph_service.impact_analysis(
+                    function_id=function_id,
+                    project_id=project_id,
+                    max_depth=max_depth
+                )
+                
+                # Extract entities from dependency nodes
+                affected_entities = [dep.entity for dep in impact_tree.dependencies]
+                
+                result = ImpactResult(
+                    target_entity=impact_tree.root,
+                    affected_entities=affected_entities,
+                    dependency_tree=_build_dependency_tree(impact_tree.dependencies),
+                    max_depth=impact_tree.max_depth,
+                    total_affected=len(affected_entities),
+                    has_cycles=len(impact_tree.circular_dependencies) > 0,
+                    cycle_paths=impact_tree.circular_dependencies
+                )
+                
+                logger.info(
+                    f"Impact analysis complete: {result.total_affected} affected entities, "
+                    f"cycles: {result.has_cycles}"
+                )
+                return result
+                
+            except Exception as e:
+                logger.error(f"Failed to perform impact analysis: {e}")
+                raise
         
-        try:
-            # Use graph service for impact analysis
-            impact_tree = await self.graph_service.impact_analysis(
-                function_id=function_id,
-                project_id=project_id,
-                max_depth=max_depth
-            )
-            
-            # Extract entities from dependency nodes
-            affected_entities = [dep.entity for dep in impact_tree.dependencies]
-            
-            result = ImpactResult(
-                target_entity=impact_tree.root,
-                affected_entities=affected_entities,
-                dependency_tree={},  # TODO: Build tree structure
-                max_depth=impact_tree.max_depth,
-                total_affected=len(affected_entities),
-                has_cycles=len(impact_tree.circular_dependencies) > 0,
-                cycle_paths=impact_tree.circular_dependencies
-            )
-            
-            # Cache the result
-            if use_cache:
-                cache_key = self.cache_service.build_impact_key(function_id, project_id)
-                self.cache_service.set(cache_key, asdict(result))
-            
-            logger.info(
-                f"Impact analysis complete: {result.total_affected} affected entities, "
-                f"cycles: {result.has_cycles}"
-            )
-            return result
-            
-        except Exception as e:
-            logger.error(f"Failed to perform impact analysis: {e}")
-            raise
+        cache_key = (
+            self.cache_service.build_impact_key(function_id, project_id)
+            if use_cache else None
+        )
+        return await self._cached(
+            cache_key,
+            _load,
+            ImpactResult.model_validate_json,
+            'impact_analysis',
+            (project_id,),
+            prefetched
+        )
     
     async def semantic_search(
         self,
@@ -293,57 +568,145 @@ class QueryService:
             List of search results with similarity scores
         """
         logger.info(f"Performing semantic search for query: '{query}' across {len(project_ids)} projects")
+        # Set when the result was served by the semantic cache; it was
+        # computed for another query, so it isn't cached under this one
+        semantic_hit = False
         
-        # Check cache first
-        if use_cache:
-            cache_key = self.cache_service.build_search_key(query, project_ids)
-            cached_result = self.cache_service.get(cache_key)
-            if cached_result:
-                logger.info(f"Returning cached result for semantic_search")
-                return [SearchResult(**r) for r in cached_result]
-        
-        try:
-            all_results = []
-            
-            # Search each project
-            for project_id in project_ids:
-                # Use vector service for semantic search
-                vector_results = self.vector_service.semantic_search(
-                    query=query,
-                    project_id=project_id,
-                    top_k=top_k
-                )
+        async def _load() -> List[SearchResult]:
+            nonlocal semantic_hit
+            try:
+                # Embed once for every project searched
+                gemini_client = self._gemini_client or get_gemini_client()
+                query_embedding = await gemini_client.generate_query_embedding(query)
                 
-                # Convert to SearchResult objects
-                for result in vector_results:
-                    entity = await self._get_entity_by_id(result['entity_id'], project_id)
-                    if entity:
-                        # Create snippet from entity body or signature
-                        snippet = self._create_snippet(entity)
-                        
-                        search_result = SearchResult(
-                            entity=entity,
-                            similarity=result['similarity'],
-                            file_path=entity.file_path,
-                            snippet=snippet
-                        )
-                        all_results.append(search_result)
-            
-            # Sort by similarity (descending) and limit to top_k
-            all_results.sort(key=lambda x: x.similarity, reverse=True)
-            all_results = all_results[:top_k]
-            
-            # Cache the result
-            if use_cache:
-                cache_key = self.cache_service.build_search_key(query, project_ids)
-                self.cache_service.set(cache_key, [asdict(r) for r in all_results])
+                # A paraphrase of a recent query retrieves the same results
+                versions = None
+                if use_cache:
+                    versions = await self.cache_service.get_graph_versions(project_ids)
+                if versions is not None:
+                    similar_results = self.cache_service.semantic_get(
+                        query_embedding, project_ids, top_k, versions
+                    )
+                    if similar_results is not None:
+                        logger.info("Returning semantically cached result for semantic_search")
+                        semantic_hit = True
+                        return similar_results
+                
+                # Projects are independent, so search them concurrently;
+                # a project listed twice is only searched once
+                unique_project_ids = list(dict.fromkeys(project_ids))
+                hits_per_project = await asyncio.gather(*[
+                    self._search_project(query_embedding, project_id, top_k)
+                    for project_id in unique_project_ids
+                ])
+                # Max-heap by similarity, so the best hits are popped without
+                # sorting them all; the index breaks ties in search order
+                hits = [
+                    (-hit['similarity'], index, project_id, hit)
+                    for project_id, project_hits in zip(unique_project_ids, hits_per_project)
+                    for index, hit in enumerate(project_hits)
+                ]
+                heapq.heapify(hits)
+                
+                # Only hits that can still make the top_k are resolved; more
+                # are taken only if some of them have no entity in the graph
+                all_results: List[SearchResult] = []
+                while len(all_results) < top_k and hits:
+                    batch = [
+                        heapq.heappop(hits)[2:]
+                        for _ in range(min(top_k - len(all_results), len(hits)))
+                    ]
+                    all_results.extend(await self._resolve_hits(batch))
+                
+                logger.info(f"Semantic search returned {len(all_results)} results")
+                if versions is not None:
+                    self.cache_service.semantic_put(
+                        query_embedding, project_ids, top_k, versions, all_results
+                    )
+                return all_results
+                
+            except Exception as e:
+                logger.error(f"Failed to perform semantic search: {e}")
+                raise
+        
+        if not use_cache:
+            return await _load()
+        
+        results = await self._cached(
+            self.cache_service.build_search_key(query, project_ids),
+            _load,
+            _SEARCH_RESULTS.validate_json,
+            'semantic_search',
+            tuple(project_ids),
+            cache_result=lambda: not semantic_hit
+        )
+        # Copied so callers can't alter the cached list
+        return list(results)
+    
+    async def _search_project(
+        self,
+        query_embedding: List[float],
+        project_id: str,
+        top_k: int
+    ) -> List[Dict[str, Any]]:
+        """Run vector search for a single project.
+        
+        Args:
+            query_embedding: Query vector embedding
+            project_id: Project identifier
+            top_k: Maximum number of vector hits to fetch
             
-            logger.info(f"Semantic search returned {len(all_results)} results")
-            return all_results
+        Returns:
+            Vector search hits for the project
+        """
+        # The vector store client is blocking, so keep it off the event loop
+        return await asyncio.to_thread(
+            self.vector_service.semantic_search,
+            query_embedding=query_embedding,
+            project_ids=[project_id],
+            top_k=top_k
+        )
+    
+    async def _resolve_hits(
+        self,
+        hits: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[SearchResult]:
+        """Resolve vector search hits to search results.
+        
+        Args:
+            hits: (project_id, vector hit) pairs
             
-        except Exception as e:
-            logger.error(f"Failed to perform semantic search: {e}")
-            raise
+        Returns:
+            Search results in hit order; hits whose entity is not in the
+            graph are dropped
+        """
+        ids_by_project: Dict[str, List[str]] = defaultdict(list)
+        for project_id, result in hits:
+            ids_by_project[project_id].append(result['id'])
+        
+        # One entity query per project, run concurrently
+        entities_per_project = await asyncio.gather(*[
+            self._get_entities_by_ids(entity_ids, project_id)
+            for project_id, entity_ids in ids_by_project.items()
+        ])
+        entities_by_project = dict(zip(ids_by_project, entities_per_project))
+        
+        # Convert to SearchResult objects
+        search_results = []
+        for project_id, result in hits:
+            entity = entities_by_project[project_id].get(result['id'])
+            if entity:
+                # Create snippet from entity body or signature
+                snippet = self._create_snippet(entity)
+                
+                search_results.append(SearchResult(
+                    entity=entity,
+                    similarity=result['similarity'],
+                    file_path=entity.file_path,
+                    snippet=snippet
+                ))
+        
+        return search_results
     
     async def get_graph_visualization(
         self,
@@ -366,36 +729,45 @@ class QueryService:
 
         try:
             if filters.view_mode == "symbol":
-                nodes, edges = await self._get_symbol_graph(project_id, filters)
+                graph = self._get_symbol_graph(project_id, filters)
             else:
-                nodes, edges = await self._get_file_graph(project_id, filters)
+                graph = self._get_file_graph(project_id, filters)
+            # Project-wide counts don't depend on the graph, so query them concurrently
+            (nodes, edges), coverage = await asyncio.gather(
+                graph,
+                self._get_graph_coverage(project_id, filters.include_external),
+            )
 
             raw_node_count = len(nodes)
             raw_edge_count = len(edges)
             nodes, edges, truncated = self._apply_limits(nodes, edges, filters)
 
-            edge_type_counts: Dict[str, int] = {}
-            for edge in edges:
-                edge_type = edge.get("type", "UNKNOWN")
-                edge_type_counts[edge_type] = edge_type_counts.get(edge_type, 0) + 1
+            # One pass over each list instead of one per node type
+            node_type_counts = Counter(n["type"] for n in nodes)
+            edge_type_counts = Counter(edge.get("type", "UNKNOWN") for edge in edges)
 
             stats = {
                 "total_nodes": len(nodes),
                 "total_edges": len(edges),
-                "files": sum(1 for n in nodes if n["type"] == "FILE"),
-                "functions": sum(1 for n in nodes if n["type"] == "FUNCTION"),
-                "classes": sum(1 for n in nodes if n["type"] == "CLASS"),
-                "imports": sum(1 for n in nodes if n["type"] == "IMPORT"),
-                "external_nodes": sum(1 for n in nodes if n["type"] == "EXTERNAL_MODULE"),
-                "edge_types": edge_type_counts,
+                "files": node_type_counts["FILE"],
+                "functions": node_type_counts["FUNCTION"],
+                "classes": node_type_counts["CLASS"],
+                "imports": node_type_counts["IMPORT"],
+                "external_nodes": node_type_counts["EXTERNAL_MODULE"],
+                "edge_types": dict(edge_type_counts),
                 "truncated": truncated,
                 "raw_nodes": raw_node_count,
                 "raw_edges": raw_edge_count,
             }
 
-            coverage = await self._get_graph_coverage(project_id, len(nodes), len(edges), filters.include_external)
+            coverage["entities_in_graph"] = len(nodes)
+            coverage["relationships_in_graph"] = len(edges)
 
-            viz_data = GraphVisualizationData(nodes=nodes, edges=edges, stats=stats, coverage=coverage)
+            # The payload is built here from known-good dicts, so skip validation,
+            # which would copy every node and edge dict
+            viz_data = GraphVisualizationData.model_construct(
+                nodes=nodes, edges=edges, stats=stats, coverage=coverage
+            )
             logger.info(
                 "Graph visualization generated",
                 extra={
@@ -414,11 +786,31 @@ class QueryService:
     async def _get_graph_coverage(
         self,
         project_id: str,
-        entities_in_graph: int,
-        relationships_in_graph: int,
         include_external: bool,
     ) -> Dict[str, int]:
-        """Return project-level counts alongside current graph counts."""
+        """Return project-level entity and relationship counts.
+
+        The counts only change when the project's graph does, so they are
+        cached per graph version. The caller fills in ``entities_in_graph``
+        and ``relationships_in_graph`` once the graph is built.
+        """
+        cache_key = self.cache_service.build_coverage_key(project_id, include_external)
+        generation, counts = await self.cache_service.get_with_generation(
+            cache_key, self.cache_service.build_graph_version_key(project_id)
+        )
+        if counts is None:
+            counts = await self._count_project_graph(project_id, include_external)
+            await self.cache_service.set_with_generation(cache_key, generation, counts)
+
+        return {
+            "entities_in_project": counts["entities"],
+            "entities_in_graph": 0,
+            "relationships_in_project": counts["relationships"],
+            "relationships_in_graph": 0,
+        }
+
+    async def _count_project_graph(self, project_id: str, include_external: bool) -> Dict[str, int]:
+        """Count all entities and relationships of a project in Neo4j."""
         entities_query = """
         MATCH (n)
         WHERE n.project_id = $project_id
@@ -431,18 +823,18 @@ class QueryService:
         RETURN count(r) AS count
         """
 
-        entity_result = await self.graph_service.neo4j.execute_with_retry(
-            entities_query, {"project_id": project_id}
-        )
-        relationship_result = await self.graph_service.neo4j.execute_with_retry(
-            relationships_query, {"project_id": project_id, "include_external": include_external}
+        entity_result, relationship_result = await asyncio.gather(
+            self.graph_service.neo4j.execute_with_retry(
+                entities_query, {"project_id": project_id}
+            ),
+            self.graph_service.neo4j.execute_with_retry(
+                relationships_query, {"project_id": project_id, "include_external": include_external}
+            ),
         )
 
         return {
-            "entities_in_project": int(entity_result[0]["count"]) if entity_result else 0,
-            "entities_in_graph": entities_in_graph,
-            "relationships_in_project": int(relationship_result[0]["count"]) if relationship_result else 0,
-            "relationships_in_graph": relationships_in_graph,
+            "entities": int(entity_result[0]["count"]) if entity_result else 0,
+            "relationships": int(relationship_result[0]["count"]) if relationship_result else 0,
         }
 
     async def _get_file_graph(
@@ -451,141 +843,81 @@ class QueryService:
         filters: GraphFilters,
     ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """Build a file-centric dependency graph."""
-        nodes_query = """
-        MATCH (n:File)
-        WHERE n.project_id = $project_id
-        RETURN properties(n) AS node, labels(n) AS labels
-        ORDER BY n.file_path, n.name
-        """
-        edges_query = """
-        MATCH (s:File {project_id: $project_id})-[r:IMPORTS]->(t)
-        WHERE (t:File AND t.project_id = $project_id)
-           OR ($include_external AND t:ExternalModule)
-        RETURN properties(s) AS source,
-               labels(s) AS source_labels,
-               type(r) AS rel_type,
-               properties(t) AS target,
-               labels(t) AS target_labels
-        ORDER BY source.id, target.id
-        """
-
-        node_records = await self.graph_service.neo4j.execute_with_retry(
-            nodes_query, {"project_id": project_id}
+        records = await self.graph_service.neo4j.execute_with_retry(
+            _FILE_GRAPH_QUERY,
+            {
+                "project_id": project_id,
+                "include_external": filters.include_external,
+                "include_isolated": filters.include_isolated,
+                # One extra node or edge tells _apply_limits the graph was truncated
+                "node_limit": filters.max_nodes + 1,
+                "edge_limit": filters.max_edges + 1,
+            },
         )
-        edge_records = await self.graph_service.neo4j.execute_with_retry(
-            edges_query, {"project_id": project_id, "include_external": filters.include_external}
+        return self._build_graph(
+            records,
+            filters,
+            lambda n: (n.get("file_path", ""), n.get("label", ""), n.get("id", "")),
         )
 
-        nodes: Dict[str, Dict[str, Any]] = {}
-        edges: List[Dict[str, Any]] = []
-        connected_ids = set()
-
-        for record in node_records:
-            node = self._node_to_viz_format(record["node"], record["labels"])
-            nodes[node["id"]] = node
-
-        for record in edge_records:
-            source = self._node_to_viz_format(record["source"], record["source_labels"])
-            target = self._node_to_viz_format(record["target"], record["target_labels"])
-            if source["id"] not in nodes:
-                nodes[source["id"]] = source
-            if target["id"] not in nodes:
-                nodes[target["id"]] = target
-
-            connected_ids.add(source["id"])
-            connected_ids.add(target["id"])
-            edges.append(
-                {
-                    "id": f"{source['id']}-{target['id']}-{record['rel_type']}",
-                    "source": source["id"],
-                    "target": target["id"],
-                    "type": record["rel_type"],
-                    "label": record["rel_type"],
-                }
-            )
-
-        final_nodes = list(nodes.values())
-        if not filters.include_isolated:
-            final_nodes = [node for node in final_nodes if node["id"] in connected_ids]
-
-        final_nodes.sort(key=lambda n: (n.get("file_path", ""), n.get("label", ""), n.get("id", "")))
-        return final_nodes, edges
-
     async def _get_symbol_graph(
         self,
         project_id: str,
         filters: GraphFilters,
     ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """Build a symbol-level graph with optional external modules."""
-        node_conditions = ["n.project_id = $project_id"]
-        edge_target_condition = "(t.project_id = $project_id OR ($include_external AND t:ExternalModule))"
-        params: Dict[str, Any] = {"project_id": project_id, "include_external": filters.include_external}
-
-        if filters.entity_types:
-            label_map = {
-                EntityType.FILE: "File",
-                EntityType.FUNCTION: "Function",
-                EntityType.CLASS: "Class",
-                EntityType.VARIABLE: "Variable",
-                EntityType.IMPORT: "Import",
-            }
-            labels = [label_map[entity_type] for entity_type in filters.entity_types if entity_type in label_map]
-            if labels:
-                node_conditions.append("ANY(label IN labels(n) WHERE label IN $entity_labels)")
-                params["entity_labels"] = labels
-
-        if filters.languages:
-            node_conditions.append("n.language IN $languages")
-            params["languages"] = filters.languages
+        query, params = self._build_visualization_query(project_id, filters)
+        records = await self.graph_service.neo4j.execute_with_retry(query, params)
+        return self._build_graph(
+            records,
+            filters,
+            lambda n: (n.get("type", ""), n.get("label", ""), n.get("id", "")),
+        )
 
-        if filters.file_patterns:
-            node_conditions.append("ANY(pattern IN $file_patterns WHERE n.file_path CONTAINS pattern)")
-            params["file_patterns"] = filters.file_patterns
+    def _build_graph(
+        self,
+        records: List[Dict[str, Any]],
+        filters: GraphFilters,
+        sort_key: Callable[[Dict[str, Any]], Any],
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Build visualization nodes and edges from a graph query result.
 
-        nodes_query = f"""
-        MATCH (n)
-        WHERE {' AND '.join(node_conditions)}
-        RETURN properties(n) AS node, labels(n) AS labels
-        ORDER BY n.file_path, n.name
-        """
+        Args:
+            records: Result of a graph query, one row with node and edge lists
+            filters: Visualization filters
+            sort_key: Sort key for the returned nodes
 
-        edges_query = f"""
-        MATCH (s)-[r]->(t)
-        WHERE s.project_id = $project_id AND {edge_target_condition}
-        RETURN properties(s) AS source,
-               labels(s) AS source_labels,
-               type(r) AS rel_type,
-               properties(t) AS target,
-               labels(t) AS target_labels
-        ORDER BY source.id, target.id, rel_type
+        Returns:
+            Tuple of (nodes, edges)
         """
+        node_records = records[0]["nodes"] if records else []
+        edge_records = records[0]["edges"] if records else []
 
-        node_records = await self.graph_service.neo4j.execute_with_retry(nodes_query, params)
-        edge_records = await self.graph_service.neo4j.execute_with_retry(edges_query, params)
-
-        nodes: Dict[str, Dict[str, Any]] = {}
+        nodes: Dict[str, Dict[str, Any]] = {
+            node["id"]: node
+            for node in (
+                self._node_to_viz_format(record["node"], record["labels"])
+                for record in node_records
+            )
+        }
         edges: List[Dict[str, Any]] = []
-        connected_ids = set()
-
-        for record in node_records:
-            node = self._node_to_viz_format(record["node"], record["labels"])
-            nodes[node["id"]] = node
 
         for record in edge_records:
-            source = self._node_to_viz_format(record["source"], record["source_labels"])
-            target = self._node_to_viz_format(record["target"], record["target_labels"])
-            if source["id"] not in nodes:
-                nodes[source["id"]] = source
-            if target["id"] not in nodes:
-                nodes[target["id"]] = target
-
-            connected_ids.add(source["id"])
-            connected_ids.add(target["id"])
+            source_id = record["source"].get("id", "")
+            target_id = record["target"].get("id", "")
+            # Endpoints are usually already converted from the node list;
+            # only nodes outside it (e.g. external modules) are built here
+            if source_id not in nodes:
+                nodes[source_id] = self._node_to_viz_format(record["source"], record["source_labels"])
+            if target_id not in nodes:
+                nodes[target_id] = self._node_to_viz_format(record["target"], record["target_labels"])
+
             edges.append(
                 {
-                    "id": f"{source['id']}-{target['id']}-{record['rel_type']}",
-                    "source": source["id"],
-                    "target": target["id"],
+                    # ReactFlow needs string IDs; join is cheaper than formatting
+                    "id": "-".join((source_id, target_id, record["rel_type"])),
+                    "source": source_id,
+                    "target": target_id,
                     "type": record["rel_type"],
                     "label": record["rel_type"],
                 }
@@ -593,11 +925,46 @@ class QueryService:
 
         final_nodes = list(nodes.values())
         if not filters.include_isolated:
+            connected_ids = {
+                node_id for edge in edges for node_id in (edge["source"], edge["target"])
+            }
             final_nodes = [node for node in final_nodes if node["id"] in connected_ids]
 
-        final_nodes.sort(key=lambda n: (n.get("type", ""), n.get("label", ""), n.get("id", "")))
+        final_nodes.sort(key=sort_key)
         return final_nodes, edges
 
+    def _build_visualization_query(
+        self,
+        project_id: str,
+        filters: GraphFilters,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build the symbol-graph query and its parameters.
+
+        The query text is the same for every project and filter combination;
+        unused filters are passed as null and short-circuit, so Neo4j plans
+        the query once and reuses the cached plan.
+
+        Args:
+            project_id: Project identifier
+            filters: Visualization filters
+
+        Returns:
+            Tuple of (Cypher query, query parameters)
+        """
+        labels = _entity_labels(tuple(filters.entity_types or ()))
+        params: Dict[str, Any] = {
+            "project_id": project_id,
+            "include_external": filters.include_external,
+            "include_isolated": filters.include_isolated,
+            # One extra node or edge tells _apply_limits the graph was truncated
+            "node_limit": filters.max_nodes + 1,
+            "edge_limit": filters.max_edges + 1,
+            "entity_labels": list(labels) if labels else None,
+            "languages": filters.languages or None,
+            "file_patterns": filters.file_patterns or None,
+        }
+        return _SYMBOL_GRAPH_QUERY, params
+
     def _apply_limits(
         self,
         nodes: List[Dict[str, Any]],
@@ -606,83 +973,83 @@ class QueryService:
     ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], bool]:
         """Apply deterministic node/edge limits and return truncation state."""
         truncated = False
-        ordered_nodes = sorted(nodes, key=lambda n: (n.get("type", ""), n.get("label", ""), n.get("id", "")))
-        ordered_edges = sorted(edges, key=lambda e: (e["source"], e["target"], e["type"]))
+        node_key = lambda n: (n.get("type", ""), n.get("label", ""), n.get("id", ""))
 
-        if len(ordered_nodes) > filters.max_nodes:
-            ordered_nodes = ordered_nodes[: filters.max_nodes]
+        if len(nodes) > filters.max_nodes:
+            # Select the first max_nodes without sorting the whole list
+            ordered_nodes = heapq.nsmallest(filters.max_nodes, nodes, key=node_key)
             truncated = True
+            node_ids = {node["id"] for node in ordered_nodes}
+            ordered_edges = [
+                edge for edge in edges
+                if edge["source"] in node_ids and edge["target"] in node_ids
+            ]
+        else:
+            # Every edge endpoint is already a node, so there is nothing to prune
+            ordered_nodes = sorted(nodes, key=node_key)
+            ordered_edges = edges
 
-        node_ids = {node["id"] for node in ordered_nodes}
-        ordered_edges = [edge for edge in ordered_edges if edge["source"] in node_ids and edge["target"] in node_ids]
-
+        edge_key = lambda e: (e["source"], e["target"], e["type"])
         if len(ordered_edges) > filters.max_edges:
-            ordered_edges = ordered_edges[: filters.max_edges]
+            ordered_edges = heapq.nsmallest(filters.max_edges, ordered_edges, key=edge_key)
             truncated = True
+        else:
+            ordered_edges = sorted(ordered_edges, key=edge_key)
 
         return ordered_nodes, ordered_edges, truncated
 
     def _node_to_viz_format(self, node: Dict[str, Any], labels: List[str]) -> Dict[str, Any]:
         """Convert Neo4j node properties to visualization format."""
-        entity_type = "FUNCTION"
-        label_to_type = {
-            "File": "FILE",
-            "Function": "FUNCTION",
-            "Class": "CLASS",
-            "Variable": "VARIABLE",
-            "Import": "IMPORT",
-            "ExternalModule": "EXTERNAL_MODULE",
-        }
-        for label in labels:
-            if label in label_to_type:
-                entity_type = label_to_type[label]
-                break
-
         return {
             "id": node.get("id", ""),
             "label": node.get("name", node.get("id", "")),
-            "type": entity_type,
+            "type": _viz_node_type(tuple(labels)),
             "file_path": node.get("file_path", ""),
             "start_line": node.get("start_line"),
             "end_line": node.get("end_line"),
             "language": node.get("language"),
         }
     
-    async def _get_entity_by_id(
+    async def _get_entities_by_ids(
         self,
-        entity_id: str,
+        entity_ids: List[str],
         project_id: str
-    ) -> Optional[CodeEntity]:
-        """Get entity from graph database by ID.
+    ) -> Dict[str, CodeEntity]:
+        """Get entities from graph database by ID in a single query.
         
         Args:
-            entity_id: Entity identifier
+            entity_ids: Entity identifiers
             project_id: Project identifier
             
         Returns:
-            CodeEntity if found, None otherwise
+            Dictionary mapping entity ID to CodeEntity; IDs that are not
+            found are omitted
         """
+        entities: Dict[str, CodeEntity] = {}
+        
         try:
+            # One match over the project's nodes; an UNWIND per ID would
+            # repeat the label-less node scan for every ID
             query = """
-            MATCH (e {id: $entity_id, project_id: $project_id})
+            MATCH (e)
+            WHERE e.project_id = $project_id AND e.id IN $entity_ids
             RETURN e
             """
             
             result = await self.graph_service.neo4j.execute_with_retry(
-                query, 
-                {"entity_id": entity_id, "project_id": project_id}
+                query,
+                {"entity_ids": entity_ids, "project_id": project_id}
             )
             
-            if result and len(result) > 0:
-                node = result[0]['e']
-                entity = self.graph_service._node_to_entity(node)
-                return entity
-            
-            return None
+            for record in result:
+                entity = self.graph_service._node_to_entity(record['e'])
+                if entity.id is not None:
+                    entities[entity.id] = entity
+            return entities
                 
         except Exception as e:
-            logger.error(f"Failed to get entity by ID: {e}")
-            return None
+            logger.error(f"Failed to get entities by ID: {e}")
+            return entities
     
     def _create_snippet(self, entity: CodeEntity, max_length: int = 200) -> str:
         """Create a code snippet from entity.
@@ -694,24 +1061,85 @@ class QueryService:
         Returns:
             Code snippet string
         """
-        if entity.signature:
-            snippet = entity.signature
-        elif entity.body:
-            snippet = entity.body
-        else:
-            snippet = f"{entity.entity_type.value}: {entity.name}"
+        # Only the text used is passed, so a long body isn't hashed for
+        # the memo key when there is a signature
+        return _make_snippet(
+            entity.signature or entity.body,
+            entity.entity_type.value,
+            entity.name,
+            max_length
+        )
+
+
+def _build_dependency_tree(dependencies: List[DependencyNode]) -> Dict[str, List[str]]:
+    """Build the impact tree as an adjacency list from dependency paths.
+    
+    Each dependency's path ends in the parent it was reached from and the
+    dependency itself, so one pass over the paths yields every tree edge
+    without recursive traversal.
+    
+    Args:
+        dependencies: Dependency nodes with their paths from the root
         
-        # Truncate if too long
-        if len(snippet) > max_length:
-            snippet = snippet[:max_length] + "..."
+    Returns:
+        Dictionary mapping each entity ID to the IDs of its direct
+        dependents, in discovery order
+    """
+    tree: Dict[str, List[str]] = defaultdict(list)
+    seen_edges = set()
+    for dependency in dependencies:
+        path = dependency.path
+        if len(path) < 2:
+            continue
+        edge = (path[-2], path[-1])
+        if edge not in seen_edges:
+            seen_edges.add(edge)
+            tree[edge[0]].append(edge[1])
+    return dict(tree)
+
+
+@lru_cache(maxsize=4096)
+def _make_snippet(
+    text: Optional[str],
+    entity_type_value: str,
+    name: str,
+    max_length: int
+) -> str:
+    """Build a search result snippet; memoized since hits recur across queries.
+    
+    Args:
+        text: Entity signature, or its body when there is no signature
+        entity_type_value: Entity type name, for the fallback snippet
+        name: Entity name, for the fallback snippet
+        max_length: Maximum snippet length
         
-        return snippet
+    Returns:
+        Code snippet string
+    """
+    snippet = text or f"{entity_type_value}: {name}"
+    
+    # Truncate if too long
+    if len(snippet) > max_length:
+        return snippet[:max_length] + "..."
+    return snippet
+
+
+# Global query service instance
+_query_service: Optional[QueryService] = None
 
 
 def get_query_service() -> QueryService:
-    """Get a query service instance.
+    """Get or create the global query service instance.
+    
+    A single instance is shared so that concurrent requests for the same
+    query share one in-flight load and one set of service connections.
     
     Returns:
         QueryService instance
     """
-    return QueryService()
+    global _query_service
+    
+    if _query_service is None:
+        _query_service = QueryService()
+    
+    return _query_service
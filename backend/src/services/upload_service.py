@@ -1,18 +1,28 @@
 """Upload Service for handling project uploads and coordinating parsing workflow."""
 
 import asyncio
-import uuid
-import json
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+import io
+import os
+import re
+import secrets
+import sys
+from typing import List, Optional, Dict, Any, Iterator, Set, Tuple
+from datetime import datetime, timezone
 import logging
 from pathlib import Path
 import threading
+import time
 import shutil
 import subprocess
 import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import orjson
+import redis
+from cachetools import LRUCache
 
 from ..models.base import UploadSession, Project, ParseResult
+from ..celery_app import celery_app
 from ..config.settings import settings
 from ..utils.errors import InvalidRequestError, FileSizeExceededError
 from .code_parser import LanguageDetector
@@ -23,6 +33,64 @@ logger = logging.getLogger(__name__)
 SESSION_STORAGE_DIR = Path("./upload_sessions")
 SESSION_STORAGE_DIR.mkdir(exist_ok=True)
 
+# Buffer size used when spooling uploaded files to disk
+UPLOAD_SPOOL_CHUNK_SIZE = 64 * 1024
+
+# Bytes per os.sendfile call when spooling uploads that are backed by a file
+UPLOAD_SENDFILE_CHUNK_SIZE = 8 * 1024 * 1024
+
+# os.sendfile only accepts a regular file as the destination on Linux
+_SENDFILE_SUPPORTED = sys.platform.startswith("linux")
+
+# Local fallback uploads processed concurrently on the background event loop
+LOCAL_PROCESSING_CONCURRENCY = 2
+
+# GitHub imports cloned concurrently
+GITHUB_IMPORT_WORKERS = 4
+
+# Seconds a Celery worker ping result is reused before pinging again
+CELERY_WORKER_CHECK_TTL = 5.0
+
+# Number of parsed file-store sessions kept in memory
+SESSION_FILE_CACHE_SIZE = 1024
+
+# Statuses whose session update is written without waiting for the flush timer
+TERMINAL_SESSION_STATUSES = {"completed", "failed"}
+
+# Delay in seconds before buffered session updates are written
+SESSION_UPDATE_FLUSH_DELAY = 0.2
+
+# UploadSession fields stored as plain hash values; errors live in their own
+# list and statistics are stored as a JSON string
+_SESSION_SCALAR_FIELDS = (
+    "project_id",
+    "status",
+    "progress",
+    "files_processed",
+    "total_files",
+    "entities_extracted",
+)
+
+# Thread pool size for reading cloned repository files
+REPOSITORY_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Matches paths whose extension the parser supports, mirroring
+# LanguageDetector.is_supported in a single regex search
+SUPPORTED_SOURCE_RE = re.compile(
+    r"[^/]\.(?:"
+    + "|".join(re.escape(ext.lstrip(".")) for ext in LanguageDetector.EXTENSION_MAP)
+    + r")$",
+    re.IGNORECASE,
+)
+
+# Sparse checkout patterns for GitHub imports, covering every extension the
+# parser supports
+SPARSE_CHECKOUT_PATTERNS = tuple(
+    f"*{extension}"
+    for ext in LanguageDetector.EXTENSION_MAP
+    for extension in (ext, ext.upper())
+)
+
 IGNORED_UPLOAD_PATH_SEGMENTS = {
     ".git",
     "node_modules",
@@ -31,24 +99,146 @@ IGNORED_UPLOAD_PATH_SEGMENTS = {
 }
 
 
+def _walk_files(root: Path, skip_dirs: Set[str]) -> Iterator[Tuple[str, os.DirEntry]]:
+    """Yield (relative posix path, entry) for files under root.
+    
+    Directories named in skip_dirs are pruned before they are entered.
+    """
+    stack = [(str(root), "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    relative = f"{prefix}{entry.name}"
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in skip_dirs:
+                            stack.append((entry.path, f"{relative}/"))
+                    elif entry.is_file():
+                        yield relative, entry
+        except OSError:
+            continue
+
+
+def _copy_to_spool(source, spool_file) -> None:
+    """Copy an upload into a spool file.
+    
+    Uploads that have rolled over to a real file are copied in-kernel with
+    os.sendfile; in-memory uploads fall back to a buffered copy.
+    """
+    # SpooledTemporaryFile.fileno() forces a rollover to disk, so in-memory
+    # spools must not be asked for one
+    in_memory = not getattr(source, "_rolled", True)
+    try:
+        source_fd = source.fileno() if _SENDFILE_SUPPORTED and not in_memory else None
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        source_fd = None
+    
+    if source_fd is None:
+        shutil.copyfileobj(source, spool_file, length=UPLOAD_SPOOL_CHUNK_SIZE)
+        return
+    
+    offset = source.tell()
+    spool_fd = spool_file.fileno()
+    while True:
+        sent = os.sendfile(spool_fd, source_fd, offset, UPLOAD_SENDFILE_CHUNK_SIZE)
+        if sent == 0:
+            break
+        offset += sent
+
+
+def _remove_spool_files(spool_paths: Iterator[str]) -> None:
+    """Delete spool files, ignoring ones that are already gone."""
+    for spool_path in spool_paths:
+        try:
+            os.unlink(spool_path)
+        except OSError:
+            pass
+
+
+def _session_key(session_id: str) -> str:
+    return f"session:{session_id}"
+
+
+def _session_errors_key(session_id: str) -> str:
+    return f"session:{session_id}:errors"
+
+
+def _to_epoch(value: datetime) -> float:
+    """Convert a naive UTC datetime to epoch seconds."""
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _from_epoch(value: str) -> datetime:
+    """Convert epoch seconds back to a naive UTC datetime."""
+    return datetime.fromtimestamp(float(value), tz=timezone.utc).replace(tzinfo=None)
+
+
 class UploadService:
     """Service for handling project uploads and coordinating parsing workflow."""
     
-    def __init__(self):
-        """Initialize the upload service."""
-        logger.info("Initialized Upload Service with file-based session storage")
+    def __init__(self, redis_client: Optional[redis.Redis] = None):
+        """Initialize the upload service.
+        
+        Args:
+            redis_client: Optional Redis client for session storage. Defaults to
+                the Celery result backend connection.
+        """
+        self._redis = redis_client or redis.Redis.from_url(
+            settings.celery_result_backend,
+            decode_responses=True,
+        )
+        # Buffered session updates, flushed by a per-session timer
+        self._pending_updates: Dict[str, Dict[str, Any]] = {}
+        self._flush_timers: Dict[str, threading.Timer] = {}
+        self._session_update_lock = threading.Lock()
+        # Imported once here rather than at module level because upload_tasks
+        # imports this module
+        from ..tasks.upload_tasks import process_project_upload, _process_project_upload_async
+
+        self._process_project_upload = process_project_upload
+        self._process_project_upload_async = _process_project_upload_async
+        # Local fallback processing shares one event loop in a daemon thread;
+        # GitHub clones run on a bounded thread pool
+        self._background_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._background_loop_lock = threading.Lock()
+        self._local_processing_slots = asyncio.Semaphore(LOCAL_PROCESSING_CONCURRENCY)
+        self._github_executor = ThreadPoolExecutor(
+            max_workers=GITHUB_IMPORT_WORKERS,
+            thread_name_prefix="upload-github",
+        )
+        # Cached result of the last Celery worker ping
+        self._workers_available = False
+        self._workers_checked_until = 0.0
+        # Parsed file-store sessions keyed by session_id -> (mtime_ns, session)
+        self._session_file_cache: LRUCache = LRUCache(maxsize=SESSION_FILE_CACHE_SIZE)
+        self._session_file_cache_lock = threading.Lock()
+        logger.info("Initialized Upload Service with Redis session storage")
 
     def _has_active_celery_workers(self) -> bool:
-        """Return True when at least one Celery worker is reachable."""
-        try:
-            from ..celery_app import celery_app
+        """Return True when at least one Celery worker is reachable.
+        
+        The ping result is cached for CELERY_WORKER_CHECK_TTL seconds so uploads
+        do not each wait on a broadcast round-trip.
+        """
+        if time.monotonic() < self._workers_checked_until:
+            return self._workers_available
 
+        try:
             inspector = celery_app.control.inspect(timeout=1)
             ping_result = inspector.ping() if inspector else None
-            return bool(ping_result)
+            available = bool(ping_result)
         except Exception as e:
             logger.warning(f"Could not inspect Celery workers: {e}")
-            return False
+            available = False
+
+        self._remember_worker_status(available)
+        return available
+
+    def _remember_worker_status(self, available: bool) -> None:
+        """Cache Celery worker availability for CELERY_WORKER_CHECK_TTL seconds."""
+        self._workers_available = available
+        self._workers_checked_until = time.monotonic() + CELERY_WORKER_CHECK_TTL
 
     def _start_local_processing(
         self,
@@ -57,36 +247,50 @@ class UploadService:
         project_name: str,
         files: List[tuple],
         user_id: str,
-    ) -> None:
-        """Fallback processing path when Celery workers are unavailable."""
-
-        def _runner():
-            try:
-                from ..tasks.upload_tasks import _process_project_upload_async
+        spooled: bool = False,
+    ) -> Future:
+        """Fallback processing path when Celery workers are unavailable.
+        
+        Jobs run on the shared background event loop, at most
+        LOCAL_PROCESSING_CONCURRENCY at a time.
+        
+        Returns:
+            Future that resolves when processing finishes
+        """
 
-                asyncio.run(
-                    _process_project_upload_async(
+        async def _runner():
+            async with self._local_processing_slots:
+                try:
+                    await self._process_project_upload_async(
                         session_id=session_id,
                         project_id=project_id,
                         project_name=project_name,
                         files=files,
                         user_id=user_id,
+                        spooled=spooled,
+                    )
+                except Exception as e:
+                    logger.error(f"Local upload processing failed for {session_id}: {e}", exc_info=True)
+                    self.update_session_status(
+                        session_id=session_id,
+                        status="failed",
+                        errors=[f"Processing failed: {str(e)}"],
                     )
-                )
-            except Exception as e:
-                logger.error(f"Local upload processing failed for {session_id}: {e}", exc_info=True)
-                self.update_session_status(
-                    session_id=session_id,
-                    status="failed",
-                    errors=[f"Processing failed: {str(e)}"],
-                )
 
-        worker_thread = threading.Thread(
-            target=_runner,
-            daemon=True,
-            name=f"upload-local-{session_id}",
-        )
-        worker_thread.start()
+        return asyncio.run_coroutine_threadsafe(_runner(), self._get_background_loop())
+
+    def _get_background_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the background event loop, starting its thread on first use."""
+        with self._background_loop_lock:
+            if self._background_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever,
+                    daemon=True,
+                    name="upload-local-processing",
+                ).start()
+                self._background_loop = loop
+            return self._background_loop
 
     def _should_ignore_upload_path(self, file_path: str) -> bool:
         """Return True if upload path should be ignored for ingestion."""
@@ -98,7 +302,7 @@ class UploadService:
 
     def _is_supported_source_file(self, file_path: str) -> bool:
         """Return True when file extension is supported by parser service."""
-        return LanguageDetector.is_supported(file_path or "")
+        return SUPPORTED_SOURCE_RE.search(file_path or "") is not None
 
     def _dispatch_processing_task(
         self,
@@ -107,25 +311,40 @@ class UploadService:
         project_name: str,
         file_data: List[tuple],
         user_id: str,
+        spooled: bool = False,
     ) -> None:
-        """Dispatch processing through Celery, with local fallback."""
-        from ..tasks.upload_tasks import process_project_upload
-
+        """Dispatch processing through Celery, with local fallback.
+        
+        Args:
+            session_id: Session identifier
+            project_id: Project identifier
+            project_name: Project name
+            file_data: List of (filename, content) tuples, or (filename, spool path)
+                tuples when ``spooled`` is set
+            user_id: User identifier
+            spooled: Whether file_data holds spool file paths instead of contents
+        """
         queued_with_celery = False
         if self._has_active_celery_workers():
             try:
+                if not spooled:
+                    # Pass spool paths so file contents stay out of the broker payload
+                    file_data = self._spool_file_contents(file_data)
+                    spooled = True
                 logger.info(f"Queueing Celery task for session {session_id}")
-                task = process_project_upload.delay(
+                task = self._process_project_upload.delay(
                     session_id=session_id,
                     project_id=project_id,
                     project_name=project_name,
                     files=file_data,
-                    user_id=user_id
+                    user_id=user_id,
+                    spooled=spooled,
                 )
                 logger.info(f"Celery task queued with ID: {task.id}")
                 queued_with_celery = True
             except Exception as e:
                 logger.warning(f"Celery dispatch failed for session {session_id}: {e}")
+                self._remember_worker_status(False)
 
         if not queued_with_celery:
             logger.warning(
@@ -138,8 +357,27 @@ class UploadService:
                 project_name=project_name,
                 files=file_data,
                 user_id=user_id,
+                spooled=spooled,
             )
 
+    def _spool_file_contents(self, file_data: List[tuple]) -> List[tuple]:
+        """Write (filename, content) tuples to spool files as (filename, spool path).
+        
+        If spooling fails partway, the spool files already written are removed.
+        """
+        spool_dir = Path(settings.upload_temp_dir)
+        spool_dir.mkdir(parents=True, exist_ok=True)
+        spooled_data = []
+        try:
+            for filename, content in file_data:
+                with tempfile.NamedTemporaryFile(delete=False, dir=spool_dir) as spool_file:
+                    spooled_data.append((filename, spool_file.name))
+                    spool_file.write(content.encode("utf-8"))
+        except BaseException:
+            _remove_spool_files(spool_path for _, spool_path in spooled_data)
+            raise
+        return spooled_data
+
     def _normalize_github_repo_url(self, github_url: str) -> str:
         """Validate and normalize GitHub URL to clone form."""
         cleaned = (github_url or "").strip()
@@ -178,41 +416,43 @@ class UploadService:
         }
 
         max_file_size_bytes = settings.max_file_size_mb * 1024 * 1024
-        collected: List[tuple] = []
 
-        for path in repo_dir.rglob("*"):
-            if not path.is_file():
-                continue
-
-            rel_parts = set(path.relative_to(repo_dir).parts)
-            if rel_parts & skip_dirs:
-                continue
-
-            relative = path.relative_to(repo_dir).as_posix()
-            if not self._is_supported_source_file(relative):
-                continue
-
-            if len(collected) >= settings.max_files_per_project:
-                raise FileSizeExceededError(
-                    f"Project exceeds maximum file limit of {settings.max_files_per_project}"
-                )
-
-            try:
-                if path.stat().st_size > max_file_size_bytes:
-                    logger.debug(f"Skipping large file: {path}")
-                    continue
-            except OSError:
-                continue
+        candidates = [
+            (relative, entry)
+            for relative, entry in _walk_files(repo_dir, skip_dirs)
+            if self._is_supported_source_file(relative)
+        ]
 
+        def _read_one(candidate: tuple) -> Optional[str]:
+            _, entry = candidate
             try:
-                content = path.read_text(encoding="utf-8")
+                if entry.stat().st_size > max_file_size_bytes:
+                    logger.debug(f"Skipping large file: {entry.path}")
+                    return None
+                with open(entry.path, encoding="utf-8") as f:
+                    return f.read()
             except UnicodeDecodeError:
                 # Skip binary/non-utf8 files.
-                continue
+                return None
             except OSError:
-                continue
+                return None
+
+        # Reads are IO-bound, so a thread pool overlaps the per-file syscalls
+        collected: List[tuple] = []
+        executor = ThreadPoolExecutor(max_workers=REPOSITORY_READ_WORKERS)
+        try:
+            for (relative, _), content in zip(candidates, executor.map(_read_one, candidates)):
+                if content is None:
+                    continue
+
+                if len(collected) >= settings.max_files_per_project:
+                    raise FileSizeExceededError(
+                        f"Project exceeds maximum file limit of {settings.max_files_per_project}"
+                    )
 
-            collected.append((relative, content))
+                collected.append((relative, content))
+        finally:
+            executor.shutdown(cancel_futures=True)
 
         return collected
 
@@ -234,11 +474,15 @@ class UploadService:
                 clone_url = self._normalize_github_repo_url(github_url)
                 self.update_session_status(session_id=session_id, status="processing", progress=0.05)
 
+                # Partial clone: fetch no blobs up front, then check out only
+                # the supported source files through a sparse checkout
                 clone_cmd = [
                     "git",
                     "clone",
                     "--depth",
                     "1",
+                    "--filter=blob:none",
+                    "--no-checkout",
                     "--single-branch",
                     "--branch",
                     branch,
@@ -248,12 +492,31 @@ class UploadService:
                 result = subprocess.run(clone_cmd, capture_output=True, text=True, check=False)
                 if result.returncode != 0:
                     # Fallback to default branch if requested branch fails.
-                    fallback_cmd = ["git", "clone", "--depth", "1", clone_url, str(clone_dir)]
+                    shutil.rmtree(clone_dir, ignore_errors=True)
+                    fallback_cmd = [
+                        "git",
+                        "clone",
+                        "--depth",
+                        "1",
+                        "--filter=blob:none",
+                        "--no-checkout",
+                        clone_url,
+                        str(clone_dir),
+                    ]
                     result = subprocess.run(fallback_cmd, capture_output=True, text=True, check=False)
                     if result.returncode != 0:
                         stderr = (result.stderr or "").strip()
                         raise InvalidRequestError(f"Failed to clone repository: {stderr or 'unknown git error'}")
 
+                for checkout_cmd in (
+                    ["git", "-C", str(clone_dir), "sparse-checkout", "set", "--no-cone", *SPARSE_CHECKOUT_PATTERNS],
+                    ["git", "-C", str(clone_dir), "checkout"],
+                ):
+                    result = subprocess.run(checkout_cmd, capture_output=True, text=True, check=False)
+                    if result.returncode != 0:
+                        stderr = (result.stderr or "").strip()
+                        raise InvalidRequestError(f"Failed to check out repository: {stderr or 'unknown git error'}")
+
                 file_data = self._collect_repository_files(clone_dir)
                 if not file_data:
                     raise InvalidRequestError("No supported source files found in repository")
@@ -280,43 +543,99 @@ class UploadService:
             finally:
                 shutil.rmtree(temp_root, ignore_errors=True)
 
-        worker_thread = threading.Thread(
-            target=_runner,
-            daemon=True,
-            name=f"upload-github-{session_id}",
-        )
-        worker_thread.start()
+        self._github_executor.submit(_runner)
     
     def _get_session_file(self, session_id: str) -> Path:
         """Get the file path for a session."""
         return SESSION_STORAGE_DIR / f"{session_id}.json"
     
     def _save_session(self, session: UploadSession) -> None:
+        """Save session as a Redis hash, falling back to file storage."""
+        mapping = {field: getattr(session, field) for field in _SESSION_SCALAR_FIELDS}
+        mapping["statistics"] = orjson.dumps(session.statistics)
+        mapping["created_at"] = _to_epoch(session.created_at)
+        mapping["updated_at"] = _to_epoch(session.updated_at)
+        
+        key = _session_key(session.session_id)
+        errors_key = _session_errors_key(session.session_id)
+        try:
+            pipe = self._redis.pipeline()
+            pipe.hset(key, mapping=mapping)
+            pipe.delete(errors_key)
+            if session.errors:
+                pipe.rpush(errors_key, *session.errors)
+            pipe.expire(key, settings.upload_session_ttl)
+            pipe.expire(errors_key, settings.upload_session_ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Redis unavailable for session {session.session_id}, using file storage: {e}")
+            self._save_session_file(session)
+    
+    def _load_session(self, session_id: str) -> Optional[UploadSession]:
+        """Load session from Redis, falling back to file storage."""
+        try:
+            pipe = self._redis.pipeline()
+            pipe.hgetall(_session_key(session_id))
+            pipe.lrange(_session_errors_key(session_id), 0, -1)
+            data, errors = pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Redis unavailable for session {session_id}, using file storage: {e}")
+            return self._load_session_file(session_id)
+        
+        if not data:
+            return self._load_session_file(session_id)
+        
+        try:
+            return UploadSession(
+                session_id=session_id,
+                errors=errors,
+                statistics=orjson.loads(data.pop("statistics", "{}")),
+                created_at=_from_epoch(data.pop("created_at")),
+                updated_at=_from_epoch(data.pop("updated_at")),
+                **data,
+            )
+        except Exception as e:
+            logger.error(f"Failed to load session {session_id}: {e}")
+            return None
+    
+    def _save_session_file(self, session: UploadSession) -> None:
         """Save session to file."""
         session_file = self._get_session_file(session.session_id)
-        session_dict = session.dict()
-        # Convert datetime to ISO format
-        session_dict['created_at'] = session.created_at.isoformat()
-        session_dict['updated_at'] = session.updated_at.isoformat()
+        # Serialized in one pass by pydantic-core, without an intermediate dict
+        payload = session.model_dump_json().encode()
         
-        with open(session_file, 'w') as f:
-            json.dump(session_dict, f)
+        # Write to a temp file and swap it in so readers never see a torn file
+        tmp_file = session_file.with_suffix(".json.tmp")
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_file, session_file)
+        
+        with self._session_file_cache_lock:
+            self._session_file_cache[session.session_id] = (
+                session_file.stat().st_mtime_ns,
+                session.model_copy(deep=True),
+            )
     
-    def _load_session(self, session_id: str) -> Optional[UploadSession]:
-        """Load session from file."""
+    def _load_session_file(self, session_id: str) -> Optional[UploadSession]:
+        """Load session from file, reusing the cached copy while its mtime matches."""
         session_file = self._get_session_file(session_id)
-        if not session_file.exists():
+        try:
+            mtime_ns = session_file.stat().st_mtime_ns
+        except OSError:
             return None
         
+        with self._session_file_cache_lock:
+            cached = self._session_file_cache.get(session_id)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1].model_copy(deep=True)
+        
         try:
-            with open(session_file, 'r') as f:
-                session_dict = json.load(f)
+            with open(session_file, 'rb') as f:
+                session = UploadSession.model_validate_json(f.read())
             
-            # Convert ISO format back to datetime
-            session_dict['created_at'] = datetime.fromisoformat(session_dict['created_at'])
-            session_dict['updated_at'] = datetime.fromisoformat(session_dict['updated_at'])
-            
-            return UploadSession(**session_dict)
+            with self._session_file_cache_lock:
+                self._session_file_cache[session_id] = (mtime_ns, session)
+            return session.model_copy(deep=True)
         except Exception as e:
             logger.error(f"Failed to load session {session_id}: {e}")
             return None
@@ -367,8 +686,9 @@ class UploadService:
             )
         
         # Create project and session
-        project_id = f"proj_{uuid.uuid4().hex[:12]}"
-        session_id = f"session_{uuid.uuid4().hex[:12]}"
+        project_id = f"proj_{secrets.token_hex(6)}"
+        session_id = f"session_{secrets.token_hex(6)}"
+        now = datetime.utcnow()
         
         session = UploadSession(
             session_id=session_id,
@@ -379,8 +699,8 @@ class UploadService:
             total_files=len(eligible_files),
             entities_extracted=0,
             errors=[],
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            created_at=now,
+            updated_at=now
         )
         
         self._save_session(session)
@@ -391,16 +711,25 @@ class UploadService:
             f"(ignored paths: {ignored_files}, unsupported: {unsupported_files})"
         )
         
-        # Convert UploadFile objects to (filename, content) tuples
+        # Spool uploads to disk as (filename, spool path) tuples so file
+        # contents are not held in memory or pickled into the task payload
+        spool_dir = Path(settings.upload_temp_dir)
+        spool_dir.mkdir(parents=True, exist_ok=True)
         file_data = []
-        for file in eligible_files:
-            # Read file content
-            content = file.file.read()
-            if isinstance(content, bytes):
-                content = content.decode('utf-8', errors='ignore')
-            file_data.append((file.filename, content))
-            # Reset file pointer
-            file.file.seek(0)
+        try:
+            for file in eligible_files:
+                with tempfile.NamedTemporaryFile(delete=False, dir=spool_dir) as spool_file:
+                    file_data.append((file.filename, spool_file.name))
+                    _copy_to_spool(file.file, spool_file)
+        except BaseException as e:
+            # Don't leave partial spools on the shared volume or the session pending
+            _remove_spool_files(spool_path for _, spool_path in file_data)
+            self.update_session_status(
+                session_id=session_id,
+                status="failed",
+                errors=[f"Failed to spool uploaded files: {str(e)}"]
+            )
+            raise
 
         self._dispatch_processing_task(
             session_id=session_id,
@@ -408,6 +737,7 @@ class UploadService:
             project_name=project_name,
             file_data=file_data,
             user_id=user_id,
+            spooled=True,
         )
         
         return session
@@ -443,8 +773,9 @@ class UploadService:
             project_name = parts[-1] if parts else "unknown"
         
         # Create session
-        project_id = f"proj_{uuid.uuid4().hex[:12]}"
-        session_id = f"session_{uuid.uuid4().hex[:12]}"
+        project_id = f"proj_{secrets.token_hex(6)}"
+        session_id = f"session_{secrets.token_hex(6)}"
+        now = datetime.utcnow()
         
         session = UploadSession(
             session_id=session_id,
@@ -455,8 +786,8 @@ class UploadService:
             total_files=0,  # Will be determined after cloning
             entities_extracted=0,
             errors=[],
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            created_at=now,
+            updated_at=now
         )
         
         self._save_session(session)
@@ -485,6 +816,7 @@ class UploadService:
         Returns:
             UploadSession if found, None otherwise
         """
+        self._flush_session_update(session_id)
         return self._load_session(session_id)
     
     def update_session_status(
@@ -500,6 +832,9 @@ class UploadService:
     ) -> None:
         """Update the status of an upload session.
         
+        Progress updates are coalesced per session and written at most once
+        per SESSION_UPDATE_FLUSH_DELAY; terminal updates are written at once.
+        
         Args:
             session_id: Session identifier
             status: New status (pending, processing, completed, failed)
@@ -509,7 +844,92 @@ class UploadService:
             errors: List of error messages
             statistics: Processing statistics
         """
-        session = self._load_session(session_id)
+        update = {
+            "status": status,
+            "progress": progress,
+            "files_processed": files_processed,
+            "total_files": total_files,
+            "entities_extracted": entities_extracted,
+            "statistics": statistics,
+        }
+        terminal = status in TERMINAL_SESSION_STATUSES or (progress is not None and progress >= 1.0)
+        
+        with self._session_update_lock:
+            pending = self._pending_updates.setdefault(session_id, {})
+            pending.update((field, value) for field, value in update.items() if value is not None)
+            if errors:
+                pending.setdefault("errors", []).extend(errors)
+            
+            if terminal:
+                timer = self._flush_timers.pop(session_id, None)
+                if timer is not None:
+                    timer.cancel()
+                self._write_session_update(session_id, **self._pending_updates.pop(session_id))
+            elif session_id not in self._flush_timers:
+                timer = threading.Timer(
+                    SESSION_UPDATE_FLUSH_DELAY,
+                    self._flush_session_update,
+                    args=(session_id,),
+                )
+                timer.daemon = True
+                self._flush_timers[session_id] = timer
+                timer.start()
+    
+    def _flush_session_update(self, session_id: str) -> None:
+        """Write any buffered update for a session."""
+        with self._session_update_lock:
+            timer = self._flush_timers.pop(session_id, None)
+            if timer is not None:
+                timer.cancel()
+            pending = self._pending_updates.pop(session_id, None)
+            if pending:
+                self._write_session_update(session_id, **pending)
+    
+    def _write_session_update(
+        self,
+        session_id: str,
+        status: Optional[str] = None,
+        progress: Optional[float] = None,
+        files_processed: Optional[int] = None,
+        total_files: Optional[int] = None,
+        entities_extracted: Optional[int] = None,
+        errors: Optional[List[str]] = None,
+        statistics: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Write session changes to Redis, falling back to file storage."""
+        now = datetime.utcnow()
+        changes: Dict[str, Any] = {}
+        if status is not None:
+            changes["status"] = status
+        if progress is not None:
+            changes["progress"] = progress
+        if files_processed is not None:
+            changes["files_processed"] = files_processed
+        if total_files is not None:
+            changes["total_files"] = total_files
+        if entities_extracted is not None:
+            changes["entities_extracted"] = entities_extracted
+        if statistics is not None:
+            changes["statistics"] = orjson.dumps(statistics)
+        changes["updated_at"] = _to_epoch(now)
+        
+        key = _session_key(session_id)
+        errors_key = _session_errors_key(session_id)
+        try:
+            if self._redis.exists(key):
+                # Only the changed fields are written, not the whole session
+                pipe = self._redis.pipeline()
+                pipe.hset(key, mapping=changes)
+                if errors:
+                    pipe.rpush(errors_key, *errors)
+                    pipe.expire(errors_key, settings.upload_session_ttl)
+                pipe.execute()
+                logger.debug(f"Updated session {session_id}: {changes}")
+                return
+        except redis.RedisError as e:
+            logger.warning(f"Redis unavailable for session {session_id}, using file storage: {e}")
+        
+        session = self._load_session_file(session_id)
         if not session:
             logger.warning(f"Session {session_id} not found")
             return
@@ -529,10 +949,10 @@ class UploadService:
         if statistics is not None:
             session.statistics = statistics
         
-        session.updated_at = datetime.utcnow()
+        session.updated_at = now
         
         # Save the updated session back to file
-        self._save_session(session)
+        self._save_session_file(session)
         
         logger.debug(
             f"Updated session {session_id}: status={session.status}, "
@@ -9,18 +9,74 @@ This module provides the Vector Service for semantic search operations:
 Validates: Requirements 3.1, 3.2, 3.3
 """
 
+import heapq
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
+import numpy as np
+from cachetools import LRUCache
 from chromadb import Collection
-from chromadb.errors import ChromaError
+from chromadb.errors import ChromaError, InvalidCollectionException
 
+from ..config.settings import settings
 from ..models.base import CodeEntity, SearchResult
 from ..utils.errors import DatabaseConnectionError, DatabaseQueryError
+from .cache_service import CacheService, get_cache_service
 from .chroma_manager import ChromaConnectionManager, get_chroma_manager
 
+try:
+    from simsimd import cdist as _simsimd_cdist
+except ImportError:  # simsimd is an optional speedup
+    _simsimd_cdist = None
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Maximum number of project collections queried concurrently
+SEARCH_MAX_WORKERS = 16
+
+# Maximum rows per collection.add call; Chroma slows down sharply on
+# very large single inserts
+CHROMA_MAX_BATCH = 200
+
+# Default byte budget for cached small-project embedding matrices
+MATRIX_CACHE_MAX_BYTES = 128 * 1024 * 1024
+
+
+def _matrix_entry_size(entry: Tuple[Any, ...]) -> int:
+    """Bytes held by a cached (version, ids, matrix, sq_norms, metadatas) entry."""
+    return entry[2].nbytes + entry[3].nbytes
+
+
+def _squared_l2_distances(
+    query: np.ndarray,
+    matrix: np.ndarray,
+    sq_norms: np.ndarray
+) -> np.ndarray:
+    """Squared L2 distance from one query to every row of a matrix.
+    
+    Matches the distance of Chroma's default "l2" space, so scores from the
+    in-process path and from collection.query are interchangeable.
+    
+    Args:
+        query: float32 query vector of shape (D,)
+        matrix: C-contiguous float32 matrix of shape (N, D)
+        sq_norms: Precomputed squared norms of the matrix rows
+        
+    Returns:
+        float64 distances of shape (N,)
+    """
+    if _simsimd_cdist is not None:
+        distances = _simsimd_cdist(query[None, :], matrix, metric="sqeuclidean")
+        return np.asarray(distances, dtype=np.float64).reshape(-1)
+    
+    distances = sq_norms - 2.0 * (matrix @ query) + float(query @ query)
+    return np.maximum(distances, 0.0).astype(np.float64)
+
 
 class VectorService:
     """Service for managing vector embeddings and semantic search.
@@ -64,13 +120,48 @@ class VectorService:
         count = service.delete_project_embeddings("proj_456")
     """
     
-    def __init__(self, chroma_manager: Optional[ChromaConnectionManager] = None):
+    def __init__(
+        self,
+        chroma_manager: Optional[ChromaConnectionManager] = None,
+        cache_service: Optional[CacheService] = None,
+        in_process_max_rows: int = 0,
+        in_process_cache_bytes: int = MATRIX_CACHE_MAX_BYTES
+    ):
         """Initialize Vector Service.
         
         Args:
             chroma_manager: Optional Chroma connection manager (uses global if not provided)
+            cache_service: Cache service whose graph versions tell when a
+                cached matrix is stale; in-process search is off without one
+            in_process_max_rows: Projects with at most this many embeddings are
+                searched in-process from a cached matrix instead of through
+                collection.query (default: 0, disabled)
+            in_process_cache_bytes: Byte budget for cached matrices; least
+                recently used projects are evicted past it
         """
         self.chroma_manager = chroma_manager or get_chroma_manager()
+        self.cache_service = cache_service
+        self.in_process_max_rows = in_process_max_rows if cache_service else 0
+        # Collection handles by project ID; single dict reads/writes are atomic,
+        # so search threads can share it without a lock
+        self._collection_cache: Dict[str, Collection] = {}
+        # Small-project embeddings by project ID for in-process search, as
+        # (graph version when loaded, ids, float32 matrix, squared row norms, metadatas);
+        # bounded by matrix bytes and guarded by _matrix_lock
+        self._matrix_cache: LRUCache = LRUCache(
+            maxsize=in_process_cache_bytes,
+            getsizeof=_matrix_entry_size
+        )
+        self._matrix_lock = threading.Lock()
+        # Graph version at which a project was seen above in_process_max_rows;
+        # until it changes, the project goes straight to collection.query
+        # without a count round trip
+        self._large_projects: Dict[str, int] = {}
+        # Shared pool for fanning semantic search out across projects
+        self._search_executor = ThreadPoolExecutor(
+            max_workers=SEARCH_MAX_WORKERS,
+            thread_name_prefix="vector-search"
+        )
         logger.info("Initialized Vector Service")
     
     def _get_collection_name(self, project_id: str) -> str:
@@ -97,6 +188,10 @@ class VectorService:
             DatabaseConnectionError: If connection fails
             DatabaseQueryError: If collection creation fails
         """
+        collection = self._collection_cache.get(project_id)
+        if collection is not None:
+            return collection
+        
         collection_name = self._get_collection_name(project_id)
         
         try:
@@ -106,6 +201,7 @@ class VectorService:
                 metadata={"project_id": project_id},
                 get_or_create=True
             )
+            self._collection_cache[project_id] = collection
             
             logger.debug(f"Ensured collection exists: {collection_name}")
             return collection
@@ -114,6 +210,201 @@ class VectorService:
             logger.error(f"Failed to ensure collection for project {project_id}: {str(e)}")
             raise
     
+    def _get_or_open_collection(self, project_id: str) -> Optional[Collection]:
+        """Get the collection for a project, reusing a cached handle.
+        
+        Only existing collections are cached, so a collection created later
+        (e.g. by an upload worker) is still found.
+        
+        Args:
+            project_id: Project ID
+            
+        Returns:
+            Collection for the project, or None if it does not exist
+        """
+        collection = self._collection_cache.get(project_id)
+        if collection is not None:
+            return collection
+        
+        collection_name = self._get_collection_name(project_id)
+        if not self.chroma_manager.collection_exists(collection_name):
+            return None
+        
+        collection = self.chroma_manager.get_collection(collection_name)
+        self._collection_cache[project_id] = collection
+        return collection
+    
+    def _forget_collection(self, project_id: str) -> None:
+        """Drop everything cached about a project's collection."""
+        self._collection_cache.pop(project_id, None)
+        self._invalidate_matrix(project_id)
+        self._large_projects.pop(project_id, None)
+    
+    def _with_collection(
+        self,
+        project_id: str,
+        operation: Callable[[Collection], T],
+        create: bool = False
+    ) -> Optional[T]:
+        """Run an operation on a project's collection.
+        
+        A cached handle goes dead when another process deletes the
+        collection (e.g. on project deletion or re-upload); the operation
+        is then retried once on a freshly opened handle.
+        
+        Args:
+            project_id: Project ID
+            operation: Called with the collection
+            create: Create the collection if it does not exist
+            
+        Returns:
+            Result of the operation, or None if the collection does not exist
+        """
+        open_collection = self._ensure_collection if create else self._get_or_open_collection
+        collection = open_collection(project_id)
+        if collection is None:
+            return None
+        
+        try:
+            return operation(collection)
+        except InvalidCollectionException:
+            logger.debug(f"Cached collection for project {project_id} is gone, reopening")
+            self._forget_collection(project_id)
+            collection = open_collection(project_id)
+            if collection is None:
+                return None
+            return operation(collection)
+    
+    def _query_project(
+        self,
+        project_id: str,
+        query_embedding: List[float],
+        top_k: int
+    ) -> Optional[Dict[str, Any]]:
+        """Query one project collection for the nearest embeddings.
+        
+        Args:
+            project_id: Project ID
+            query_embedding: Query vector embedding
+            top_k: Maximum number of results to return
+            
+        Returns:
+            Raw Chroma query results, or None if the collection does not exist
+        """
+        results = self._with_collection(
+            project_id,
+            lambda collection: self._query_collection(project_id, collection, query_embedding, top_k)
+        )
+        if results is None:
+            logger.debug(f"Collection for project {project_id} does not exist, skipping")
+        return results
+    
+    def _query_collection(
+        self,
+        project_id: str,
+        collection: Collection,
+        query_embedding: List[float],
+        top_k: int
+    ) -> Dict[str, Any]:
+        """Query a project's collection, in-process if the project is small."""
+        if self.in_process_max_rows and self.cache_service is not None:
+            # Writers in any process bump the version after storing embeddings;
+            # without it there is no way to tell a cached matrix is stale
+            version = self.cache_service.get_graph_version(project_id)
+            if version is not None and self._large_projects.get(project_id) != version:
+                cached = self._get_matrix(project_id, collection, version)
+                if cached is not None:
+                    return self._query_matrix(cached, query_embedding, top_k)
+        
+        # Perform query
+        return collection.query(
+            query_embeddings=[query_embedding],
+            n_results=top_k,
+            include=["metadatas", "distances"]
+        )
+    
+    def _get_matrix(
+        self,
+        project_id: str,
+        collection: Collection,
+        version: int
+    ) -> Optional[Tuple[Any, ...]]:
+        """Get a small project's embedding matrix for in-process search.
+        
+        The matrix is reloaded whenever the project's graph version changes,
+        which also picks up embeddings written by other processes.
+        
+        Args:
+            project_id: Project ID
+            collection: Collection for the project
+            version: Current graph version of the project
+            
+        Returns:
+            Cached (version, ids, matrix, sq_norms, metadatas) entry, or None
+            if the project is empty or too large to search in-process
+        """
+        with self._matrix_lock:
+            cached = self._matrix_cache.get(project_id)
+        if cached is not None and cached[0] == version:
+            return cached
+        
+        count = collection.count()
+        if count > self.in_process_max_rows:
+            self._large_projects[project_id] = version
+            self._invalidate_matrix(project_id)
+            return None
+        self._large_projects.pop(project_id, None)
+        if count == 0:
+            return None
+        
+        data = collection.get(include=["embeddings", "metadatas"])
+        matrix = np.ascontiguousarray(data["embeddings"], dtype=np.float32)
+        sq_norms = np.einsum("ij,ij->i", matrix, matrix)
+        cached = (version, data["ids"], matrix, sq_norms, data["metadatas"])
+        with self._matrix_lock:
+            try:
+                self._matrix_cache[project_id] = cached
+            except ValueError:
+                # Larger than the whole budget; score it this once uncached
+                pass
+        return cached
+    
+    def _query_matrix(
+        self,
+        cached: Tuple[Any, ...],
+        query_embedding: List[float],
+        top_k: int
+    ) -> Dict[str, Any]:
+        """Score a small project in-process against its embedding matrix.
+        
+        Args:
+            cached: Entry returned by _get_matrix
+            query_embedding: Query vector embedding
+            top_k: Maximum number of results to return
+            
+        Returns:
+            Results in the same shape as collection.query
+        """
+        _, ids, matrix, sq_norms, metadatas = cached
+        query = np.asarray(query_embedding, dtype=np.float32)
+        distances = _squared_l2_distances(query, matrix, sq_norms)
+        
+        # Partial selection of the top_k nearest, then order just those
+        k = min(top_k, len(ids))
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.argsort(distances[nearest], kind="stable")]
+        
+        return {
+            "ids": [[ids[i] for i in nearest]],
+            "distances": [distances[nearest].tolist()],
+            "metadatas": [[metadatas[i] for i in nearest]]
+        }
+    
+    def _invalidate_matrix(self, project_id: str) -> None:
+        """Drop a project's cached in-process search matrix, if any."""
+        with self._matrix_lock:
+            self._matrix_cache.pop(project_id, None)
+    
     def store_embedding(
         self,
         entity_id: str,
@@ -164,15 +455,17 @@ class VectorService:
         project_id = metadata["project_id"]
         
         try:
-            # Ensure collection exists
-            collection = self._ensure_collection(project_id)
-            
-            # Store embedding
-            collection.add(
-                ids=[entity_id],
-                embeddings=[embedding],
-                metadatas=[metadata]
+            # Store embedding, creating the collection if necessary
+            self._with_collection(
+                project_id,
+                lambda collection: collection.add(
+                    ids=[entity_id],
+                    embeddings=[embedding],
+                    metadatas=[metadata]
+                ),
+                create=True
             )
+            self._invalidate_matrix(project_id)
             
             logger.info(
                 f"Stored embedding for entity {entity_id} in project {project_id}"
@@ -246,48 +539,53 @@ class VectorService:
             logger.warning("No project IDs provided for semantic search")
             return []
         
-        all_results = []
+        # Bounded min-heap of the best top_k hits as
+        # (similarity, -arrival, distance, id, metadata); the arrival order keeps
+        # ties stable and stops comparisons before the metadata dict
+        heap: List[tuple] = []
+        arrival = 0
         
         try:
-            # Search each project collection
-            for project_id in project_ids:
-                collection_name = self._get_collection_name(project_id)
-                
-                # Check if collection exists
-                if not self.chroma_manager.collection_exists(collection_name):
-                    logger.debug(f"Collection {collection_name} does not exist, skipping")
-                    continue
-                
-                # Get collection
-                collection = self.chroma_manager.get_collection(collection_name)
-                
-                # Perform query
-                results = collection.query(
-                    query_embeddings=[query_embedding],
-                    n_results=top_k,
-                    include=["metadatas", "distances"]
-                )
-                
+            # Search the project collections concurrently; queries are IO-bound
+            if len(project_ids) == 1:
+                project_results = [self._query_project(project_ids[0], query_embedding, top_k)]
+            else:
+                project_results = list(self._search_executor.map(
+                    lambda project_id: self._query_project(project_id, query_embedding, top_k),
+                    project_ids
+                ))
+            
+            for results in project_results:
                 # Process results
                 if results and results["ids"] and results["ids"][0]:
-                    for i, entity_id in enumerate(results["ids"][0]):
-                        distance = results["distances"][0][i]
-                        similarity = 1.0 - distance  # Convert distance to similarity
-                        
-                        # Filter by similarity threshold
-                        if similarity >= similarity_threshold:
-                            all_results.append({
-                                "id": entity_id,
-                                "metadata": results["metadatas"][0][i],
-                                "distance": distance,
-                                "similarity": similarity
-                            })
-            
-            # Sort all results by similarity (descending)
-            all_results.sort(key=lambda x: x["similarity"], reverse=True)
-            
-            # Limit to top_k
-            all_results = all_results[:top_k]
+                    ids = results["ids"][0]
+                    distances = results["distances"][0]
+                    metadatas = results["metadatas"][0]
+                    
+                    # Convert distances to similarities and filter by threshold
+                    # in one vector op; only surviving hits are visited
+                    similarities = 1.0 - np.asarray(distances, dtype=np.float64)
+                    keep = np.flatnonzero(similarities >= similarity_threshold).tolist()
+                    similarities = similarities.tolist()
+                    
+                    for i in keep:
+                        arrival += 1
+                        entry = (similarities[i], -arrival, distances[i], ids[i], metadatas[i])
+                        if len(heap) < top_k:
+                            heapq.heappush(heap, entry)
+                        else:
+                            heapq.heappushpop(heap, entry)
+            
+            # Sort only the kept top_k hits by similarity (descending)
+            all_results = [
+                {
+                    "id": entity_id,
+                    "metadata": metadata,
+                    "distance": distance,
+                    "similarity": similarity
+                }
+                for similarity, _, distance, entity_id, metadata in sorted(heap, reverse=True)
+            ]
             
             logger.info(
                 f"Semantic search found {len(all_results)} results "
@@ -349,39 +647,16 @@ class VectorService:
                 print(f"Similarity: {entity['similarity']:.3f}")
         """
         try:
-            collection_name = self._get_collection_name(project_id)
-            
-            # Check if collection exists
-            if not self.chroma_manager.collection_exists(collection_name):
+            results = self._with_collection(
+                project_id,
+                lambda collection: self._query_similar(collection, entity_id, project_id, top_k)
+            )
+            if results is None:
                 raise DatabaseQueryError(
                     f"Collection for project {project_id} does not exist",
                     details={"project_id": project_id}
                 )
             
-            # Get collection
-            collection = self.chroma_manager.get_collection(collection_name)
-            
-            # Get the entity's embedding
-            entity_data = collection.get(
-                ids=[entity_id],
-                include=["embeddings"]
-            )
-            
-            if not entity_data["ids"] or not entity_data["embeddings"]:
-                raise DatabaseQueryError(
-                    f"Entity {entity_id} not found in project {project_id}",
-                    details={"entity_id": entity_id, "project_id": project_id}
-                )
-            
-            entity_embedding = entity_data["embeddings"][0]
-            
-            # Find similar entities (top_k + 1 to exclude the entity itself)
-            results = collection.query(
-                query_embeddings=[entity_embedding],
-                n_results=top_k + 1,
-                include=["metadatas", "distances"]
-            )
-            
             # Process results, excluding the entity itself
             similar_entities = []
             
@@ -439,6 +714,35 @@ class VectorService:
                 }
             ) from e
     
+    def _query_similar(
+        self,
+        collection: Collection,
+        entity_id: str,
+        project_id: str,
+        top_k: int
+    ) -> Dict[str, Any]:
+        """Query the neighbours of an entity's stored embedding."""
+        # Get the entity's embedding
+        entity_data = collection.get(
+            ids=[entity_id],
+            include=["embeddings"]
+        )
+        
+        if not entity_data["ids"] or not entity_data["embeddings"]:
+            raise DatabaseQueryError(
+                f"Entity {entity_id} not found in project {project_id}",
+                details={"entity_id": entity_id, "project_id": project_id}
+            )
+        
+        entity_embedding = entity_data["embeddings"][0]
+        
+        # Find similar entities (top_k + 1 to exclude the entity itself)
+        return collection.query(
+            query_embeddings=[entity_embedding],
+            n_results=top_k + 1,
+            include=["metadatas", "distances"]
+        )
+    
     def delete_project_embeddings(self, project_id: str) -> int:
         """Delete all embeddings for a project.
         
@@ -470,6 +774,7 @@ class VectorService:
             count = self.chroma_manager.get_collection_count(collection_name)
             
             # Delete the entire collection
+            self._forget_collection(project_id)
             self.chroma_manager.delete_collection(collection_name)
             
             logger.info(
@@ -520,21 +825,17 @@ class VectorService:
                 print(f"Metadata: {data['metadata']}")
         """
         try:
-            collection_name = self._get_collection_name(project_id)
-            
-            # Check if collection exists
-            if not self.chroma_manager.collection_exists(collection_name):
-                logger.debug(f"Collection {collection_name} does not exist")
-                return None
-            
-            # Get collection
-            collection = self.chroma_manager.get_collection(collection_name)
-            
             # Get entity data
-            result = collection.get(
-                ids=[entity_id],
-                include=["embeddings", "metadatas"]
+            result = self._with_collection(
+                project_id,
+                lambda collection: collection.get(
+                    ids=[entity_id],
+                    include=["embeddings", "metadatas"]
+                )
             )
+            if result is None:
+                logger.debug(f"Collection for project {project_id} does not exist")
+                return None
             
             if not result["ids"]:
                 logger.debug(f"Entity {entity_id} not found in project {project_id}")
@@ -563,17 +864,32 @@ class VectorService:
                 details={"entity_id": entity_id, "project_id": project_id}
             ) from e
     
+    def _add_in_batches(self, collection: Collection, data: Dict[str, Any]) -> None:
+        """Add one project's rows to its collection in CHROMA_MAX_BATCH chunks."""
+        for start in range(0, len(data["ids"]), CHROMA_MAX_BATCH):
+            end = start + CHROMA_MAX_BATCH
+            collection.add(
+                ids=data["ids"][start:end],
+                embeddings=data["embeddings"][start:end].tolist(),
+                metadatas=data["metadatas"][start:end]
+            )
+    
     def batch_store_embeddings(
         self,
         entity_ids: List[str],
-        embeddings: List[List[float]],
+        embeddings: Union[List[List[float]], np.ndarray],
         metadatas: List[Dict[str, Any]]
     ) -> int:
         """Store multiple embeddings in batch for efficiency.
         
+        Embeddings are packed into one contiguous float32 matrix and sliced
+        per project; rows are only turned into lists one chunk at a time,
+        since Chroma's add() accepts nothing but lists.
+        
         Args:
             entity_ids: List of entity IDs
-            embeddings: List of embeddings (same length as entity_ids)
+            embeddings: Embeddings as a list of vectors or an (N, D) array
+                (same length as entity_ids)
             metadatas: List of metadata dicts (same length as entity_ids)
             
         Returns:
@@ -604,40 +920,37 @@ class VectorService:
             logger.warning("No embeddings to store")
             return 0
         
-        # Group by project_id
-        project_groups: Dict[str, Dict[str, List]] = {}
-        
-        for entity_id, embedding, metadata in zip(entity_ids, embeddings, metadatas):
-            # Validate metadata
+        # Validate metadata and collect the project of each row
+        project_ids: List[str] = []
+        for entity_id, metadata in zip(entity_ids, metadatas):
             if "project_id" not in metadata:
                 raise ValueError(f"Metadata for {entity_id} missing project_id")
-            
-            project_id = metadata["project_id"]
-            
-            if project_id not in project_groups:
-                project_groups[project_id] = {
-                    "ids": [],
-                    "embeddings": [],
-                    "metadatas": []
-                }
-            
-            project_groups[project_id]["ids"].append(entity_id)
-            project_groups[project_id]["embeddings"].append(embedding)
-            project_groups[project_id]["metadatas"].append(metadata)
+            project_ids.append(metadata["project_id"])
+        
+        # Group rows by project_id as index arrays into one float32 matrix
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        pids = np.array(project_ids)
+        project_groups: Dict[str, Dict[str, Any]] = {}
+        
+        for project_id in dict.fromkeys(project_ids):
+            idx = np.flatnonzero(pids == project_id)
+            project_groups[project_id] = {
+                "ids": [entity_ids[i] for i in idx],
+                "embeddings": matrix[idx],
+                "metadatas": [metadatas[i] for i in idx]
+            }
         
         # Store embeddings for each project
         total_stored = 0
         
         try:
             for project_id, data in project_groups.items():
-                collection = self._ensure_collection(project_id)
-                
-                collection.add(
-                    ids=data["ids"],
-                    embeddings=data["embeddings"],
-                    metadatas=data["metadatas"]
+                self._with_collection(
+                    project_id,
+                    partial(self._add_in_batches, data=data),
+                    create=True
                 )
-                
+                self._invalidate_matrix(project_id)
                 total_stored += len(data["ids"])
                 
                 logger.info(
@@ -675,7 +988,11 @@ def get_vector_service() -> VectorService:
     global _vector_service
     
     if _vector_service is None:
-        _vector_service = VectorService()
+        _vector_service = VectorService(
+            cache_service=get_cache_service(),
+            in_process_max_rows=settings.chroma_in_process_max_rows,
+            in_process_cache_bytes=settings.chroma_in_process_cache_mb * 1024 * 1024
+        )
     
     return _vector_service
 
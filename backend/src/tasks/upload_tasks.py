@@ -2,15 +2,16 @@
 
 import logging
 import json
-from pathlib import PurePosixPath
+from pathlib import Path, PurePosixPath
 from typing import List, Tuple
 from datetime import datetime
 from typing import Dict, Optional, Set
 
 from ..celery_app import celery_app
+from ..services.cache_service import get_cache_service
 from ..services.code_parser import CodeParserService
 from ..services.graph_service import GraphService
-from ..services.vector_service import VectorService
+from ..services.vector_service import get_vector_service
 from ..services.gemini_client import GeminiClient
 from ..services.upload_service import get_upload_service
 from ..models.base import CodeEntity, CodeRelationship, RelationshipType, EntityType
@@ -239,6 +240,31 @@ def _build_file_entities(
     return file_entities
 
 
+def _read_spooled_files(files: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Read (file_path, spool path) tuples into (file_path, content) tuples."""
+    return [
+        (file_path, Path(spool_path).read_text(encoding='utf-8', errors='ignore'))
+        for file_path, spool_path in files
+    ]
+
+
+def _remove_spooled_files(files: List[Tuple[str, str]]) -> None:
+    """Delete spool files once processing no longer needs them."""
+    for _, spool_path in files:
+        try:
+            Path(spool_path).unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Failed to remove spooled upload {spool_path}: {e}")
+
+
+def _bump_graph_version(project_id: str) -> None:
+    """Mark results cached for a project's previous data as stale."""
+    try:
+        get_cache_service().bump_graph_version(project_id)
+    except Exception as e:
+        logger.warning(f"Failed to bump graph version for {project_id}: {e}")
+
+
 @celery_app.task(bind=True, name='tasks.process_project_upload')
 def process_project_upload(
     self,
@@ -246,7 +272,8 @@ def process_project_upload(
     project_id: str,
     project_name: str,
     files: List[Tuple[str, str]],  # List of (file_path, content) tuples
-    user_id: str
+    user_id: str,
+    spooled: bool = False,
 ):
     """Process uploaded project: parse, extract entities, generate embeddings, store in databases.
     
@@ -255,8 +282,10 @@ def process_project_upload(
         session_id: Upload session identifier
         project_id: Project identifier
         project_name: Project name
-        files: List of (file_path, content) tuples
+        files: List of (file_path, content) tuples, or (file_path, spool path)
+            tuples when ``spooled`` is set
         user_id: User identifier
+        spooled: Whether files holds spool file paths instead of contents
     """
     import asyncio
     import nest_asyncio
@@ -273,7 +302,7 @@ def process_project_upload(
     
     # Run the async processing function
     return loop.run_until_complete(_process_project_upload_async(
-        session_id, project_id, project_name, files, user_id
+        session_id, project_id, project_name, files, user_id, spooled
     ))
 
 
@@ -282,13 +311,18 @@ async def _process_project_upload_async(
     project_id: str,
     project_name: str,
     files: List[Tuple[str, str]],
-    user_id: str
+    user_id: str,
+    spooled: bool = False,
 ):
     """Async implementation of project upload processing."""
     upload_service = get_upload_service()
     neo4j_manager = None
+    spooled_files = files if spooled else []
     
     try:
+        if spooled:
+            files = _read_spooled_files(spooled_files)
+        
         # Update session status to processing
         upload_service.update_session_status(
             session_id=session_id,
@@ -365,6 +399,9 @@ async def _process_project_upload_async(
         
         logger.info(f"Stored {len(all_entities)} entities and {len(all_relationships)} relationships in Neo4j")
         
+        # Counts cached from the previous graph are now stale
+        _bump_graph_version(project_id)
+        
         # Step 3: Generate embeddings (70% of progress)
         gemini_client = GeminiClient()
         embeddings = []
@@ -391,7 +428,7 @@ async def _process_project_upload_async(
         logger.info(f"Generated {len(embeddings)} embeddings")
         
         # Step 4: Store embeddings in Chroma (90% of progress)
-        vector_service = VectorService()
+        vector_service = get_vector_service()
         
         for entity, embedding in embeddings:
             try:
@@ -415,6 +452,10 @@ async def _process_project_upload_async(
         
         logger.info(f"Stored {len(embeddings)} embeddings in Chroma")
         
+        # Searches that ran during ingestion cached results under the version
+        # bumped after the Neo4j write, before the embeddings existed
+        _bump_graph_version(project_id)
+        
         # Step 5: Calculate statistics and complete (100%)
         statistics = {
             'file_count': len(files),
@@ -449,6 +490,7 @@ async def _process_project_upload_async(
         
         raise
     finally:
+        _remove_spooled_files(spooled_files)
         if neo4j_manager is not None:
             try:
                 await neo4j_manager.close()
@@ -311,6 +311,37 @@ class TestVectorServiceIntegration:
             result = vector_service.get_embedding(entity_id, project_id)
             assert result is not None
     
+    def test_batch_store_embeddings_ndarray_real(
+        self, vector_service
+    ):
+        """Test batch storing an (N, D) float32 array."""
+        import numpy as np
+        
+        project_id = "test_proj_batch_ndarray"
+        
+        entity_ids = [f"func_{i}" for i in range(5)]
+        embeddings = np.full((5, 768), 0.1, dtype=np.float32)
+        metadatas = [
+            {
+                "entity_type": "function",
+                "file_path": "test.py",
+                "name": f"func_{i}",
+                "project_id": project_id
+            }
+            for i in range(5)
+        ]
+        
+        count = vector_service.batch_store_embeddings(
+            entity_ids=entity_ids,
+            embeddings=embeddings,
+            metadatas=metadatas
+        )
+        
+        assert count == 5
+        result = vector_service.get_embedding("func_0", project_id)
+        assert result is not None
+        assert len(result["embedding"]) == 768
+    
     def test_multi_project_search_real(
         self, vector_service
     ):
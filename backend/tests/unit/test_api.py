@@ -65,3 +65,49 @@ def test_openapi_json(client: TestClient):
     assert "openapi" in data
     assert "info" in data
     assert "paths" in data
+
+
+def test_semantic_search_endpoint_awaits_query_service(client: TestClient, monkeypatch):
+    """Test that query endpoints await the async query service."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    query_service = MagicMock()
+    query_service.semantic_search = AsyncMock(return_value=[])
+    monkeypatch.setattr("src.api.query.get_query_service", lambda: query_service)
+
+    response = client.post("/api/query/search", json={"query": "auth", "project_ids": ["p1"]})
+
+    assert response.status_code == 200
+    assert response.json() == {"results": [], "count": 0}
+    query_service.semantic_search.assert_awaited_once()
+
+
+def test_query_endpoint_flushes_cache_writes_in_one_pipeline(client: TestClient, monkeypatch):
+    """Test that cache writes made by a query endpoint are pipelined."""
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock, MagicMock
+
+    from src.services.cache_service import CacheService
+
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    async_client = MagicMock()
+    async_client.setex = AsyncMock()
+    async_client.pipeline.return_value = pipe
+    cache_service = CacheService(connection_manager=SimpleNamespace(client=MagicMock(), async_client=async_client))
+
+    async def semantic_search(**kwargs):
+        await cache_service.set("query:a", [1])
+        await cache_service.set("query:b", [2])
+        return []
+
+    query_service = MagicMock()
+    query_service.semantic_search = semantic_search
+    monkeypatch.setattr("src.api.query.get_query_service", lambda: query_service)
+
+    response = client.post("/api/query/search", json={"query": "auth", "project_ids": ["p1"]})
+
+    assert response.status_code == 200
+    async_client.setex.assert_not_awaited()
+    assert [c.kwargs["name"] for c in pipe.setex.call_args_list] == ["query:a", "query:b"]
+    pipe.execute.assert_awaited_once()
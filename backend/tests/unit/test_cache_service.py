@@ -0,0 +1,143 @@
+"""Unit tests for the Redis cache service."""
+
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from src.models.base import CodeEntity, EntityType, Language
+from src.services.cache_service import CacheService
+from src.services.query_service import QueryResult
+
+
+def _cache_service():
+    async_client = MagicMock()
+    async_client.get = AsyncMock()
+    async_client.setex = AsyncMock()
+    manager = SimpleNamespace(client=MagicMock(), async_client=async_client)
+    return CacheService(connection_manager=manager), async_client
+
+
+async def test_set_and_get_round_trip_through_async_client():
+    service, async_client = _cache_service()
+
+    assert await service.set("query:test", {"count": 2, "ids": ["a", "b"]}, ttl=60) is True
+
+    key = async_client.setex.call_args.kwargs["name"]
+    stored = async_client.setex.call_args.kwargs["value"]
+    assert key == "query:test"
+    assert async_client.setex.call_args.kwargs["time"] == timedelta(seconds=60)
+
+    async_client.get.return_value = stored
+    assert await service.get("query:test") == {"count": 2, "ids": ["a", "b"]}
+
+
+async def test_get_returns_none_on_miss_and_error():
+    service, async_client = _cache_service()
+
+    async_client.get.return_value = None
+    assert await service.get("query:missing") is None
+
+    async_client.get.side_effect = ConnectionError("down")
+    assert await service.get("query:missing") is None
+
+
+async def test_result_models_round_trip():
+    service, async_client = _cache_service()
+    entity = CodeEntity(
+        id="e1",
+        project_id="p1",
+        entity_type=EntityType.FUNCTION,
+        name="run",
+        file_path="main.py",
+        start_line=1,
+        end_line=3,
+        language=Language.PYTHON,
+        metadata={"calls": 2},
+    )
+    result = QueryResult(entities=[entity], count=1, query_time_ms=1.5, metadata={"query_type": "find_callers"})
+
+    await service.set("query:callers", result)
+    async_client.get.return_value = async_client.setex.call_args.kwargs["value"]
+
+    assert QueryResult.model_validate(await service.get("query:callers")) == result
+    assert QueryResult.model_validate_json(await service.get_raw("query:callers")) == result
+
+
+async def test_warm_function_keys_fetches_all_three_in_one_mget():
+    service, async_client = _cache_service()
+    callers_key = service.build_callers_key("f", "p1")
+    async_client.mget = AsyncMock(return_value=[b'{"count": 0}', None, None])
+
+    prefetched = await service.warm_function_keys("f", "p1")
+
+    async_client.mget.assert_awaited_once_with([
+        callers_key,
+        service.build_dependencies_key("f", "p1"),
+        service.build_impact_key("f", "p1"),
+    ])
+    assert prefetched == {callers_key: b'{"count": 0}'}
+
+
+async def test_values_cached_for_an_older_generation_are_stale():
+    service, async_client = _cache_service()
+    await service.set_with_generation("query:coverage", 3, {"entities": 10})
+    stored = async_client.setex.call_args.kwargs["value"]
+
+    async_client.mget = AsyncMock(return_value=[b"3", stored])
+    assert await service.get_with_generation("query:coverage", "graph:version") == (3, {"entities": 10})
+
+    async_client.mget = AsyncMock(return_value=[b"4", stored])
+    assert await service.get_with_generation("query:coverage", "graph:version") == (4, None)
+
+    async_client.mget = AsyncMock(return_value=[None, None])
+    assert await service.get_with_generation("query:coverage", "graph:version") == (0, None)
+
+
+async def test_get_graph_versions_reads_all_projects_in_one_mget():
+    service, async_client = _cache_service()
+    async_client.mget = AsyncMock(return_value=[b"2", None])
+
+    assert await service.get_graph_versions(("p1", "p2")) == (2, 0)
+    async_client.mget.assert_awaited_once_with([
+        "graph:version:project:p1",
+        "graph:version:project:p2",
+    ])
+
+    async_client.mget.side_effect = ConnectionError("down")
+    assert await service.get_graph_versions(("p1",)) is None
+
+
+def test_get_graph_version_reads_sync_client():
+    service, _ = _cache_service()
+    service.connection_manager.client.get.return_value = b"5"
+
+    assert service.get_graph_version("p1") == 5
+    service.connection_manager.client.get.assert_called_once_with("graph:version:project:p1")
+
+    service.connection_manager.client.get.side_effect = ConnectionError("down")
+    assert service.get_graph_version("p1") is None
+
+
+def test_semantic_get_matches_closest_unexpired_query():
+    service, _ = _cache_service()
+    service.semantic_put([1.0, 0.0, 0.0], ["p1"], 5, (0,), "x-axis")
+    service.semantic_put([0.0, 1.0, 0.0], ["p1"], 5, (0,), "y-axis")
+    service.semantic_put([0.0, 0.0, 1.0], ["p1"], 5, (0,), "z-axis", ttl=-1)
+
+    assert service.semantic_get([0.99, 0.05, 0.0], ["p1"], 5, (0,)) == "x-axis"
+    assert service.semantic_get([0.05, 2.0, 0.0], ["p1"], 5, (0,)) == "y-axis"
+    assert service.semantic_get([0.0, 0.0, 1.0], ["p1"], 5, (0,)) is None
+    assert service.semantic_get([0.7, 0.7, 0.0], ["p1"], 5, (0,)) is None
+    assert service.semantic_get([1.0, 0.0, 0.0], ["p1"], 10, (0,)) is None
+
+
+def test_semantic_get_drops_entries_from_other_graph_versions():
+    service, _ = _cache_service()
+    service.semantic_put([1.0, 0.0], ["p1", "p2"], 5, (3, 7), "old")
+
+    # Project order doesn't matter as long as versions follow it
+    assert service.semantic_get([1.0, 0.0], ["p2", "p1"], 5, (7, 3)) == "old"
+
+    # p2 was re-ingested by another process
+    assert service.semantic_get([1.0, 0.0], ["p1", "p2"], 5, (3, 8)) is None
+    assert service.semantic_get([1.0, 0.0], ["p1", "p2"], 5, (3, 7)) is None
@@ -14,7 +14,7 @@ from datetime import datetime
 from typing import List
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from src.services.graph_service import GraphService, ClassHierarchy
+from src.services.graph_service import GraphService, ClassHierarchy, _build_where, _labels_to_entity_type
 from src.services.neo4j_manager import Neo4jConnectionManager
 from src.models import (
     Project,
@@ -188,6 +188,20 @@ class TestProjectOperations:
                 name="Test Project",
                 user_id="user-456"
             )
+    
+    @pytest.mark.asyncio
+    async def test_delete_project_single_round_trip(self, graph_service, mock_neo4j_manager):
+        """Test that project deletion counts and deletes in one query."""
+        mock_neo4j_manager.execute_with_retry.return_value = [{"entity_count": 7}]
+        
+        stats = await graph_service.delete_project("project-123")
+        
+        mock_neo4j_manager.execute_with_retry.assert_called_once()
+        query, params = mock_neo4j_manager.execute_with_retry.call_args[0]
+        assert "DETACH DELETE e" in query
+        assert "MATCH (p:Project {id: $project_id})" in query
+        assert params == {"project_id": "project-123"}
+        assert stats == {'entities_deleted': 7, 'relationships_deleted': 7}
 
 
 class TestEntityOperations:
@@ -673,16 +687,11 @@ class TestGraphVisualization:
             # Nodes query
             [
                 {
-                    "n": {
-                        "id": "func-1",
-                        "project_id": "project-123",
-                        "name": "my_func",
-                        "file_path": "/test.py",
-                        "start_line": 1,
-                        "end_line": 10,
-                        "language": "python",
-                        "labels": ["Function"]
-                    }
+                    "id": "func-1",
+                    "name": "my_func",
+                    "labels": ["Function"],
+                    "file_path": "/test.py",
+                    "metadata": '{"complexity": 3}'
                 }
             ],
             # Edges query
@@ -700,9 +709,33 @@ class TestGraphVisualization:
         assert len(result.nodes) == 1
         assert result.nodes[0].id == "func-1"
         assert result.nodes[0].label == "my_func"
+        assert result.nodes[0].type == EntityType.FUNCTION
+        assert result.nodes[0].metadata == {"complexity": 3}
         assert len(result.edges) == 1
         assert result.edges[0].source == "func-1"
         assert result.edges[0].target == "func-2"
+        
+        # Only visualization properties are projected
+        nodes_query = mock_neo4j_manager.execute_with_retry.call_args_list[0][0][0]
+        assert "RETURN n\n" not in nodes_query
+        assert "labels(n) AS labels" in nodes_query
+        
+        # Edges are fetched only among the selected nodes
+        edges_query, edges_params = mock_neo4j_manager.execute_with_retry.call_args_list[1][0]
+        assert "target.id IN $node_ids" in edges_query
+        assert edges_params["node_ids"] == ["func-1"]
+        assert edges_params["max_edges"] == 10000
+    
+    @pytest.mark.asyncio
+    async def test_get_project_graph_skips_edges_without_nodes(self, graph_service, mock_neo4j_manager):
+        """Test that no edge query is issued when no nodes match."""
+        mock_neo4j_manager.execute_with_retry.return_value = []
+        
+        result = await graph_service.get_project_graph("project-123", GraphFilters(max_edges=50))
+        
+        assert result.nodes == []
+        assert result.edges == []
+        mock_neo4j_manager.execute_with_retry.assert_called_once()
     
     @pytest.mark.asyncio
     async def test_get_project_graph_with_filters(self, graph_service, mock_neo4j_manager):
@@ -725,9 +758,111 @@ class TestGraphVisualization:
         
         assert "n.language IN $languages" in query
         assert "n.file_path =~ $file_pattern" in query
+        assert "lbl IN $entity_labels" in query
+        assert "n:Function" not in query
+        assert params["entity_labels"] == ["Function"]
         assert params["languages"] == ["python"]
         assert params["file_pattern"] == ".*test.*"
         assert params["max_nodes"] == 100
+    
+    @pytest.mark.asyncio
+    async def test_get_project_graph_reuses_where_clause(self, graph_service, mock_neo4j_manager):
+        """Test that identical filter signatures reuse the cached WHERE clause."""
+        mock_neo4j_manager.execute_with_retry.side_effect = [[], []]
+        
+        await graph_service.get_project_graph(
+            "project-123", GraphFilters(entity_types=[EntityType.CLASS], file_pattern="a.*")
+        )
+        hits_before = _build_where.cache_info().hits
+        await graph_service.get_project_graph(
+            "project-456", GraphFilters(entity_types=[EntityType.FILE], file_pattern="b.*")
+        )
+        
+        assert _build_where.cache_info().hits == hits_before + 1
+        first_query = mock_neo4j_manager.execute_with_retry.call_args_list[0][0][0]
+        second_query = mock_neo4j_manager.execute_with_retry.call_args_list[1][0][0]
+        assert first_query == second_query
+
+
+class TestProjectUpdates:
+    """Test incremental project updates."""
+    
+    @pytest.mark.asyncio
+    async def test_update_project_single_transaction(
+        self, graph_service, mock_neo4j_manager, sample_entities, sample_relationships
+    ):
+        """Test that batched updates run every operation in one transaction."""
+        delete_result = MagicMock()
+        delete_result.single = AsyncMock(return_value={"deleted_count": 4})
+        write_result = MagicMock()
+        write_result.consume = AsyncMock()
+        
+        tx = MagicMock()
+        tx.run = AsyncMock(side_effect=[delete_result] + [write_result] * 5)
+        transaction = MagicMock()
+        transaction.__aenter__ = AsyncMock(return_value=tx)
+        transaction.__aexit__ = AsyncMock(return_value=False)
+        mock_neo4j_manager.transaction = MagicMock(return_value=transaction)
+        mock_neo4j_manager.execute_write_with_retry.return_value = []
+        
+        stats = await graph_service.update_project(
+            "project-123",
+            changed_files=[("/src/main.py", sample_entities, sample_relationships)],
+            deleted_files=["/src/old.py"],
+        )
+        
+        mock_neo4j_manager.transaction.assert_called_once()
+        # 1 delete + 3 entity labels + 2 relationship types
+        assert tx.run.call_count == 6
+        delete_query, delete_params = tx.run.call_args_list[0][0]
+        assert "UNWIND $file_paths" in delete_query
+        assert delete_params["file_paths"] == ["/src/old.py", "/src/main.py"]
+        assert "UNWIND $entities" in tx.run.call_args_list[1][0][0]
+        assert "UNWIND $relationships" in tx.run.call_args_list[-1][0][0]
+        assert stats['entities_removed'] == 4
+        assert stats['entities_added'] == 3
+        assert stats['files_deleted'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_update_project_clears_files_before_creating(
+        self, graph_service, mock_neo4j_manager, sample_entities, sample_relationships
+    ):
+        """Test that unbatched updates finish all deletions before creating entities."""
+        events = []
+        
+        async def fake_delete(project_id, file_path):
+            events.append(("delete", file_path))
+            return 2
+        
+        async def fake_create_entities(project_id, entities):
+            events.append(("entities", project_id))
+            return [entity.id for entity in entities]
+        
+        async def fake_create_relationships(relationships):
+            events.append(("relationships", len(relationships)))
+            return len(relationships)
+        
+        graph_service.batch_updates = False
+        graph_service._delete_file_entities = fake_delete
+        graph_service.create_entities = fake_create_entities
+        graph_service.create_relationships = fake_create_relationships
+        
+        stats = await graph_service.update_project(
+            "project-123",
+            changed_files=[("/src/main.py", sample_entities, sample_relationships)],
+            deleted_files=["/src/old.py", "/src/legacy.py"],
+        )
+        
+        assert [kind for kind, _ in events] == ["delete", "delete", "delete", "entities", "relationships"]
+        assert ("entities", "project-123") in events
+        assert stats == {
+            'files_updated': 1,
+            'files_deleted': 2,
+            'entities_added': 3,
+            'entities_removed': 6,
+            'relationships_added': 2,
+            'relationships_removed': 0,
+        }
 
 
 class TestHelperMethods:
@@ -756,6 +891,14 @@ class TestHelperMethods:
         assert graph_service._entity_type_to_label(EntityType.VARIABLE) == "Variable"
         assert graph_service._entity_type_to_label(EntityType.IMPORT) == "Import"
     
+    def test_labels_to_entity_type(self):
+        """Test label resolution priority and default."""
+        assert _labels_to_entity_type(["Class"]) == EntityType.CLASS
+        assert _labels_to_entity_type(["Import", "File"]) == EntityType.FILE
+        assert _labels_to_entity_type(["Variable", "Class"]) == EntityType.CLASS
+        assert _labels_to_entity_type(["ExternalModule"]) == EntityType.FUNCTION
+        assert _labels_to_entity_type([]) == EntityType.FUNCTION
+    
     def test_node_to_entity(self, graph_service):
         """Test converting Neo4j node to CodeEntity."""
         node = {
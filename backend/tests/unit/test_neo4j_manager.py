@@ -12,6 +12,7 @@ from src.services.neo4j_manager import (
     Neo4jConnectionManager,
     get_neo4j_manager,
     close_neo4j_manager,
+    set_neo4j_manager_for_tenant,
 )
 from src.utils.errors import DatabaseConnectionError, DatabaseQueryError
 
@@ -84,13 +85,48 @@ class TestNeo4jConnectionManager:
     async def test_connect_already_connected(self, connection_manager, mock_driver):
         """Test connecting when already connected."""
         connection_manager._driver = mock_driver
-        connection_manager._is_connected = True
+        connection_manager._mark_connected()
         
         await connection_manager.connect()
         
         # Should not create a new driver
         assert connection_manager.driver == mock_driver
     
+    @pytest.mark.asyncio
+    async def test_connect_concurrent_callers_create_one_driver(
+        self, connection_manager, mock_driver, mock_session
+    ):
+        """Test that concurrent connect() calls create a single driver."""
+        mock_result = AsyncMock()
+        mock_result.single = AsyncMock(return_value={"health": 1})
+        mock_session.run = AsyncMock(return_value=mock_result)
+        mock_driver.session = MagicMock(return_value=mock_session)
+        
+        with patch(
+            "src.services.neo4j_manager.AsyncGraphDatabase.driver", return_value=mock_driver
+        ) as driver_factory:
+            await asyncio.gather(*[connection_manager.connect() for _ in range(5)])
+        
+        driver_factory.assert_called_once()
+        assert connection_manager.is_connected
+    
+    @pytest.mark.asyncio
+    async def test_connect_warm_pool(self, connection_manager, mock_driver, mock_session):
+        """Test that warm_pool opens probe sessions after connecting."""
+        mock_result = AsyncMock()
+        mock_result.single = AsyncMock(return_value={"health": 1})
+        mock_result.consume = AsyncMock()
+        mock_session.run = AsyncMock(return_value=mock_result)
+        mock_driver.session = MagicMock(return_value=mock_session)
+        
+        with patch("src.services.neo4j_manager.settings.neo4j_warm_pool_size", 4):
+            with patch("src.services.neo4j_manager.AsyncGraphDatabase.driver", return_value=mock_driver):
+                await connection_manager.connect(warm_pool=True)
+        
+        probes = [c for c in mock_session.run.call_args_list if c.args == ("RETURN 1",)]
+        assert len(probes) == 4
+        assert mock_result.consume.await_count == 4
+    
     @pytest.mark.asyncio
     async def test_connect_retry_on_service_unavailable(self, connection_manager, mock_driver, mock_session):
         """Test retry logic when service is unavailable."""
@@ -148,10 +184,41 @@ class TestNeo4jConnectionManager:
             with patch("asyncio.sleep", side_effect=mock_sleep):
                 await connection_manager.connect()
         
-        # Verify exponential backoff: 0.1s, 0.2s
+        # Verify jittered exponential backoff: 0.1s, 0.2s scaled by [0.5, 1.5)
         assert len(delays) == 2
-        assert delays[0] == pytest.approx(0.1, rel=0.01)
-        assert delays[1] == pytest.approx(0.2, rel=0.01)
+        assert 0.05 <= delays[0] < 0.15
+        assert 0.1 <= delays[1] < 0.3
+    
+    @pytest.mark.asyncio
+    async def test_connect_closes_replaced_drivers(self, connection_manager, mock_driver):
+        """Test drivers from failed attempts or lost connections are closed."""
+        failed_driver = AsyncMock()
+        failed_driver.verify_connectivity = AsyncMock(
+            side_effect=ServiceUnavailable("Service unavailable")
+        )
+        lost_driver = AsyncMock()
+        connection_manager._driver = lost_driver
+        
+        with patch(
+            "src.services.neo4j_manager.AsyncGraphDatabase.driver",
+            side_effect=[failed_driver, mock_driver]
+        ):
+            with patch("asyncio.sleep", new=AsyncMock()):
+                await connection_manager.connect()
+        
+        assert connection_manager._driver is mock_driver
+        lost_driver.close.assert_awaited_once()
+        failed_driver.close.assert_awaited_once()
+        mock_driver.close.assert_not_awaited()
+    
+    def test_retry_delays_precomputed(self, connection_manager):
+        """Test that base retry delays double per attempt and are jittered."""
+        assert connection_manager._retry_delays == pytest.approx((0.1, 0.2, 0.4))
+        
+        with patch("src.services.neo4j_manager.random.uniform", return_value=1.5):
+            assert connection_manager._retry_delay(3) == pytest.approx(0.6)
+        with patch("src.services.neo4j_manager.random.uniform", return_value=0.5):
+            assert connection_manager._retry_delay(1) == pytest.approx(0.05)
     
     @pytest.mark.asyncio
     async def test_connect_max_retries_exhausted(self, connection_manager):
@@ -177,7 +244,7 @@ class TestNeo4jConnectionManager:
     async def test_close(self, connection_manager, mock_driver):
         """Test closing the connection."""
         connection_manager._driver = mock_driver
-        connection_manager._is_connected = True
+        connection_manager._mark_connected()
         
         await connection_manager.close()
         
@@ -208,7 +275,37 @@ class TestNeo4jConnectionManager:
         result = await connection_manager.health_check()
         
         assert result is True
-        mock_session.run.assert_called_once_with("RETURN 1 AS health")
+        mock_session.run.assert_called_once_with("RETURN 1")
+        mock_result.consume.assert_awaited_once()
+        mock_result.single.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_health_check_throttled(self, connection_manager, mock_driver, mock_session):
+        """Test that a passed health check is reused for consecutive calls."""
+        mock_result = AsyncMock()
+        mock_result.single = AsyncMock(return_value={"health": 1})
+        mock_session.run = AsyncMock(return_value=mock_result)
+        mock_driver.session = MagicMock(return_value=mock_session)
+        
+        connection_manager._driver = mock_driver
+        
+        assert await connection_manager.health_check() is True
+        assert await connection_manager.health_check() is True
+        
+        mock_session.run.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_connect_verifies_connectivity_without_query(
+        self, connection_manager, mock_driver, mock_session
+    ):
+        """Test that connect() uses verify_connectivity instead of a probe query."""
+        mock_driver.session = MagicMock(return_value=mock_session)
+        
+        with patch("src.services.neo4j_manager.AsyncGraphDatabase.driver", return_value=mock_driver):
+            await connection_manager.connect()
+        
+        mock_driver.verify_connectivity.assert_awaited_once()
+        mock_session.run.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_health_check_no_driver(self, connection_manager):
@@ -255,6 +352,19 @@ class TestNeo4jConnectionManager:
         
         mock_session.close.assert_called_once()
     
+    @pytest.mark.asyncio
+    async def test_session_closed_when_body_raises(self, connection_manager, mock_driver, mock_session):
+        """Test that the session is closed and the error propagates unchanged."""
+        mock_driver.session = MagicMock(return_value=mock_session)
+        connection_manager._driver = mock_driver
+        connection_manager._mark_connected()
+        
+        with pytest.raises(ValueError):
+            async with connection_manager.session():
+                raise ValueError("boom")
+        
+        mock_session.close.assert_awaited_once()
+    
     @pytest.mark.asyncio
     async def test_session_auto_connect(self, connection_manager, mock_driver, mock_session):
         """Test session auto-connects if not connected."""
@@ -272,6 +382,25 @@ class TestNeo4jConnectionManager:
         
         assert connection_manager.is_connected
     
+    @pytest.mark.asyncio
+    async def test_session_default_kwargs_not_mutated(self, connection_manager, mock_driver, mock_session):
+        """Test session merges the default database without mutating caller kwargs."""
+        mock_driver.session = MagicMock(return_value=mock_session)
+        connection_manager._driver = mock_driver
+        connection_manager._mark_connected()
+    
+        kwargs = {"fetch_size": 100}
+        async with connection_manager.session(**kwargs):
+            pass
+        async with connection_manager.session(database="other"):
+            pass
+    
+        assert kwargs == {"fetch_size": 100}
+        assert mock_driver.session.call_args_list == [
+            call(database="neo4j", fetch_size=100),
+            call(database="other"),
+        ]
+    
     @pytest.mark.asyncio
     async def test_execute_with_retry_success(self, connection_manager, mock_driver, mock_session):
         """Test successful query execution with retry logic."""
@@ -303,6 +432,52 @@ class TestNeo4jConnectionManager:
         assert result[0]["n"] == 1
         assert result[1]["n"] == 2
     
+    @pytest.mark.asyncio
+    async def test_execute_with_retry_normalizes_query_whitespace(
+        self, connection_manager, mock_driver, mock_session
+    ):
+        """Test that queries are sent with whitespace collapsed outside literals."""
+        mock_result = AsyncMock()
+        mock_result.data = AsyncMock(return_value=[])
+        mock_session.run = AsyncMock(return_value=mock_result)
+        mock_driver.session = MagicMock(return_value=mock_session)
+        connection_manager._driver = mock_driver
+        connection_manager._mark_connected()
+        
+        await connection_manager.execute_with_retry(
+            """
+            MATCH (n {name: 'two  spaces'})
+                RETURN n
+            """
+        )
+        
+        sent_query = mock_session.run.call_args.args[0]
+        assert sent_query == "MATCH (n {name: 'two  spaces'}) RETURN n"
+    
+    @pytest.mark.asyncio
+    async def test_execute_with_retry_strips_query_comments(
+        self, connection_manager, mock_driver, mock_session
+    ):
+        """Test that comments are dropped so they can't swallow joined lines."""
+        mock_result = AsyncMock()
+        mock_result.data = AsyncMock(return_value=[])
+        mock_session.run = AsyncMock(return_value=mock_result)
+        mock_driver.session = MagicMock(return_value=mock_session)
+        connection_manager._driver = mock_driver
+        connection_manager._mark_connected()
+        
+        await connection_manager.execute_with_retry(
+            """
+            MATCH (n {url: 'http://example.com'}) // find nodes
+            /* multi-line
+               comment */
+            RETURN n
+            """
+        )
+        
+        sent_query = mock_session.run.call_args.args[0]
+        assert sent_query == "MATCH (n {url: 'http://example.com'}) RETURN n"
+    
     @pytest.mark.asyncio
     async def test_execute_with_retry_transient_error(self, connection_manager, mock_driver, mock_session):
         """Test query retry on transient error."""
@@ -360,6 +535,73 @@ class TestNeo4jConnectionManager:
             
             assert "Query failed after 3 attempts" in str(exc_info.value) or "Transient error" in str(exc_info.value)
     
+    @pytest.mark.asyncio
+    async def test_execute_with_retry_reuses_shared_session(
+        self, connection_manager, mock_driver, mock_session
+    ):
+        """Test that reuse=True runs queries on one shared read session."""
+        mock_health_result = AsyncMock()
+        mock_health_result.single = AsyncMock(return_value={"health": 1})
+        mock_query_result = AsyncMock()
+        mock_query_result.data = AsyncMock(return_value=[{"n": 1}])
+        
+        async def run_side_effect(query, params=None):
+            if "RETURN 1 AS health" in query:
+                return mock_health_result
+            return mock_query_result
+        
+        mock_session.run = AsyncMock(side_effect=run_side_effect)
+        mock_driver.session = MagicMock(return_value=mock_session)
+        
+        with patch("src.services.neo4j_manager.AsyncGraphDatabase.driver", return_value=mock_driver):
+            await connection_manager.connect()
+            sessions_after_connect = mock_driver.session.call_count
+            for _ in range(3):
+                result = await connection_manager.execute_with_retry("MATCH (n) RETURN n", reuse=True)
+                assert result == [{"n": 1}]
+        
+        assert mock_driver.session.call_count == sessions_after_connect + 1
+        assert mock_driver.session.call_args.kwargs["default_access_mode"] == "READ"
+        
+        await connection_manager.close()
+        assert connection_manager._shared_read_session is None
+    
+    @pytest.mark.asyncio
+    async def test_stream_query_yields_records(self, connection_manager, mock_driver, mock_session):
+        """Test that stream_query yields records as they are pulled."""
+        mock_health_result = AsyncMock()
+        mock_health_result.single = AsyncMock(return_value={"health": 1})
+        
+        records = []
+        for value in (1, 2, 3):
+            record = MagicMock()
+            record.data.return_value = {"n": value}
+            records.append(record)
+        
+        class _Result:
+            def __aiter__(self):
+                return self._iterate()
+            
+            async def _iterate(self):
+                for record in records:
+                    yield record
+        
+        async def run_side_effect(query, params=None):
+            if "RETURN 1 AS health" in query:
+                return mock_health_result
+            return _Result()
+        
+        mock_session.run = AsyncMock(side_effect=run_side_effect)
+        mock_driver.session = MagicMock(return_value=mock_session)
+        
+        with patch("src.services.neo4j_manager.AsyncGraphDatabase.driver", return_value=mock_driver):
+            streamed = [
+                record async for record in connection_manager.stream_query("MATCH (n) RETURN n")
+            ]
+        
+        assert streamed == [{"n": 1}, {"n": 2}, {"n": 3}]
+        mock_session.close.assert_called()
+    
     @pytest.mark.asyncio
     async def test_execute_write_with_retry_success(self, connection_manager, mock_driver, mock_session):
         """Test successful write query execution."""
@@ -386,6 +628,40 @@ class TestNeo4jConnectionManager:
         assert len(result) == 1
         assert result[0]["created"] == 1
     
+    @pytest.mark.asyncio
+    async def test_execute_write_with_retry_reconnects_once(self, connection_manager, mock_driver, mock_session):
+        """Test that a lost connection triggers one reconnect and retry, not a retry loop."""
+        mock_health_result = AsyncMock()
+        mock_health_result.single = AsyncMock(return_value={"health": 1})
+        mock_session.run = AsyncMock(return_value=mock_health_result)
+        mock_session.execute_write = AsyncMock(
+            side_effect=[ServiceUnavailable("Connection lost"), [{"created": 1}]]
+        )
+        mock_driver.session = MagicMock(return_value=mock_session)
+        
+        with patch("src.services.neo4j_manager.AsyncGraphDatabase.driver", return_value=mock_driver):
+            result = await connection_manager.execute_write_with_retry("CREATE (n:Node) RETURN n")
+        
+        assert result == [{"created": 1}]
+        assert mock_session.execute_write.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_execute_write_with_retry_transient_error_not_rewrapped(
+        self, connection_manager, mock_driver, mock_session
+    ):
+        """Test that transient errors surfaced by the driver are not retried again."""
+        mock_health_result = AsyncMock()
+        mock_health_result.single = AsyncMock(return_value={"health": 1})
+        mock_session.run = AsyncMock(return_value=mock_health_result)
+        mock_session.execute_write = AsyncMock(side_effect=TransientError("Deadlock"))
+        mock_driver.session = MagicMock(return_value=mock_session)
+        
+        with patch("src.services.neo4j_manager.AsyncGraphDatabase.driver", return_value=mock_driver):
+            with pytest.raises(DatabaseQueryError, match="Write query failed after retries"):
+                await connection_manager.execute_write_with_retry("CREATE (n:Node) RETURN n")
+        
+        mock_session.execute_write.assert_called_once()
+    
     @pytest.mark.asyncio
     async def test_get_neo4j_manager_singleton(self):
         """Test global connection manager singleton."""
@@ -402,7 +678,7 @@ class TestNeo4jConnectionManager:
         """Test closing global connection manager."""
         manager = get_neo4j_manager()
         manager._driver = mock_driver
-        manager._is_connected = True
+        manager._mark_connected()
         
         await close_neo4j_manager()
         
@@ -411,6 +687,29 @@ class TestNeo4jConnectionManager:
         # Getting manager again should create a new instance
         new_manager = get_neo4j_manager()
         assert new_manager is not manager
+    
+    @pytest.mark.asyncio
+    async def test_tenant_manager_bound_to_current_context(self, mock_driver):
+        """Test that a tenant manager is reused per tenant and scoped to its context."""
+        global_manager = get_neo4j_manager()
+        
+        async def tenant_request():
+            manager = await set_neo4j_manager_for_tenant("bolt://tenant:7687", "tenant", "secret")
+            assert get_neo4j_manager() is manager
+            return manager
+        
+        with patch("src.services.neo4j_manager.AsyncGraphDatabase.driver", return_value=mock_driver) as factory:
+            # Each task runs in a copy of the current context, like a request
+            first = await asyncio.create_task(tenant_request())
+            second = await asyncio.create_task(tenant_request())
+        
+        assert first is second
+        assert first.uri == "bolt://tenant:7687"
+        factory.assert_called_once()
+        assert get_neo4j_manager() is global_manager
+        
+        await close_neo4j_manager()
+        mock_driver.close.assert_called_once()
 
 
 class TestEdgeCases:
@@ -439,8 +738,14 @@ class TestEdgeCases:
         
         with patch("src.services.neo4j_manager.AsyncGraphDatabase.driver", return_value=mock_driver):
             result = await connection_manager.execute_with_retry("MATCH (n) RETURN n")
+            await connection_manager.execute_with_retry("MATCH (n) RETURN n")
         
         assert result == []
+        # Omitted parameters share one empty dict rather than allocating per call
+        first_params = mock_session.run.call_args_list[0].args[1]
+        second_params = mock_session.run.call_args_list[1].args[1]
+        assert first_params == {}
+        assert first_params is second_params
     
     @pytest.mark.asyncio
     async def test_session_expired_reconnect(self, connection_manager, mock_driver, mock_session):
@@ -1,6 +1,12 @@
 """Unit tests for query service visualization helpers."""
 
-from src.services.query_service import QueryService, GraphFilters
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+from src.models.base import CodeEntity, DependencyNode, EntityType, Language
+from src.services.graph_service import GraphService
+from src.services.query_service import QueryService, GraphFilters, _build_dependency_tree
 
 
 class _DummyGraphService:
@@ -8,6 +14,12 @@ class _DummyGraphService:
         self.neo4j = None
 
 
+def _embedding_client(*embeddings):
+    client = MagicMock()
+    client.generate_query_embedding = AsyncMock(side_effect=list(embeddings))
+    return client
+
+
 def test_apply_limits_truncates_nodes_and_edges():
     service = QueryService(graph_service=_DummyGraphService(), vector_service=object(), cache_service=object())
     filters = GraphFilters(max_nodes=2, max_edges=1)
@@ -40,3 +52,348 @@ def test_node_to_viz_format_external_module_type():
 
     assert node["id"] == "external:react"
     assert node["type"] == "EXTERNAL_MODULE"
+
+
+def test_build_visualization_query_is_static_across_filters():
+    service = QueryService(graph_service=_DummyGraphService(), vector_service=object(), cache_service=object())
+
+    plain_query, plain_params = service._build_visualization_query("p1", GraphFilters())
+    filtered_query, filtered_params = service._build_visualization_query(
+        "p2",
+        GraphFilters(
+            entity_types=[EntityType.CLASS, EntityType.FUNCTION],
+            languages=["python"],
+            file_patterns=["src/"],
+        ),
+    )
+
+    assert plain_query == filtered_query
+    assert plain_params["entity_labels"] is None
+    assert plain_params["languages"] is None
+    assert plain_params["file_patterns"] is None
+    assert filtered_params["project_id"] == "p2"
+    assert filtered_params["node_limit"] == GraphFilters().max_nodes + 1
+    assert filtered_params["edge_limit"] == GraphFilters().max_edges + 1
+    assert filtered_params["entity_labels"] == ["Class", "Function"]
+    assert filtered_params["languages"] == ["python"]
+    assert filtered_params["file_patterns"] == ["src/"]
+
+
+async def test_semantic_search_fetches_entities_in_one_query():
+    neo4j = MagicMock()
+    neo4j.execute_with_retry = AsyncMock(return_value=[
+        {"e": {"id": "e2", "project_id": "p1", "name": "beta", "file_path": "b.py", "signature": "def beta()"}},
+        {"e": {"id": "e1", "project_id": "p1", "name": "alpha", "file_path": "a.py", "signature": "def alpha()"}},
+    ])
+    vector_service = MagicMock()
+    vector_service.semantic_search.return_value = [
+        {"id": "e1", "similarity": 0.9},
+        {"id": "e2", "similarity": 0.8},
+        {"id": "missing", "similarity": 0.7},
+    ]
+    service = QueryService(
+        graph_service=GraphService(neo4j),
+        vector_service=vector_service,
+        cache_service=object(),
+        gemini_client=_embedding_client([1.0, 0.0]),
+    )
+
+    results = await service.semantic_search("alpha", ["p1"], use_cache=False)
+
+    vector_service.semantic_search.assert_called_once_with(query_embedding=[1.0, 0.0], project_ids=["p1"], top_k=20)
+    assert [r.entity.id for r in results] == ["e1", "e2"]
+    assert results[0].snippet == "def alpha()"
+    neo4j.execute_with_retry.assert_awaited_once()
+    assert neo4j.execute_with_retry.call_args.args[1] == {
+        "entity_ids": ["e1", "e2", "missing"],
+        "project_id": "p1",
+    }
+
+
+async def test_semantic_search_merges_projects_by_similarity():
+    rows = {
+        "p1": [{"e": {"id": "a", "project_id": "p1", "name": "a", "file_path": "a.py"}}],
+        "p2": [{"e": {"id": "b", "project_id": "p2", "name": "b", "file_path": "b.py"}}],
+    }
+    neo4j = MagicMock()
+    neo4j.execute_with_retry = AsyncMock(side_effect=lambda query, params: rows[params["project_id"]])
+    hits = {
+        "p1": [{"id": "a", "similarity": 0.5}],
+        "p2": [{"id": "b", "similarity": 0.9}],
+    }
+    vector_service = MagicMock()
+    vector_service.semantic_search.side_effect = lambda query_embedding, project_ids, top_k: hits[project_ids[0]]
+    service = QueryService(
+        graph_service=GraphService(neo4j),
+        vector_service=vector_service,
+        cache_service=object(),
+        gemini_client=_embedding_client([1.0, 0.0]),
+    )
+
+    results = await service.semantic_search("q", ["p1", "p2", "p1"], top_k=1, use_cache=False)
+
+    assert [r.entity.id for r in results] == ["b"]
+    assert vector_service.semantic_search.call_count == 2
+    # p1's hit can't make the top 1, so its entities are never fetched
+    neo4j.execute_with_retry.assert_awaited_once()
+
+
+async def test_concurrent_cache_misses_share_one_load():
+    release = asyncio.Event()
+
+    async def find_callers(function_id, project_id):
+        await release.wait()
+        return []
+
+    graph_service = _DummyGraphService()
+    graph_service.find_callers = AsyncMock(side_effect=find_callers)
+    cache_service = MagicMock()
+    cache_service.build_callers_key.return_value = "query:callers:project:p1:function:f"
+    cache_service.get_raw = AsyncMock(return_value=None)
+    cache_service.set = AsyncMock(return_value=True)
+    cache_service.get_graph_versions = AsyncMock(return_value=(0,))
+    service = QueryService(graph_service=graph_service, vector_service=object(), cache_service=cache_service)
+
+    tasks = [asyncio.create_task(service.find_callers("f", "p1")) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert graph_service.find_callers.await_count == 1
+    assert all(result is results[0] for result in results)
+    cache_service.set.assert_awaited_once()
+    assert service._inflight == {}
+
+
+def test_build_dependency_tree_from_paths():
+    def dependency(path):
+        entity = CodeEntity(
+            id=path[-1],
+            project_id="p1",
+            entity_type=EntityType.FUNCTION,
+            name=path[-1],
+            file_path="main.py",
+            start_line=1,
+            end_line=2,
+            language=Language.PYTHON,
+        )
+        return DependencyNode(entity=entity, depth=len(path) - 1, path=path)
+
+    tree = _build_dependency_tree([
+        dependency(["root", "a"]),
+        dependency(["root", "b"]),
+        dependency(["root", "a", "c"]),
+        dependency(["root", "b", "c"]),
+        dependency(["root", "a", "c"]),
+    ])
+
+    assert tree == {"root": ["a", "b"], "a": ["c"], "b": ["c"]}
+
+
+async def test_get_graph_visualization_stats_counts_types():
+    service = QueryService(graph_service=_DummyGraphService(), vector_service=object(), cache_service=object())
+    nodes = [
+        {"id": "f1", "type": "FILE", "label": "a.py", "file_path": "a.py"},
+        {"id": "fn1", "type": "FUNCTION", "label": "run", "file_path": "a.py"},
+        {"id": "fn2", "type": "FUNCTION", "label": "stop", "file_path": "a.py"},
+        {"id": "ext", "type": "EXTERNAL_MODULE", "label": "os", "file_path": ""},
+    ]
+    edges = [
+        {"id": "1", "source": "fn1", "target": "fn2", "type": "CALLS"},
+        {"id": "2", "source": "f1", "target": "ext", "type": "IMPORTS"},
+        {"id": "3", "source": "fn2", "target": "fn1", "type": "CALLS"},
+    ]
+    service._get_symbol_graph = AsyncMock(return_value=(nodes, edges))
+    service._get_graph_coverage = AsyncMock(return_value={})
+
+    data = await service.get_graph_visualization("p1", GraphFilters(view_mode="symbol"))
+
+    assert data.stats["files"] == 1
+    assert data.stats["functions"] == 2
+    assert data.stats["classes"] == 0
+    assert data.stats["external_nodes"] == 1
+    assert data.stats["edge_types"] == {"CALLS": 2, "IMPORTS": 1}
+    assert data.coverage == {"entities_in_graph": 4, "relationships_in_graph": 3}
+    assert {id(n) for n in data.nodes} == {id(n) for n in nodes}
+
+
+async def test_semantic_search_hits_memory_tier_before_redis():
+    service = QueryService(graph_service=_DummyGraphService(), vector_service=object(), cache_service=MagicMock())
+    cached = [{
+        "entity": {
+            "id": "e1",
+            "project_id": "p1",
+            "entity_type": "function",
+            "name": "alpha",
+            "file_path": "a.py",
+            "start_line": 1,
+            "end_line": 2,
+            "language": "python",
+        },
+        "similarity": 0.9,
+        "file_path": "a.py",
+        "snippet": "def alpha()",
+    }]
+    service.cache_service.get_raw = AsyncMock(return_value=json.dumps(cached).encode())
+    service.cache_service.get_graph_versions = AsyncMock(return_value=(0, 0))
+
+    first = await service.semantic_search("alpha", ["p2", "p1"])
+    second = await service.semantic_search("alpha", ["p1", "p2"])
+
+    assert second[0] is first[0]
+    service.cache_service.get_raw.assert_awaited_once()
+
+    service.on_project_invalidated("p2")
+    await service.semantic_search("alpha", ["p1", "p2"])
+
+    assert service.cache_service.get_raw.await_count == 2
+
+
+async def test_prefetched_cache_values_skip_redis_get():
+    cache_service = MagicMock()
+    cache_service.build_callers_key.return_value = "query:callers:project:p1:function:f"
+    cache_service.get_raw = AsyncMock()
+    cache_service.get_graph_versions = AsyncMock(return_value=(0,))
+    service = QueryService(graph_service=_DummyGraphService(), vector_service=object(), cache_service=cache_service)
+    prefetched = {"query:callers:project:p1:function:f": b'{"entities": [], "count": 0, "query_time_ms": 1.0, "metadata": {}}'}
+
+    result = await service.find_callers("f", "p1", prefetched=prefetched)
+
+    assert result.count == 0
+    cache_service.get_raw.assert_not_awaited()
+
+
+async def test_function_queries_use_memory_tier_until_project_invalidated():
+    graph_service = _DummyGraphService()
+    graph_service.find_dependencies = AsyncMock(return_value=[])
+    cache_service = MagicMock()
+    cache_service.build_dependencies_key.return_value = "query:dependencies:project:p1:function:f"
+    cache_service.get_raw = AsyncMock(return_value=None)
+    cache_service.set = AsyncMock(return_value=True)
+    cache_service.get_graph_versions = AsyncMock(return_value=(0,))
+    service = QueryService(graph_service=graph_service, vector_service=object(), cache_service=cache_service)
+
+    first = await service.find_dependencies("f", "p1")
+    second = await service.find_dependencies("f", "p1")
+
+    assert second is first
+    assert graph_service.find_dependencies.await_count == 1
+    cache_service.get_raw.assert_awaited_once()
+
+    service.on_project_invalidated("p2")
+    assert await service.find_dependencies("f", "p1") is first
+
+    service.on_project_invalidated("p1")
+    await service.find_dependencies("f", "p1")
+    assert graph_service.find_dependencies.await_count == 2
+
+
+async def test_memory_tier_reloads_after_graph_version_changes_elsewhere():
+    graph_service = _DummyGraphService()
+    graph_service.find_dependencies = AsyncMock(return_value=[])
+    cache_service = MagicMock()
+    cache_service.build_dependencies_key.return_value = "query:dependencies:project:p1:function:f"
+    cache_service.get_raw = AsyncMock(return_value=None)
+    cache_service.set = AsyncMock(return_value=True)
+    cache_service.get_graph_versions = AsyncMock(return_value=(3,))
+    service = QueryService(graph_service=graph_service, vector_service=object(), cache_service=cache_service)
+
+    first = await service.find_dependencies("f", "p1")
+    assert await service.find_dependencies("f", "p1") is first
+
+    # Another process bumped p1's graph version without notifying this one
+    cache_service.get_graph_versions.return_value = (4,)
+    assert await service.find_dependencies("f", "p1") is not first
+    assert graph_service.find_dependencies.await_count == 2
+    cache_service.get_graph_versions.assert_awaited_with(("p1",))
+
+
+async def test_symbol_graph_fetches_nodes_and_edges_in_one_query():
+    neo4j = MagicMock()
+    neo4j.execute_with_retry = AsyncMock(return_value=[{
+        "nodes": [
+            {"node": {"id": "a", "name": "a", "file_path": "a.py"}, "labels": ["Function"]},
+            {"node": {"id": "b", "name": "b", "file_path": "a.py"}, "labels": ["Function"]},
+            {"node": {"id": "lonely", "name": "lonely", "file_path": "a.py"}, "labels": ["Function"]},
+        ],
+        "edges": [{
+            "source": {"id": "a", "name": "a", "file_path": "a.py"},
+            "source_labels": ["Function"],
+            "rel_type": "CALLS",
+            "target": {"id": "b", "name": "b", "file_path": "a.py"},
+            "target_labels": ["Function"],
+        }],
+    }])
+    graph_service = _DummyGraphService()
+    graph_service.neo4j = neo4j
+    service = QueryService(graph_service=graph_service, vector_service=object(), cache_service=object())
+
+    nodes, edges = await service._get_symbol_graph("p1", GraphFilters(view_mode="symbol", include_isolated=False))
+
+    neo4j.execute_with_retry.assert_awaited_once()
+    assert [n["id"] for n in nodes] == ["a", "b"]
+    assert [(e["source"], e["target"], e["type"]) for e in edges] == [("a", "b", "CALLS")]
+
+
+async def test_paraphrased_search_served_from_semantic_cache():
+    from types import SimpleNamespace
+
+    from src.services.cache_service import CacheService
+
+    neo4j = MagicMock()
+    neo4j.execute_with_retry = AsyncMock(return_value=[
+        {"e": {"id": "e1", "project_id": "p1", "name": "alpha", "file_path": "a.py"}},
+    ])
+    vector_service = MagicMock()
+    vector_service.semantic_search.return_value = [{"id": "e1", "similarity": 0.9}]
+    async_client = MagicMock()
+    async_client.get = AsyncMock(return_value=None)
+    async_client.mget = AsyncMock(return_value=[None])
+    async_client.setex = AsyncMock()
+    cache_service = CacheService(connection_manager=SimpleNamespace(client=MagicMock(), async_client=async_client))
+    service = QueryService(
+        graph_service=GraphService(neo4j),
+        vector_service=vector_service,
+        cache_service=cache_service,
+        gemini_client=_embedding_client([1.0, 0.0], [0.99, 0.05], [0.0, 1.0], [0.99, 0.05]),
+    )
+
+    first = await service.semantic_search("what calls alpha", ["p1"])
+    paraphrase = await service.semantic_search("which functions call alpha", ["p1"])
+
+    assert [r.entity.id for r in paraphrase] == [r.entity.id for r in first]
+    assert vector_service.semantic_search.call_count == 1
+    # A result computed for another query isn't cached under the paraphrase
+    assert async_client.setex.await_count == 1
+
+    await service.semantic_search("something else entirely", ["p1"])
+    assert vector_service.semantic_search.call_count == 2
+
+    # Another process re-ingested p1, so the paraphrase is searched again
+    async_client.mget = AsyncMock(return_value=[b"1"])
+    await service.semantic_search("which functions call alpha", ["p1"])
+    assert vector_service.semantic_search.call_count == 3
+
+
+async def test_semantic_search_resolves_more_hits_when_entities_are_missing():
+    neo4j = MagicMock()
+    neo4j.execute_with_retry = AsyncMock(side_effect=[
+        [],
+        [{"e": {"id": "c", "project_id": "p1", "name": "c", "file_path": "c.py"}}],
+    ])
+    vector_service = MagicMock()
+    vector_service.semantic_search.return_value = [
+        {"id": "a", "similarity": 0.9},
+        {"id": "c", "similarity": 0.5},
+    ]
+    service = QueryService(
+        graph_service=GraphService(neo4j),
+        vector_service=vector_service,
+        cache_service=object(),
+        gemini_client=_embedding_client([1.0, 0.0]),
+    )
+
+    results = await service.semantic_search("q", ["p1"], top_k=1, use_cache=False)
+
+    assert [r.entity.id for r in results] == ["c"]
+    assert [call.args[1]["entity_ids"] for call in neo4j.execute_with_retry.call_args_list] == [["a"], ["c"]]
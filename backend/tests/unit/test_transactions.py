@@ -60,7 +60,7 @@ def neo4j_manager(mock_driver, mock_session):
     """Create a Neo4j manager with mocked driver."""
     manager = Neo4jConnectionManager()
     manager._driver = mock_driver
-    manager._is_connected = True
+    manager._mark_connected()
     
     # Mock session creation
     mock_driver.session.return_value = mock_session
@@ -152,7 +152,10 @@ class TestAtomicWriteOperations:
     @pytest.mark.asyncio
     async def test_execute_atomic_write_success(self, neo4j_manager, mock_session, mock_transaction):
         """Test successful atomic write with multiple operations."""
-        mock_session.begin_transaction.return_value = mock_transaction
+        async def execute_write(work):
+            return await work(mock_transaction)
+        
+        mock_session.execute_write.side_effect = execute_write
         
         # Mock results for each operation
         mock_result1 = MagicMock()
@@ -170,7 +173,7 @@ class TestAtomicWriteOperations:
             ("MATCH (n {id: $id1}), (m {id: $id2}) CREATE (n)-[:RELATES]->(m)", {"id1": "1", "id2": "2"}),
         ]
         
-        results = await neo4j_manager.execute_atomic_write(operations)
+        results = await neo4j_manager.execute_atomic_write(operations, collect_results=True)
         
         # Verify all operations were executed
         assert len(results) == 3
@@ -178,18 +181,21 @@ class TestAtomicWriteOperations:
         assert results[1] == [{"id": "2"}]
         assert results[2] == [{"count": 1}]
         
-        # Verify transaction was committed
-        mock_transaction.commit.assert_called_once()
-        mock_transaction.rollback.assert_not_called()
+        # Verify all operations ran in one managed write transaction
+        mock_session.execute_write.assert_called_once()
+        assert mock_transaction.run.call_count == 3
     
     @pytest.mark.asyncio
     async def test_execute_atomic_write_rollback_on_failure(self, neo4j_manager, mock_session, mock_transaction):
         """Test that atomic write rolls back all operations on failure."""
-        mock_session.begin_transaction.return_value = mock_transaction
+        async def execute_write(work):
+            return await work(mock_transaction)
+        
+        mock_session.execute_write.side_effect = execute_write
         
         # First operation succeeds, second fails
         mock_result1 = MagicMock()
-        mock_result1.data = AsyncMock(return_value=[{"id": "1"}])
+        mock_result1.consume = AsyncMock(return_value=MagicMock())
         mock_transaction.run.side_effect = [
             mock_result1,
             Exception("Second operation failed")
@@ -203,9 +209,115 @@ class TestAtomicWriteOperations:
         with pytest.raises(DatabaseQueryError, match="Atomic write operation failed"):
             await neo4j_manager.execute_atomic_write(operations)
         
-        # Verify rollback was called
-        mock_transaction.rollback.assert_called_once()
-        mock_transaction.commit.assert_not_called()
+        # The failure escapes the managed transaction, which rolls it back
+        mock_session.execute_write.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_execute_atomic_write_batches_identical_queries(
+        self, neo4j_manager, mock_session, mock_transaction
+    ):
+        """Test that consecutive operations sharing a query run as one UNWIND batch."""
+        async def execute_write(work):
+            return await work(mock_transaction)
+        
+        mock_session.execute_write.side_effect = execute_write
+        
+        batched_result = MagicMock()
+        batched_result.data = AsyncMock(return_value=[
+            {"_batch_index": 0, "_batch_row": {"id": "1"}, "id": "1"},
+            {"_batch_index": 2, "_batch_row": {"id": "3"}, "id": "3"},
+        ])
+        single_result = MagicMock()
+        single_result.data = AsyncMock(return_value=[{"count": 1}])
+        mock_transaction.run.side_effect = [batched_result, single_result]
+        
+        create = "CREATE (n:Node {id: $id}) RETURN n.id AS id"
+        operations = [
+            (create, {"id": "1"}),
+            (create, {"id": "2"}),
+            (create, {"id": "3"}),
+            ("MATCH (n {id: $id}) RETURN count(n) AS count", {"id": "1"}),
+        ]
+        
+        results = await neo4j_manager.execute_atomic_write(operations, collect_results=True)
+        
+        assert results == [[{"id": "1"}], [], [{"id": "3"}], [{"count": 1}]]
+        assert mock_transaction.run.call_count == 2
+        batched_query, batched_params = mock_transaction.run.call_args_list[0][0]
+        assert "UNWIND range(0, size($_batch_rows) - 1)" in batched_query
+        assert "{id: _batch_row.id}" in batched_query
+        assert batched_params == {"_batch_rows": [{"id": "1"}, {"id": "2"}, {"id": "3"}]}
+    
+    @pytest.mark.asyncio
+    async def test_execute_atomic_write_independent_operations_grouped(
+        self, neo4j_manager, mock_session, mock_transaction
+    ):
+        """Test that sequential=False batches matching queries wherever they appear."""
+        async def execute_write(work):
+            return await work(mock_transaction)
+        
+        mock_session.execute_write.side_effect = execute_write
+        
+        batched_result = MagicMock()
+        batched_result.data = AsyncMock(return_value=[
+            {"_batch_index": 0, "_batch_row": {"id": "1"}, "id": "1"},
+            {"_batch_index": 1, "_batch_row": {"id": "2"}, "id": "2"},
+        ])
+        single_result = MagicMock()
+        single_result.data = AsyncMock(return_value=[{"name": "x"}])
+        mock_transaction.run.side_effect = [batched_result, single_result]
+        
+        create = "CREATE (n:Node {id: $id}) RETURN n.id AS id"
+        other = "CREATE (n:Other {name: $name}) RETURN n.name AS name"
+        operations = [
+            (create, {"id": "1"}),
+            (other, {"name": "x"}),
+            (create, {"id": "2"}),
+        ]
+        
+        results = await neo4j_manager.execute_atomic_write(
+            operations, collect_results=True, sequential=False
+        )
+        
+        assert results == [[{"id": "1"}], [{"name": "x"}], [{"id": "2"}]]
+        assert mock_transaction.run.call_count == 2
+        _, batched_params = mock_transaction.run.call_args_list[0][0]
+        assert batched_params == {"_batch_rows": [{"id": "1"}, {"id": "2"}]}
+    
+    @pytest.mark.asyncio
+    async def test_execute_atomic_write_returns_counters_by_default(
+        self, neo4j_manager, mock_session, mock_transaction
+    ):
+        """Test that results are consumed for their summary counters by default."""
+        async def execute_write(work):
+            return await work(mock_transaction)
+        
+        mock_session.execute_write.side_effect = execute_write
+        
+        summary = MagicMock()
+        summary.counters.nodes_created = 2
+        summary.counters.nodes_deleted = 0
+        summary.counters.relationships_created = 0
+        summary.counters.relationships_deleted = 0
+        summary.counters.properties_set = 4
+        mock_result = MagicMock()
+        mock_result.consume = AsyncMock(return_value=summary)
+        mock_result.data = AsyncMock()
+        mock_transaction.run.return_value = mock_result
+        
+        create = "CREATE (n:Node {id: $id})"
+        results = await neo4j_manager.execute_atomic_write(
+            [(create, {"id": "1"}), (create, {"id": "2"})]
+        )
+        
+        assert results == [{
+            "nodes_created": 2,
+            "nodes_deleted": 0,
+            "relationships_created": 0,
+            "relationships_deleted": 0,
+            "properties_set": 4,
+        }]
+        mock_result.data.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_execute_atomic_write_empty_operations(self, neo4j_manager):
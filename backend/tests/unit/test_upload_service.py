@@ -0,0 +1,340 @@
+"""Unit tests for upload session storage."""
+
+import io
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import redis
+
+from src.models.base import UploadSession
+from src.services import upload_service as upload_module
+from src.services.upload_service import UploadService
+from src.utils.errors import FileSizeExceededError
+
+
+def _session(**overrides):
+    fields = dict(
+        session_id="session_abc",
+        project_id="proj_abc",
+        status="pending",
+        total_files=3,
+        created_at=datetime(2024, 1, 2, 3, 4, 5, 678901),
+        updated_at=datetime(2024, 1, 2, 3, 4, 5, 678901),
+    )
+    fields.update(overrides)
+    return UploadSession(**fields)
+
+
+def _offline_redis():
+    client = MagicMock()
+    client.pipeline.side_effect = redis.ConnectionError("down")
+    client.exists.side_effect = redis.ConnectionError("down")
+    return client
+
+
+def _as_redis_strings(mapping):
+    return {
+        field: value.decode() if isinstance(value, bytes) else str(value)
+        for field, value in mapping.items()
+    }
+
+
+def test_session_round_trips_through_redis_hash():
+    client = MagicMock()
+    pipe = client.pipeline.return_value
+    service = UploadService(redis_client=client)
+    session = _session(errors=["bad file"], statistics={"file_count": 3})
+
+    service._save_session(session)
+
+    mapping = pipe.hset.call_args.kwargs["mapping"]
+    pipe.hset.assert_called_once_with("session:session_abc", mapping=mapping)
+    pipe.rpush.assert_called_once_with("session:session_abc:errors", "bad file")
+    pipe.expire.assert_any_call("session:session_abc", upload_module.settings.upload_session_ttl)
+
+    pipe.execute.return_value = [_as_redis_strings(mapping), ["bad file"]]
+    assert service._load_session("session_abc") == session
+
+
+def test_update_session_status_writes_only_changed_fields():
+    client = MagicMock()
+    client.exists.return_value = 1
+    pipe = client.pipeline.return_value
+    service = UploadService(redis_client=client)
+
+    service.update_session_status("session_abc", progress=0.5, errors=["second"])
+    service._flush_session_update("session_abc")
+
+    mapping = pipe.hset.call_args.kwargs["mapping"]
+    assert set(mapping) == {"progress", "updated_at"}
+    assert mapping["progress"] == 0.5
+    pipe.rpush.assert_called_once_with("session:session_abc:errors", "second")
+
+
+def test_update_session_status_coalesces_until_terminal_status():
+    client = MagicMock()
+    client.exists.return_value = 1
+    pipe = client.pipeline.return_value
+    service = UploadService(redis_client=client)
+
+    service.update_session_status("session_abc", progress=0.3, errors=["first"])
+    service.update_session_status("session_abc", progress=0.6, files_processed=4, errors=["second"])
+
+    pipe.hset.assert_not_called()
+    assert "session_abc" in service._flush_timers
+
+    service.update_session_status("session_abc", status="completed", progress=1.0)
+
+    mapping = pipe.hset.call_args.kwargs["mapping"]
+    assert mapping["status"] == "completed"
+    assert mapping["progress"] == 1.0
+    assert mapping["files_processed"] == 4
+    pipe.hset.assert_called_once()
+    pipe.rpush.assert_called_once_with("session:session_abc:errors", "first", "second")
+    assert service._flush_timers == {}
+    assert service._pending_updates == {}
+
+
+def test_session_falls_back_to_file_storage_without_redis(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_module, "SESSION_STORAGE_DIR", tmp_path)
+    service = UploadService(redis_client=_offline_redis())
+
+    service._save_session(_session(errors=["bad file"], statistics={"file_count": 3}))
+
+    assert service._load_session("session_abc") == _session(errors=["bad file"], statistics={"file_count": 3})
+    assert service._load_session("session_missing") is None
+    assert [path.name for path in tmp_path.iterdir()] == ["session_abc.json"]
+
+
+def test_update_session_status_applies_changes_in_file_storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_module, "SESSION_STORAGE_DIR", tmp_path)
+    service = UploadService(redis_client=_offline_redis())
+    service._save_session(_session(errors=["first"]))
+
+    service.update_session_status("session_abc", status="processing", progress=0.5, errors=["second"])
+
+    session = service.get_upload_status("session_abc")
+    assert session.status == "processing"
+    assert session.progress == 0.5
+    assert session.errors == ["first", "second"]
+    assert session.updated_at > session.created_at
+
+
+def test_upload_project_spools_files_for_processing(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_module, "SESSION_STORAGE_DIR", tmp_path)
+    monkeypatch.setattr(upload_module.settings, "upload_temp_dir", str(tmp_path / "spool"))
+    service = UploadService(redis_client=_offline_redis())
+    service._dispatch_processing_task = MagicMock()
+    upload = SimpleNamespace(filename="src/main.py", file=io.BytesIO(b"print('ok')\n"))
+
+    session = service.upload_project("Demo", [upload], "user_1")
+
+    kwargs = service._dispatch_processing_task.call_args.kwargs
+    assert re.fullmatch(r"session_[0-9a-f]{12}", session.session_id)
+    assert re.fullmatch(r"proj_[0-9a-f]{12}", session.project_id)
+    assert session.created_at == session.updated_at
+    assert kwargs["session_id"] == session.session_id
+    assert kwargs["spooled"] is True
+    [(filename, spool_path)] = kwargs["file_data"]
+    assert filename == "src/main.py"
+    assert Path(spool_path).parent == tmp_path / "spool"
+    assert Path(spool_path).read_bytes() == b"print('ok')\n"
+
+
+def test_github_import_uses_partial_sparse_clone(monkeypatch):
+    run = MagicMock(return_value=SimpleNamespace(returncode=0, stderr=""))
+    monkeypatch.setattr(upload_module.subprocess, "run", run)
+    service = UploadService(redis_client=MagicMock())
+    service._github_executor = SimpleNamespace(submit=lambda fn: fn())
+    service.update_session_status = MagicMock()
+    service._collect_repository_files = MagicMock(return_value=[("src/main.py", "print('ok')")])
+    service._dispatch_processing_task = MagicMock()
+
+    service._start_github_processing(
+        "session_abc", "proj_abc", "Demo", "https://github.com/owner/repo", "user_1", "main"
+    )
+
+    clone_cmd, sparse_cmd, checkout_cmd = [call.args[0] for call in run.call_args_list]
+    assert clone_cmd[:2] == ["git", "clone"]
+    assert "--filter=blob:none" in clone_cmd and "--no-checkout" in clone_cmd
+    assert sparse_cmd[3:6] == ["sparse-checkout", "set", "--no-cone"]
+    assert "*.py" in sparse_cmd
+    assert checkout_cmd[3:] == ["checkout"]
+    service._dispatch_processing_task.assert_called_once()
+
+
+def test_collect_repository_files_reads_supported_sources(tmp_path, monkeypatch):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "b.py").write_text("b = 1", encoding="utf-8")
+    (tmp_path / "src" / "a.ts").write_text("export const a = 1", encoding="utf-8")
+    (tmp_path / "src" / "binary.py").write_bytes(b"\xff\xfe\x00")
+    (tmp_path / "README.md").write_text("docs", encoding="utf-8")
+    (tmp_path / "node_modules" / "dep").mkdir(parents=True)
+    (tmp_path / "node_modules" / "dep" / "index.js").write_text("x", encoding="utf-8")
+    service = UploadService(redis_client=MagicMock())
+
+    collected = service._collect_repository_files(tmp_path)
+
+    assert sorted(collected) == [("src/a.ts", "export const a = 1"), ("src/b.py", "b = 1")]
+
+    monkeypatch.setattr(upload_module.settings, "max_files_per_project", 1)
+    with pytest.raises(FileSizeExceededError):
+        service._collect_repository_files(tmp_path)
+
+
+def test_supported_source_filter_matches_language_detector():
+    service = UploadService(redis_client=MagicMock())
+    paths = ["src/a.py", "src/B.TSX", "lib/x.b.java", ".py", "docs/.js", "a.pyc", "package.json", "dir.py/x", ""]
+
+    assert [service._is_supported_source_file(path) for path in paths] == [
+        upload_module.LanguageDetector.is_supported(path) for path in paths
+    ]
+
+
+def test_file_session_load_reuses_cache_until_file_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_module, "SESSION_STORAGE_DIR", tmp_path)
+    service = UploadService(redis_client=_offline_redis())
+    service._save_session(_session())
+    loads = MagicMock(wraps=UploadSession.model_validate_json)
+    monkeypatch.setattr(UploadSession, "model_validate_json", loads)
+
+    first = service._load_session("session_abc")
+    first.status = "mutated"
+    second = service._load_session("session_abc")
+
+    assert second.status == "pending"
+    loads.assert_not_called()
+
+    session_file = tmp_path / "session_abc.json"
+    session_file.write_bytes(session_file.read_bytes().replace(b'"pending"', b'"failed"'))
+    os.utime(session_file, ns=(0, session_file.stat().st_mtime_ns + 1))
+
+    assert service._load_session("session_abc").status == "failed"
+    loads.assert_called_once()
+
+
+def test_celery_worker_ping_is_cached(monkeypatch):
+    inspect = MagicMock()
+    inspect.return_value.ping.return_value = {"worker@host": {"ok": "pong"}}
+    monkeypatch.setattr(upload_module.celery_app.control, "inspect", inspect)
+    service = UploadService(redis_client=MagicMock())
+
+    assert service._has_active_celery_workers() is True
+    assert service._has_active_celery_workers() is True
+    inspect.assert_called_once()
+
+    service._remember_worker_status(False)
+    assert service._has_active_celery_workers() is False
+    inspect.assert_called_once()
+
+    service._workers_checked_until = 0.0
+    assert service._has_active_celery_workers() is True
+    assert inspect.call_count == 2
+
+
+def test_upload_project_cleans_up_spool_and_fails_session_on_copy_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_module, "SESSION_STORAGE_DIR", tmp_path)
+    spool_dir = tmp_path / "spool"
+    monkeypatch.setattr(upload_module.settings, "upload_temp_dir", str(spool_dir))
+    service = UploadService(redis_client=_offline_redis())
+    service._dispatch_processing_task = MagicMock()
+    service.update_session_status = MagicMock()
+    broken = MagicMock()
+    broken.read.side_effect = OSError("client disconnected")
+    broken.fileno.side_effect = io.UnsupportedOperation
+    uploads = [
+        SimpleNamespace(filename="src/a.py", file=io.BytesIO(b"a = 1\n")),
+        SimpleNamespace(filename="src/b.py", file=broken),
+    ]
+
+    with pytest.raises(OSError, match="client disconnected"):
+        service.upload_project("Demo", uploads, "user_1")
+
+    assert list(spool_dir.iterdir()) == []
+    service._dispatch_processing_task.assert_not_called()
+    assert service.update_session_status.call_args.kwargs["status"] == "failed"
+
+
+def test_celery_dispatch_spools_in_memory_file_contents(tmp_path, monkeypatch):
+    from src.tasks import upload_tasks
+
+    monkeypatch.setattr(upload_module.settings, "upload_temp_dir", str(tmp_path))
+    delay = MagicMock()
+    monkeypatch.setattr(upload_tasks.process_project_upload, "delay", delay)
+    service = UploadService(redis_client=MagicMock())
+    service._remember_worker_status(True)
+
+    service._dispatch_processing_task(
+        "session_abc", "proj_abc", "Demo", [("src/main.py", "print('ok')")], "user_1"
+    )
+
+    kwargs = delay.call_args.kwargs
+    assert kwargs["spooled"] is True
+    [(filename, spool_path)] = kwargs["files"]
+    assert filename == "src/main.py"
+    assert Path(spool_path).read_text(encoding="utf-8") == "print('ok')"
+
+
+def test_spool_file_contents_removes_partial_spool_on_failure(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_module.settings, "upload_temp_dir", str(tmp_path))
+    service = UploadService(redis_client=MagicMock())
+
+    # A lone surrogate cannot be UTF-8 encoded, so the second file fails
+    with pytest.raises(UnicodeEncodeError):
+        service._spool_file_contents([("a.py", "x = 1"), ("b.py", "\ud800")])
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_local_processing_runs_on_shared_background_loop(monkeypatch):
+    from src.tasks import upload_tasks
+
+    process = AsyncMock(side_effect=[None, RuntimeError("boom")])
+    monkeypatch.setattr(upload_tasks, "_process_project_upload_async", process)
+    service = UploadService(redis_client=MagicMock())
+    service.update_session_status = MagicMock()
+
+    service._start_local_processing("session_a", "proj_a", "Demo", [], "user_1").result(timeout=5)
+    loop = service._background_loop
+    service._start_local_processing("session_b", "proj_b", "Demo", [], "user_1").result(timeout=5)
+
+    assert service._background_loop is loop
+    assert process.await_count == 2
+    service.update_session_status.assert_called_once_with(
+        session_id="session_b", status="failed", errors=["Processing failed: boom"]
+    )
+
+
+def test_copy_to_spool_handles_file_backed_and_in_memory_uploads(tmp_path):
+    payload = b"x = 1\n" * 50000
+    file_backed = tmp_path / "upload"
+    file_backed.write_bytes(payload)
+
+    for index, source in enumerate([open(file_backed, "rb"), io.BytesIO(payload)]):
+        with source, open(tmp_path / f"spool_{index}", "wb") as spool_file:
+            upload_module._copy_to_spool(source, spool_file)
+
+        assert (tmp_path / f"spool_{index}").read_bytes() == payload
+
+
+def test_copy_to_spool_keeps_small_spooled_uploads_in_memory(tmp_path):
+    import tempfile
+
+    payload = b"x = 1\n" * 100
+    for index, max_size in enumerate([len(payload) * 2, 1]):
+        source = tempfile.SpooledTemporaryFile(max_size=max_size)
+        source.write(payload)
+        source.seek(0)
+        rolled = source._rolled
+
+        with source, open(tmp_path / f"spool_{index}", "wb") as spool_file:
+            upload_module._copy_to_spool(source, spool_file)
+            # Copying must not force an in-memory upload onto disk
+            assert source._rolled is rolled
+
+        assert (tmp_path / f"spool_{index}").read_bytes() == payload
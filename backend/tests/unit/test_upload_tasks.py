@@ -97,12 +97,15 @@ def _setup_upload_task_mocks(monkeypatch, create_project_side_effect=None):
 
     vector_service = MagicMock()
     vector_service.store_embedding = MagicMock()
-    monkeypatch.setattr(upload_tasks, "VectorService", lambda: vector_service)
+    monkeypatch.setattr(upload_tasks, "get_vector_service", lambda: vector_service)
 
     gemini_client = MagicMock()
     gemini_client.generate_code_embedding = AsyncMock(return_value=[0.1])
     monkeypatch.setattr(upload_tasks, "GeminiClient", lambda: gemini_client)
 
+    cache_service = MagicMock()
+    monkeypatch.setattr(upload_tasks, "get_cache_service", lambda: cache_service)
+
     manager_instance = MagicMock()
     manager_instance.close = AsyncMock()
     manager_ctor = MagicMock(return_value=manager_instance)
@@ -114,6 +117,8 @@ def _setup_upload_task_mocks(monkeypatch, create_project_side_effect=None):
     return {
         "upload_service": upload_service,
         "graph_service": graph_service,
+        "vector_service": vector_service,
+        "cache_service": cache_service,
         "manager_instance": manager_instance,
         "manager_ctor": manager_ctor,
     }
@@ -163,3 +168,49 @@ async def test_upload_task_closes_neo4j_manager_on_exception(monkeypatch):
         )
 
     mocks["manager_instance"].close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_upload_task_reads_and_removes_spooled_files(monkeypatch, tmp_path):
+    mocks = _setup_upload_task_mocks(monkeypatch)
+    parser_instance = upload_tasks.CodeParserService()
+    spool_path = tmp_path / "upload"
+    spool_path.write_text("print('ok')", encoding="utf-8")
+
+    await upload_tasks._process_project_upload_async(
+        session_id="session_1",
+        project_id="proj_1",
+        project_name="Demo",
+        files=[("src/main.py", str(spool_path))],
+        user_id="user_1",
+        spooled=True,
+    )
+
+    parser_instance.parse_file.assert_called_once_with("src/main.py", "print('ok')", project_id="proj_1")
+    assert not spool_path.exists()
+    mocks["manager_instance"].close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_upload_task_bumps_graph_version_after_storing_embeddings(monkeypatch):
+    mocks = _setup_upload_task_mocks(monkeypatch)
+    parser_instance = upload_tasks.CodeParserService()
+    parser_instance.language_detector.detect_language.return_value = Language.PYTHON
+    parser_instance.build_entity_id.return_value = "proj_1_file_main"
+    calls = []
+    mocks["vector_service"].store_embedding.side_effect = lambda **kwargs: calls.append("store")
+    mocks["cache_service"].bump_graph_version.side_effect = lambda project_id: calls.append("bump")
+
+    await upload_tasks._process_project_upload_async(
+        session_id="session_1",
+        project_id="proj_1",
+        project_name="Demo",
+        files=[("src/main.py", "print('ok')")],
+        user_id="user_1",
+    )
+
+    # Once after the Neo4j write and once more after the Chroma store, so
+    # searches cached mid-ingestion don't outlive it
+    assert calls[0] == "bump"
+    assert "store" in calls
+    assert calls[-1] == "bump"
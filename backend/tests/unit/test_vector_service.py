@@ -12,6 +12,8 @@ import pytest
 from typing import List, Dict, Any
 from unittest.mock import Mock, MagicMock, patch
 
+from cachetools import LRUCache
+
 from src.services.vector_service import VectorService
 from src.utils.errors import DatabaseConnectionError, DatabaseQueryError
 
@@ -248,6 +250,7 @@ class TestSemanticSearch:
         assert len(results) == 1
         assert results[0]["id"] == "func_1"
         assert results[0]["similarity"] >= 0.7
+        assert type(results[0]["similarity"]) is float
     
     def test_semantic_search_multiple_projects(
         self, vector_service, sample_embedding
@@ -285,6 +288,52 @@ class TestSemanticSearch:
         assert results[0]["id"] == "func_2"  # More similar (0.95)
         assert results[1]["id"] == "func_1"  # Less similar (0.9)
     
+    def test_semantic_search_queries_projects_concurrently(
+        self, vector_service, sample_embedding
+    ):
+        """Test semantic search fans out across projects and skips missing ones."""
+        collections = {
+            f"project_proj_{i}_embeddings": Mock(query=Mock(return_value={
+                "ids": [[f"func_{i}"]],
+                "distances": [[0.1 * i]],
+                "metadatas": [[{"name": f"func{i}"}]]
+            }))
+            for i in range(4)
+        }
+        vector_service.chroma_manager.collection_exists = Mock(
+            side_effect=lambda name: name != "project_proj_2_embeddings"
+        )
+        vector_service.chroma_manager.get_collection = Mock(side_effect=collections.__getitem__)
+        
+        results = vector_service.semantic_search(
+            query_embedding=sample_embedding,
+            project_ids=[f"proj_{i}" for i in range(4)],
+            top_k=20,
+            similarity_threshold=0.0
+        )
+        
+        assert [r["id"] for r in results] == ["func_0", "func_1", "func_3"]
+        assert vector_service.chroma_manager.get_collection.call_count == 3
+    
+    def test_semantic_search_propagates_project_query_errors(
+        self, vector_service, sample_embedding
+    ):
+        """Test a failing project query fails the whole multi-project search."""
+        from chromadb.errors import ChromaError
+        
+        vector_service.chroma_manager.collection_exists = Mock(return_value=True)
+        vector_service.chroma_manager.get_collection = Mock(
+            side_effect=ChromaError("Query failed")
+        )
+        
+        with pytest.raises(DatabaseQueryError, match="Failed to perform semantic search"):
+            vector_service.semantic_search(
+                query_embedding=sample_embedding,
+                project_ids=["proj_1", "proj_2"],
+                top_k=20,
+                similarity_threshold=0.7
+            )
+    
     def test_semantic_search_limits_to_top_k(
         self, vector_service, mock_collection, sample_embedding
     ):
@@ -306,8 +355,8 @@ class TestSemanticSearch:
             similarity_threshold=0.0
         )
         
-        # Should only return top 5
-        assert len(results) == 5
+        # Should only return top 5, most similar first
+        assert [r["id"] for r in results] == [f"func_{i}" for i in range(5)]
     
     def test_semantic_search_empty_project_ids(
         self, vector_service, sample_embedding
@@ -357,6 +406,190 @@ class TestSemanticSearch:
             )
 
 
+class TestStaleCollectionHandles:
+    """Tests for cached handles of collections deleted by another process."""
+    
+    def test_semantic_search_reopens_deleted_collection(
+        self, vector_service, mock_collection
+    ):
+        """Test a dead cached handle is dropped and the query retried once."""
+        from chromadb.errors import InvalidCollectionException
+        
+        dead_collection = Mock()
+        dead_collection.query = Mock(side_effect=InvalidCollectionException("gone"))
+        mock_collection.query = Mock(return_value={
+            "ids": [["func_1"]],
+            "distances": [[0.1]],
+            "metadatas": [[{"name": "func1"}]]
+        })
+        vector_service._collection_cache["proj_123"] = dead_collection
+        vector_service.chroma_manager.collection_exists = Mock(return_value=True)
+        vector_service.chroma_manager.get_collection = Mock(return_value=mock_collection)
+        
+        results = vector_service.semantic_search([0.1, 0.2], ["proj_123"])
+        
+        assert [r["id"] for r in results] == ["func_1"]
+        assert vector_service._collection_cache["proj_123"] is mock_collection
+    
+    def test_semantic_search_skips_project_deleted_elsewhere(self, vector_service):
+        """Test a project whose collection is gone for good is skipped."""
+        from chromadb.errors import InvalidCollectionException
+        
+        dead_collection = Mock()
+        dead_collection.query = Mock(side_effect=InvalidCollectionException("gone"))
+        vector_service._collection_cache["proj_123"] = dead_collection
+        vector_service.chroma_manager.collection_exists = Mock(return_value=False)
+        
+        assert vector_service.semantic_search([0.1, 0.2], ["proj_123"]) == []
+        assert "proj_123" not in vector_service._collection_cache
+    
+    def test_store_embedding_recreates_deleted_collection(
+        self, vector_service, mock_collection, sample_metadata
+    ):
+        """Test storing through a dead handle recreates the collection."""
+        from chromadb.errors import InvalidCollectionException
+        
+        dead_collection = Mock()
+        dead_collection.add = Mock(side_effect=InvalidCollectionException("gone"))
+        vector_service._collection_cache[sample_metadata["project_id"]] = dead_collection
+        vector_service.chroma_manager.create_collection = Mock(return_value=mock_collection)
+        
+        vector_service.store_embedding("func_123", [0.1, 0.2], sample_metadata)
+        
+        mock_collection.add.assert_called_once()
+
+
+class TestInProcessSearch:
+    """Tests for in-process search of small projects."""
+    
+    @pytest.fixture
+    def in_process_service(self, mock_chroma_manager, mock_collection):
+        """Create a Vector Service that searches small projects in-process."""
+        cache_service = Mock()
+        cache_service.get_graph_version = Mock(return_value=1)
+        service = VectorService(
+            chroma_manager=mock_chroma_manager,
+            cache_service=cache_service,
+            in_process_max_rows=10
+        )
+        service.chroma_manager.collection_exists = Mock(return_value=True)
+        service.chroma_manager.get_collection = Mock(return_value=mock_collection)
+        service._ensure_collection = Mock(return_value=mock_collection)
+        
+        mock_collection.count = Mock(return_value=3)
+        mock_collection.get = Mock(return_value={
+            "ids": ["func_1", "func_2", "func_3"],
+            "embeddings": [[1.0, 0.0], [0.0, 1.0], [0.6, 0.8]],
+            "metadatas": [{"name": "func1"}, {"name": "func2"}, {"name": "func3"}]
+        })
+        return service
+    
+    def test_semantic_search_scores_small_project_in_process(
+        self, in_process_service, mock_collection
+    ):
+        """Test small projects are scored from the cached matrix."""
+        results = in_process_service.semantic_search(
+            query_embedding=[0.0, 1.0],
+            project_ids=["proj_123"],
+            top_k=2,
+            similarity_threshold=-10.0
+        )
+        
+        mock_collection.query.assert_not_called()
+        assert [r["id"] for r in results] == ["func_2", "func_3"]
+        # Squared L2 distance, as in Chroma's default space
+        assert results[0]["distance"] == pytest.approx(0.0)
+        assert results[1]["distance"] == pytest.approx(0.4)
+        assert results[1]["metadata"] == {"name": "func3"}
+    
+    def test_semantic_search_reuses_matrix_until_graph_version_changes(
+        self, in_process_service, mock_collection
+    ):
+        """Test the matrix is reloaded when another process bumps the version."""
+        for _ in range(2):
+            in_process_service.semantic_search([1.0, 0.0], ["proj_123"], top_k=1)
+        assert mock_collection.get.call_count == 1
+        # Cache hits need no count round trip
+        mock_collection.count.assert_called_once()
+        
+        # Same row count, different rows (e.g. a file re-uploaded elsewhere)
+        in_process_service.cache_service.get_graph_version.return_value = 2
+        in_process_service.semantic_search([1.0, 0.0], ["proj_123"], top_k=1)
+        assert mock_collection.get.call_count == 2
+    
+    def test_semantic_search_uses_chroma_without_graph_version(
+        self, in_process_service, mock_collection
+    ):
+        """Test projects fall back to collection.query when Redis is unavailable."""
+        in_process_service.cache_service.get_graph_version.return_value = None
+        mock_collection.query = Mock(return_value={
+            "ids": [["func_1"]],
+            "distances": [[0.1]],
+            "metadatas": [[{"name": "func1"}]]
+        })
+        
+        in_process_service.semantic_search([1.0, 0.0], ["proj_123"])
+        
+        mock_collection.get.assert_not_called()
+        mock_collection.query.assert_called_once()
+    
+    def test_in_process_search_needs_cache_service(self, mock_chroma_manager):
+        """Test in-process search stays off without a version source."""
+        service = VectorService(chroma_manager=mock_chroma_manager, in_process_max_rows=10)
+        
+        assert service.in_process_max_rows == 0
+    
+    def test_store_embedding_invalidates_matrix(
+        self, in_process_service, mock_collection, sample_metadata
+    ):
+        """Test storing into a project drops its cached matrix."""
+        sample_metadata["project_id"] = "proj_123"
+        in_process_service.semantic_search([1.0, 0.0], ["proj_123"], top_k=1)
+        
+        in_process_service.store_embedding("func_4", [0.1, 0.2], sample_metadata)
+        in_process_service.semantic_search([1.0, 0.0], ["proj_123"], top_k=1)
+        
+        assert mock_collection.get.call_count == 2
+    
+    def test_semantic_search_large_project_uses_chroma(
+        self, in_process_service, mock_collection
+    ):
+        """Test projects above the row limit go through collection.query."""
+        mock_collection.count = Mock(return_value=11)
+        mock_collection.query = Mock(return_value={
+            "ids": [["func_1"]],
+            "distances": [[0.1]],
+            "metadatas": [[{"name": "func1"}]]
+        })
+        
+        results = in_process_service.semantic_search([1.0, 0.0], ["proj_123"])
+        in_process_service.semantic_search([1.0, 0.0], ["proj_123"])
+        
+        mock_collection.get.assert_not_called()
+        assert [r["id"] for r in results] == ["func_1"]
+        # Projects over the limit are remembered instead of counted per query
+        mock_collection.count.assert_called_once()
+        
+        in_process_service.cache_service.get_graph_version.return_value = 2
+        in_process_service.semantic_search([1.0, 0.0], ["proj_123"])
+        assert mock_collection.count.call_count == 2
+    
+    def test_matrix_cache_evicts_least_recently_used_by_bytes(
+        self, in_process_service, mock_collection
+    ):
+        """Test the matrix cache stays within its byte budget."""
+        from src.services.vector_service import _matrix_entry_size
+        
+        # One project's 3x2 float32 matrix plus its row norms is 36 bytes
+        in_process_service._matrix_cache = LRUCache(maxsize=40, getsizeof=_matrix_entry_size)
+        
+        for project_id in ["proj_a", "proj_b", "proj_a"]:
+            in_process_service.semantic_search([1.0, 0.0], [project_id], top_k=1)
+        
+        assert mock_collection.get.call_count == 3
+        assert list(in_process_service._matrix_cache) == ["proj_a"]
+
+
 class TestFindSimilarEntities:
     """Tests for finding similar entities."""
     
@@ -498,6 +731,22 @@ class TestDeleteProjectEmbeddings:
         
         with pytest.raises(DatabaseQueryError, match="Failed to delete project embeddings"):
             vector_service.delete_project_embeddings("proj_123")
+    
+    def test_delete_project_embeddings_invalidates_cached_collection(
+        self, vector_service, mock_collection
+    ):
+        """Test deleting embeddings drops the cached collection handle."""
+        vector_service.chroma_manager.collection_exists = Mock(return_value=True)
+        vector_service.chroma_manager.get_collection = Mock(return_value=mock_collection)
+        vector_service.chroma_manager.get_collection_count = Mock(return_value=1)
+        vector_service.chroma_manager.delete_collection = Mock()
+        mock_collection.get = Mock(return_value={"ids": [], "embeddings": [], "metadatas": []})
+        
+        vector_service.get_embedding("func_123", "proj_123")
+        vector_service.delete_project_embeddings("proj_123")
+        vector_service.get_embedding("func_123", "proj_123")
+        
+        assert vector_service.chroma_manager.get_collection.call_count == 2
 
 
 class TestGetEmbedding:
@@ -547,6 +796,20 @@ class TestGetEmbedding:
         result = vector_service.get_embedding("nonexistent_func", "proj_123")
         
         assert result is None
+    
+    def test_get_embedding_reuses_cached_collection(
+        self, vector_service, mock_collection
+    ):
+        """Test repeat lookups reuse the cached collection handle."""
+        vector_service.chroma_manager.collection_exists = Mock(return_value=True)
+        vector_service.chroma_manager.get_collection = Mock(return_value=mock_collection)
+        mock_collection.get = Mock(return_value={"ids": [], "embeddings": [], "metadatas": []})
+        
+        vector_service.get_embedding("func_123", "proj_123")
+        vector_service.get_embedding("func_456", "proj_123")
+        
+        vector_service.chroma_manager.collection_exists.assert_called_once()
+        vector_service.chroma_manager.get_collection.assert_called_once()
 
 
 class TestBatchStoreEmbeddings:
@@ -609,6 +872,64 @@ class TestBatchStoreEmbeddings:
         mock_collection1.add.assert_called_once()
         mock_collection2.add.assert_called_once()
     
+    def test_batch_store_embeddings_ndarray_input(self, vector_service):
+        """Test batch storing an (N, D) array slices rows per project."""
+        import numpy as np
+        
+        mock_collection1 = Mock()
+        mock_collection2 = Mock()
+        
+        vector_service._ensure_collection = Mock(
+            side_effect=[mock_collection1, mock_collection2]
+        )
+        
+        entity_ids = ["func_1", "func_2", "func_3"]
+        embeddings = np.array([[0.1] * 4, [0.2] * 4, [0.3] * 4], dtype=np.float32)
+        metadatas = [
+            {"entity_type": "function", "name": "f1", "project_id": "proj_1"},
+            {"entity_type": "function", "name": "f2", "project_id": "proj_2"},
+            {"entity_type": "function", "name": "f3", "project_id": "proj_1"}
+        ]
+        
+        count = vector_service.batch_store_embeddings(
+            entity_ids=entity_ids,
+            embeddings=embeddings,
+            metadatas=metadatas
+        )
+        
+        assert count == 3
+        kwargs = mock_collection1.add.call_args.kwargs
+        assert kwargs["ids"] == ["func_1", "func_3"]
+        # Chroma's add() only accepts plain lists
+        assert isinstance(kwargs["embeddings"], list)
+        assert kwargs["embeddings"] == embeddings[[0, 2]].tolist()
+        assert mock_collection2.add.call_args.kwargs["ids"] == ["func_2"]
+    
+    def test_batch_store_embeddings_chunks_large_groups(
+        self, vector_service, mock_collection
+    ):
+        """Test large project groups are added in CHROMA_MAX_BATCH chunks."""
+        from src.services.vector_service import CHROMA_MAX_BATCH
+        
+        vector_service._ensure_collection = Mock(return_value=mock_collection)
+        
+        num_rows = CHROMA_MAX_BATCH * 2 + 1
+        entity_ids = [f"func_{i}" for i in range(num_rows)]
+        embeddings = [[0.1] * 4] * num_rows
+        metadatas = [{"project_id": "proj_1"}] * num_rows
+        
+        count = vector_service.batch_store_embeddings(
+            entity_ids=entity_ids,
+            embeddings=embeddings,
+            metadatas=metadatas
+        )
+        
+        assert count == num_rows
+        batch_sizes = [
+            len(call.kwargs["ids"]) for call in mock_collection.add.call_args_list
+        ]
+        assert batch_sizes == [CHROMA_MAX_BATCH, CHROMA_MAX_BATCH, 1]
+    
     def test_batch_store_embeddings_mismatched_lengths(self, vector_service):
         """Test batch storing with mismatched input lengths."""
         with pytest.raises(ValueError, match="must have the same length"):